@@ -0,0 +1,8 @@
+"""
+OVERMAN BENCHMARKS
+Offline timing of the warden's hot path on synthetic window streams. Results
+are JSON and can be compared against a stored baseline:
+
+    python -m benchmarks.hotpath --out results.json
+    python -m benchmarks.hotpath --baseline benchmarks/baseline.json
+"""
@@ -0,0 +1,254 @@
+"""
+Fake Hyprland for offline runs.
+Serves .socket2.sock from a recorded trace (or lines pushed with emit())
+and answers the .socket.sock requests the engine makes (j/activewindow,
+j/clients, j/monitors, dispatch closewindow) from the windows those events
+describe, so the warden can be driven without a compositor:
+
+    python -m benchmarks.fakehypr engine/traces/sample.trace
+    export HYPRLAND_INSTANCE_SIGNATURE=<printed signature> XDG_RUNTIME_DIR=<printed dir>
+"""
+
+import json
+import os
+import sys
+import socket
+import tempfile
+import threading
+import time
+
+from engine.replay import load_trace
+
+MONITOR = {"id": 0, "name": "FAKE-1", "description": "fakehypr", "width": 1920, "height": 1080,
+           "x": 0, "y": 0, "scale": 1.0, "focused": True, "activeWorkspace": {"id": 1, "name": "1"}}
+
+
+class FakeHyprland:
+    """
+    Listens on <runtime>/hypr/<signature>/.socket2.sock and replays `events`
+    to every client that connects. `speed` > 1 compresses the timeline.
+    emit() pushes extra lines to every connected client right away.
+
+    .socket.sock answers from the window state the events imply. Requests
+    are logged in `requests` as (monotonic time, command), and passed to
+    `on_request` when set. `dispatch closewindow` closes the window the way
+    Hyprland would: closewindow on socket2, then focus falls back to the
+    previously focused window that is still open.
+    """
+
+    def __init__(self, events, speed=1.0, runtime_dir=None, signature="fake", on_request=None):
+        self.events = events
+        self.speed = speed
+        self.runtime_dir = runtime_dir or tempfile.mkdtemp(prefix="fakehypr-")
+        self.signature = signature
+        self.on_request = on_request
+        self.dir = os.path.join(self.runtime_dir, "hypr", signature)
+        self.event_path = os.path.join(self.dir, ".socket2.sock")
+        self.request_path = os.path.join(self.dir, ".socket.sock")
+        self.done = threading.Event()
+        self.requests = []
+        self.windows = {}   # address -> [class, title]
+        self.focused = None  # address, or (class, title) before activewindowv2 names it
+        self._history = []  # focused addresses, most recent last
+        self._clients = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._servers = []
+
+    @property
+    def env(self):
+        return {"XDG_RUNTIME_DIR": self.runtime_dir,
+                "HYPRLAND_INSTANCE_SIGNATURE": self.signature}
+
+    def start(self):
+        os.makedirs(self.dir, exist_ok=True)
+        self._serve(self.event_path, self._replay)
+        self._serve(self.request_path, self._request)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for srv in self._servers:
+            srv.close()
+        self._servers.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self, path, handler):
+        if os.path.exists(path):
+            os.unlink(path)
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        srv.bind(path)
+        srv.listen(8)
+        self._servers.append(srv)
+
+        def accept_loop():
+            while not self._stop.is_set():
+                try:
+                    conn, _ = srv.accept()
+                except OSError:
+                    return
+                threading.Thread(target=handler, args=(conn,), daemon=True).start()
+
+        threading.Thread(target=accept_loop, daemon=True).start()
+
+    def _replay(self, conn):
+        start = time.monotonic()
+        try:
+            for offset, payload in self.events:
+                delay = offset / self.speed - (time.monotonic() - start)
+                if delay > 0 and self._stop.wait(delay):
+                    return
+                with self._lock:
+                    self._apply(payload)
+                    conn.sendall(payload.encode("utf-8") + b"\n")
+            with self._lock:
+                self._clients.append(conn)
+            self.done.set()
+            self._stop.wait()
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if conn in self._clients:
+                    self._clients.remove(conn)
+            conn.close()
+
+    # --- SCRIPTED EVENTS ---
+    def emit(self, *payloads):
+        """
+        Send `event>>data` lines to every client that finished its replay,
+        in one write. Returns the monotonic time just before sending.
+        """
+        data = "".join(p + "\n" for p in payloads).encode("utf-8")
+        with self._lock:
+            for payload in payloads:
+                self._apply(payload)
+            sent = time.monotonic()
+            for conn in list(self._clients):
+                try:
+                    conn.sendall(data)
+                except OSError:
+                    self._clients.remove(conn)
+        return sent
+
+    def wait_clients(self, n=1, timeout=5.0):
+        """Block until `n` socket2 clients are connected and caught up."""
+        deadline = time.monotonic() + timeout
+        while len(self._clients) < n:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def _apply(self, payload):
+        """Track the window state a socket2 line implies."""
+        name, _, data = payload.partition(">>")
+        if name == "openwindow":
+            address, _, rest = data.partition(",")
+            _, _, rest = rest.partition(",")
+            cls, _, title = rest.partition(",")
+            self.windows[_addr(address)] = [cls, title]
+        elif name == "activewindow":
+            cls, _, title = data.partition(",")
+            self.focused = (cls, title) if cls or title else None
+        elif name == "activewindowv2":
+            address = _addr(data)
+            if address in self.windows:
+                self.focused = address
+                if address in self._history:
+                    self._history.remove(address)
+                self._history.append(address)
+        elif name == "windowtitlev2":
+            address, _, title = data.partition(",")
+            if _addr(address) in self.windows:
+                self.windows[_addr(address)][1] = title
+        elif name == "closewindow":
+            address = _addr(data)
+            self.windows.pop(address, None)
+            if address in self._history:
+                self._history.remove(address)
+            if self.focused == address:
+                self.focused = None
+
+    # --- REQUEST SOCKET ---
+    def _request(self, conn):
+        try:
+            command = conn.recv(65536).decode("utf-8", "replace")
+            now = time.monotonic()
+            self.requests.append((now, command))
+            if self.on_request:
+                self.on_request(now, command)
+            if command.startswith("[[BATCH]]"):
+                parts = command[len("[[BATCH]]"):].split(";")
+                replies, after = zip(*(self._answer(c.strip()) for c in parts))
+                reply, after = "\n\n\n".join(replies), [e for a in after for e in a]
+            else:
+                reply, after = self._answer(command)
+            conn.sendall(reply.encode("utf-8"))
+        except OSError:
+            return
+        finally:
+            conn.close()
+        if after:
+            self.emit(*after)
+
+    def _answer(self, command):
+        """(reply text, socket2 lines to emit after replying) for one command."""
+        with self._lock:
+            if command == "j/activewindow":
+                address = self.focused if isinstance(self.focused, str) else None
+                return json.dumps(self._client(address) if address else {}), []
+            if command == "j/clients":
+                return json.dumps([self._client(a) for a in self.windows]), []
+            if command == "j/monitors":
+                return json.dumps([MONITOR]), []
+            if command.startswith("dispatch closewindow "):
+                selector = command.split(" ", 2)[2]
+                address = _addr(selector.partition("address:")[2]) if "address:" in selector else None
+                if address not in self.windows:
+                    return "No such window", []
+                after = [f"closewindow>>{address[2:]}"]
+                rest = [a for a in self._history if a != address]
+                if self.focused == address:
+                    if rest:
+                        cls, title = self.windows[rest[-1]]
+                        after += [f"activewindow>>{cls},{title}", f"activewindowv2>>{rest[-1][2:]}"]
+                    else:
+                        after += ["activewindow>>,", "activewindowv2>>"]
+                return "ok", after
+            if command.startswith("dispatch "):
+                return "ok", []
+            return "unknown request", []
+
+    def _client(self, address):
+        cls, title = self.windows[address]
+        return {"address": address, "mapped": True, "hidden": False, "at": [0, 0],
+                "size": [MONITOR["width"], MONITOR["height"]], "workspace": {"id": 1, "name": "1"},
+                "floating": False, "monitor": 0, "class": cls, "title": title,
+                "initialClass": cls, "initialTitle": title, "pid": 0, "xwayland": False,
+                "pinned": False, "fullscreen": 0, "focusHistoryID": 0}
+
+
+def _addr(raw):
+    raw = raw.strip()
+    return raw if not raw or raw.startswith("0x") else "0x" + raw
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m benchmarks.fakehypr TRACE [SPEED]")
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    fake = FakeHyprland(load_trace(sys.argv[1]), speed=speed).start()
+    print(f"export XDG_RUNTIME_DIR={fake.runtime_dir} "
+          f"HYPRLAND_INSTANCE_SIGNATURE={fake.signature}", flush=True)
+    try:
+        fake.done.wait()
+        print("trace finished; Ctrl-C to exit", flush=True)
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,160 @@
+"""
+Measurement and reporting shared by the benchmark suites.
+
+A case is a function case(bench, scales) calling bench.time(name, fn, items)
+for each variant it measures (fn is called once per item); `scales` is None
+unless overridden on the command line. Each name gets the
+best per-item time over `repeat` runs, capped at `budget` seconds per run, so
+a quadratic legacy variant at 100k keywords still finishes.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+
+class Bench:
+    def __init__(self, repeat=3, budget=0.5, only=None):
+        self.repeat = repeat
+        self.budget = budget
+        self.only = only
+        self.results = {}  # name -> {"ns": best ns per item, "items": n, ...}
+        self.skipped = {}
+
+    def wanted(self, name):
+        return not self.only or any(part in name for part in self.only)
+
+    def time(self, name, fn, items, **extra):
+        """Best ns per call of fn(item) over the repeats."""
+        if not self.wanted(name):
+            return None
+        best, done = None, 0
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            deadline = start + self.budget
+            n = 0
+            for item in items:
+                fn(item)
+                n += 1
+                if not n & 63 and time.perf_counter() > deadline:
+                    break
+            elapsed = time.perf_counter() - start
+            per = elapsed * 1e9 / max(n, 1)
+            if best is None or per < best:
+                best, done = per, n
+        return self.add(name, best, done, **extra)
+
+    def once(self, name, fn, runs=None, **extra):
+        """Wall time of a single fn() call (setup costs like building an automaton), as ns."""
+        if not self.wanted(name):
+            return None
+        best = None
+        for _ in range(runs or self.repeat):
+            start = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - start) * 1e9
+            best = elapsed if best is None else min(best, elapsed)
+        return self.add(name, best, 1, **extra)
+
+    def add(self, name, ns, items=1, **extra):
+        """Record a measurement taken elsewhere (e.g. a latency percentile)."""
+        if self.wanted(name):
+            self.results[name] = {"ns": ns, "items": items, **extra}
+        return ns
+
+    def skip(self, name, reason):
+        if self.wanted(name):
+            self.skipped[name] = reason
+
+
+def compare(results, baseline, threshold=0.25, floor_ns=50.0):
+    """
+    (regressions, improvements) as lists of (name, base_ns, ns). Changes
+    under `threshold` (relative) or `floor_ns` (absolute) are noise.
+    """
+    regressions, improvements = [], []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        before, after = base["ns"], row["ns"]
+        if abs(after - before) < floor_ns:
+            continue
+        if after > before * (1 + threshold):
+            regressions.append((name, before, after))
+        elif after < before / (1 + threshold):
+            improvements.append((name, before, after))
+    return regressions, improvements
+
+
+def fmt_ns(ns):
+    if ns >= 1e9:
+        return f"{ns / 1e9:.2f} s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def add_report_args(parser):
+    parser.add_argument("--only", nargs="*", help="run variants whose name contains any of these")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown flagged")
+
+
+def main(suite, cases, argv=None, description=None):
+    """Command line shared by the suites: run `cases`, print, write JSON, compare."""
+    parser = argparse.ArgumentParser(prog=f"benchmarks.{suite}", description=description)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per variant and run")
+    parser.add_argument("--scales", default=None, help="comma-separated sizes, e.g. 10,1000,100000")
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    bench = Bench(args.repeat, args.budget, args.only)
+    scales = [int(s) for s in args.scales.split(",")] if args.scales else None
+    for case in cases:
+        case(bench, scales)
+    return finish(suite, bench, args)
+
+
+def finish(suite, bench, args):
+    """Print `bench`, write --out, and compare with (or save) --baseline; the exit status."""
+    width = max((len(n) for n in bench.results), default=10)
+    for name, row in bench.results.items():
+        print(f"{name:<{width}}  {fmt_ns(row['ns']):>10}  ({row['items']} items)")
+    for name, reason in bench.skipped.items():
+        print(f"{name:<{width}}  {'skipped':>10}  ({reason})")
+
+    report = {"suite": suite, "python": platform.python_version(), "machine": platform.machine(),
+              "node": platform.node(), "created": time.time(), "results": bench.results,
+              "skipped": bench.skipped}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions, improvements = compare(bench.results, baseline, args.threshold)
+    for name, before, after in improvements:
+        print(f"faster     {name}: {fmt_ns(before)} -> {fmt_ns(after)}")
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {fmt_ns(before)} -> {fmt_ns(after)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit("run a suite instead, e.g. python -m benchmarks.hotpath")
@@ -0,0 +1,113 @@
+"""
+What every warden tick runs, legacy variant next to the engine one:
+
+    json       parsing `hyprctl activewindow -j` / `clients -j` output
+    keywords   FORBIDDEN / BANNED matching: any(k in title) vs KeywordMatcher
+    whitelist  ALLOWED_APPS checks: substring scan, set lookup, KeywordMatcher
+    logs       session.logs / hierarchy dicts vs IntervalLog and RunningStats
+    csv        per-tick appends: pandas to_csv, csv.writer, LogWriter
+
+Names end in /N: N keywords (keywords, whitelist) or N distinct titles in
+the stream (logs); ns are per window sample.
+
+    python -m benchmarks.hotpath [--scales 10,1000,100000] [--only keywords]
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks import synth
+from benchmarks.harness import main
+from engine.aggregates import RunningStats
+from engine.intervals import IntervalLog
+from engine.keywords import KeywordMatcher
+from engine.logwriter import LogWriter
+
+SCALES = (10, 100, 1000, 10_000, 100_000)
+STREAM = 20_000  # samples per stream (at least one per distinct title)
+ALLOWED = ["mpv", "kitty", "obsidian", "anki", "libreoffice", "zathura"]
+
+
+def bench_json(bench, scales=None):
+    stream = synth.windows(1000, 2000)
+    bench.time("json.activewindow", json.loads, [synth.activewindow_json(*w) for w in stream])
+    for n in [s for s in (scales or SCALES) if s <= 1000]:
+        clients = json.dumps([json.loads(synth.activewindow_json(*w)) for w in stream[:n]]).encode()
+        bench.time(f"json.clients/{n}", json.loads, [clients] * 50)
+
+
+def bench_keywords(bench, scales=None):
+    stream = synth.windows(1000, STREAM, blocklist=synth.FORBIDDEN)
+    for n in scales or SCALES:
+        kws = synth.keywords(n)
+        bench.time(f"keywords.naive/{n}", lambda w: any(k in w[1] for k in kws), stream)
+        bench.once(f"keywords.build/{n}", lambda: KeywordMatcher(kws))
+        matcher = KeywordMatcher(kws)
+        bench.time(f"keywords.matcher/{n}", lambda w: matcher.search(w[1], w[0]), stream)
+
+
+def bench_whitelist(bench, scales=None):
+    stream = synth.windows(1000, STREAM)
+    for n in scales or SCALES:
+        allowed = (ALLOWED + synth.keywords(n, seed=7))[:n]
+        exact = set(allowed)
+        matcher = KeywordMatcher(allowed)
+        bench.time(f"whitelist.substring/{n}", lambda w: any(a in w[0] for a in allowed), stream)
+        bench.time(f"whitelist.set/{n}", lambda w: w[0] in exact, stream)
+        bench.time(f"whitelist.matcher/{n}", lambda w: matcher.search(w[0]) is not None, stream)
+
+
+def bench_logs(bench, scales=None):
+    for n in scales or SCALES:
+        stream = synth.windows(n, max(n, STREAM))
+        status = ["Productive" if cls in ALLOWED else "Drifting" for cls, _, _ in stream]
+        logs, hierarchy = {}, {}
+
+        def nested(w):  # overman22/23/25: session.logs[app][title] += 2
+            titles = logs.setdefault(w[0], {})
+            titles[w[1]] = titles.get(w[1], 0) + 2
+
+        def tree(w):  # overman6: hierarchy[app]["total"/"subs"]
+            node = hierarchy.setdefault(w[0], {"total": 0, "subs": {}})
+            node["total"] += 2
+            node["subs"][w[1]] = node["subs"].get(w[1], 0) + 2
+
+        bench.time(f"logs.nested_dict/{n}", nested, stream)
+        bench.time(f"logs.hierarchy/{n}", tree, stream)
+        log = IntervalLog()
+        ticks = [(i * 2.0, w, status[i]) for i, w in enumerate(stream)]
+        bench.time(f"logs.intervals/{n}", lambda t: log.add(t[0], t[0] + 2.0, t[1][0], t[1][1], t[2]), ticks)
+        stats = RunningStats()
+        bench.time(f"logs.running_stats/{n}", lambda t: stats.add(t[1][0], t[2], 2.0), ticks)
+
+
+def bench_csv(bench, scales=None):
+    rows = [(f"2025-12-01 10:{i // 60 % 60:02d}:{i % 60:02d}", cls, "Drifting", False)
+            for i, (cls, _, _) in enumerate(synth.windows(1000, STREAM))]
+    with tempfile.TemporaryDirectory(prefix="overman-bench-") as tmp:
+        def open_append(row):  # open, write one row, close: the old per-tick append
+            with open(os.path.join(tmp, "open.csv"), "a", newline="") as f:
+                csv.writer(f).writerow(row)
+
+        bench.time("csv.open_append", open_append, rows)
+        try:
+            import pandas as pd
+        except ImportError:
+            bench.skip("csv.pandas_append", "pandas not installed")
+        else:
+            path = os.path.join(tmp, "pandas.csv")
+            columns = ["timestamp", "app", "status", "is_allowed"]
+            bench.time("csv.pandas_append", lambda row: pd.DataFrame([row], columns=columns).to_csv(
+                path, mode="a", header=False, index=False), rows)
+        writer = LogWriter(os.path.join(tmp, "logwriter.csv"), maxsize=len(rows) * bench.repeat + 1)
+        bench.time("csv.logwriter", writer.write, rows)
+        bench.once("csv.logwriter.close", writer.close, runs=1)  # drains the queue to disk
+
+
+CASES = [bench_json, bench_keywords, bench_whitelist, bench_logs, bench_csv]
+
+if __name__ == "__main__":
+    sys.exit(main("hotpath", CASES, description=__doc__.split("\n\n")[0]))
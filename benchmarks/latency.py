@@ -0,0 +1,249 @@
+"""
+End-to-end enforcement latency against a fake compositor.
+
+A FakeHyprland serves socket2 and the request socket; a warden runs
+against it in-process with real Actuators and EvidenceStore: by default
+overmand (server + Warden thread, followed by a frontend's DaemonFeed),
+or with --warden ubermensch that frontend's own WardenThread. Each round
+focuses a new forbidden window and times, from the moment the events are
+written to socket2:
+
+    detect        the warden's violation timestamp
+    closewindow   `dispatch closewindow address:...` arriving at the fake
+    lockout       the lockout reaching the frontend (overmand: a subscriber;
+                  WardenThread: lockout_signal's slot on the GUI thread)
+    shown         engine.lockout.LockoutWindow's first paint (PyQt6, offscreen)
+    evidence      the same window's ImageLoader delivering the decoded capture
+
+then tick.cpu is the warden thread's CPU time per tick at steady state.
+grim is replaced by a stand-in that prints a black frame unless --grim.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.latency [--rounds 200] [--warden ubermensch]
+"""
+
+import argparse
+import importlib
+import math
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import Bench, add_report_args, finish
+from engine.evidence import EvidenceStore
+from benchmarks.fakehypr import MONITOR, FakeHyprland
+from engine.overmand import Daemon, OvermandClient
+from engine.store import Store
+
+SAFE = ("5afe0001", "kitty", "nvim overman.py")
+FORBIDDEN_TITLE = "twitter / home — Mozilla Firefox"
+STAGES = ("detect", "closewindow", "lockout", "shown", "evidence")
+WARDENS = ("overmand", "ubermensch")
+
+
+class Mute:
+    """Speaker stand-in: the harness measures enforcement, not espeak-ng."""
+
+    def say(self, text, priority=None):
+        return True
+
+
+def percentile(values, q):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _fake_grim(bin_dir):
+    """A `grim` that ignores its arguments and prints a black PPM of MONITOR's size."""
+    os.makedirs(bin_dir, exist_ok=True)
+    path = os.path.join(bin_dir, "grim")
+    w, h = MONITOR["width"], MONITOR["height"]
+    with open(path, "w") as f:
+        f.write(f"#!/bin/sh\nprintf 'P6\\n{w} {h}\\n255\\n'\nhead -c {w * h * 3} /dev/zero\n")
+    os.chmod(path, 0o755)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+
+
+def _drain(q):
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _until(q, match, timeout):
+    """First item of `q` satisfying match() within `timeout` seconds, or None."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            item = q.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            return None
+        if match(item):
+            return item
+
+
+def _subscribe(path, ready, lockouts, ticks):
+    for event in OvermandClient(path, timeout=0.5).subscribe():
+        if event is None:
+            continue
+        kind = event.get("event")
+        if kind == "snapshot":
+            ready.set()
+        elif kind == "lockout":
+            lockouts.put((time.monotonic(), event))
+        elif kind == "tick":
+            ticks.append(time.monotonic())
+
+
+def _frontend_warden(name, tmp, evidence):
+    """A frontend's WardenThread, with its module-level services pointed at `tmp`."""
+    mod = importlib.import_module(name)
+    mod.store = Store(os.path.join(tmp, f"{name}.db"))
+    mod.evidence = evidence
+    mod.speaker = Mute()
+    return mod.WardenThread()
+
+
+def measure(bench, rounds=200, warmup=5, tick=1.0, steady=10.0, gap=0.02, timeout=2.0,
+            qt=True, grim=False, warden="overmand"):
+    tmp = tempfile.mkdtemp(prefix="overman-latency-")
+    closes, lockouts, ticks = queue.Queue(), queue.Queue(), []
+
+    def on_request(t, command):
+        if command.startswith("dispatch closewindow address:"):
+            closes.put((t, command.rpartition(":")[2].strip()))
+
+    fake = FakeHyprland([], runtime_dir=tmp, on_request=on_request).start()
+    os.environ.update(fake.env)
+    if not grim:
+        _fake_grim(os.path.join(tmp, "bin"))
+    address, cls, title = SAFE
+    fake.emit(f"openwindow>>{address},1,{cls},{title}", f"activewindow>>{cls},{title}",
+              f"activewindowv2>>{address}")
+    evidence = EvidenceStore(os.path.join(tmp, "evidence"))
+
+    probe = thread_ident = None
+    if warden == "overmand":
+        path = os.path.join(tmp, "overmand.sock")
+        daemon = Daemon(path, os.path.join(tmp, "latency.db"), tick=tick, speaker=Mute(),
+                        evidence=evidence)
+        daemon.server.start()
+        thread = threading.Thread(target=daemon.warden.run, name="warden", daemon=True)
+        thread.start()
+        thread_ident = thread.ident
+        ready = threading.Event()
+        threading.Thread(target=_subscribe, args=(path, ready, lockouts, ticks), daemon=True).start()
+        if not fake.wait_clients(1) or not ready.wait(5.0):
+            sys.exit("warden or subscriber did not connect")
+        if qt:
+            try:
+                from benchmarks.qtprobe import daemon_feed
+            except ImportError as e:
+                for stage in ("shown", "evidence"):
+                    bench.skip(f"latency.{stage}", f"PyQt6 unavailable ({e})")
+            else:
+                probe = daemon_feed(path)
+                if probe is None:
+                    sys.exit("Qt frontend did not connect")
+        else:
+            for stage in ("shown", "evidence"):
+                bench.skip(f"latency.{stage}", "--no-qt")
+    else:
+        try:
+            from PyQt6.QtCore import Qt
+            from benchmarks.qtprobe import LockoutProbe
+        except ImportError as e:
+            sys.exit(f"--warden {warden} needs PyQt6 ({e})")
+        source = _frontend_warden(warden, tmp, evidence)
+        source.update_signal.connect(lambda app, status: ticks.append(time.monotonic()),
+                                     Qt.ConnectionType.DirectConnection)
+        probe = LockoutProbe(source).start()
+        if not fake.wait_clients(1):
+            sys.exit("warden did not connect")
+        probe.process()
+        thread_ident = probe.thread_ident
+
+    samples = {stage: [] for stage in STAGES}
+    missed = 0
+    for i in range(warmup + rounds):
+        _drain(closes)
+        _drain(lockouts)
+        address = f"{0xbad00000 + i:x}"
+        start = fake.emit(f"openwindow>>{address},1,firefox,{FORBIDDEN_TITLE}",
+                          f"activewindow>>firefox,{FORBIDDEN_TITLE}", f"activewindowv2>>{address}")
+        stamps = probe.wait(timeout) if probe else {}
+        closed = _until(closes, lambda c: c[1] == f"0x{address}", timeout)
+        if warden == "overmand":
+            lockout = _until(lockouts, lambda e: True, timeout)
+            lockout = lockout and (lockout[0], lockout[1]["detected"])
+        else:
+            lockout = (stamps["received"], stamps["detected"]) if "received" in stamps else None
+        if i >= warmup:
+            if closed is None or lockout is None:
+                missed += 1
+            else:
+                samples["detect"].append(lockout[1] - start)
+                samples["closewindow"].append(closed[0] - start)
+                samples["lockout"].append(lockout[0] - start)
+                for stage in ("shown", "evidence"):
+                    if stage in stamps:
+                        samples[stage].append(stamps[stage] - start)
+        time.sleep(gap)
+    if missed:
+        print(f"{missed} of {rounds} rounds timed out after {timeout}s", file=sys.stderr)
+
+    for stage, values in samples.items():
+        if values:
+            for q in (50, 90, 99):
+                bench.add(f"latency.{stage}.p{q}", percentile(values, q) * 1e9, len(values),
+                          max_ns=max(values) * 1e9)
+
+    # Steady state: the safe window has focus again, the warden only ticks.
+    if thread_ident is None:
+        bench.skip("tick.cpu", "warden thread id unknown")
+    else:
+        cpu = time.pthread_getcpuclockid(thread_ident)
+        time.sleep(tick)
+        ticks.clear()
+        cpu_start, proc_start, wall_start = time.clock_gettime(cpu), time.process_time(), time.monotonic()
+        time.sleep(steady)
+        cpu_s = time.clock_gettime(cpu) - cpu_start
+        wall = time.monotonic() - wall_start
+        n = len(ticks)
+        bench.add("tick.cpu", cpu_s * 1e9 / max(n, 1), n, cpu_percent=100 * cpu_s / wall,
+                  process_cpu_percent=100 * (time.process_time() - proc_start) / wall)
+
+    fake.stop()
+    shutil.rmtree(tmp, ignore_errors=True)
+    return bench
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.latency", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5, help="rounds run before measuring")
+    parser.add_argument("--tick", type=float, default=1.0, help="warden tick in seconds")
+    parser.add_argument("--steady", type=float, default=10.0, help="seconds of steady-state ticks")
+    parser.add_argument("--gap", type=float, default=0.02, help="pause between rounds")
+    parser.add_argument("--timeout", type=float, default=2.0, help="per stage and round")
+    parser.add_argument("--no-qt", action="store_true", help="skip the Qt lockout window")
+    parser.add_argument("--grim", action="store_true", help="use the grim on PATH")
+    parser.add_argument("--warden", choices=WARDENS, default="overmand",
+                        help="overmand's Warden, or a frontend's own WardenThread (needs PyQt6)")
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    bench = Bench(only=args.only)
+    measure(bench, args.rounds, args.warmup, args.tick, args.steady, args.gap, args.timeout,
+            qt=not args.no_qt, grim=args.grim, warden=args.warden)
+    return finish("latency", bench, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Qt end of the latency harness: the shipped lockout path (a warden's
+lockout_signal -> engine.lockout.LockoutWindow.present() -> first paint,
+evidence decoded by its ImageLoader), run offscreen.
+"""
+
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, Qt, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from engine.daemonfeed import DaemonFeed
+from engine.lockout import LockoutWindow
+from engine.overmand import OvermandClient
+
+
+class _Stamped(LockoutWindow):
+    """LockoutWindow that also stamps its first paint after present() with time.monotonic()."""
+
+    def __init__(self, probe):
+        super().__init__()
+        self.probe = probe
+
+    def paintEvent(self, event):
+        armed = self._since is not None
+        super().paintEvent(event)
+        if armed:
+            self.probe._stamp("shown")
+
+
+class LockoutProbe:
+    """
+    Drives the real LockoutWindow from `source`, any QThread with
+    lockout_signal(path, detected): a DaemonFeed (daemon_feed()) or a
+    frontend's WardenThread. Per lockout it records, in time.monotonic():
+    received (the slot ran on the GUI thread), shown (first paint) and
+    evidence (the ImageLoader delivered the decoded capture).
+    """
+
+    def __init__(self, source):
+        self.app = QApplication.instance() or QApplication([])
+        self.window = _Stamped(self)
+        self.window.loader.loaded.connect(lambda token, image: self._stamp("evidence"))
+        self.source = source
+        self.stamps = {}
+        self.detected = None
+        self.thread_ident = None
+        self._loop = None
+        self._wanted = ()
+        # started is emitted on the new thread: note its ident for CPU accounting
+        source.started.connect(self._started, Qt.ConnectionType.DirectConnection)
+        source.lockout_signal.connect(self._lockout)
+
+    def _started(self):
+        self.thread_ident = threading.get_ident()
+
+    def start(self):
+        self.source.start()
+        return self
+
+    def _lockout(self, path, detected):
+        self.detected = detected
+        self._stamp("received")
+        self.window.present(path, detected)
+
+    def _stamp(self, stage):
+        self.stamps.setdefault(stage, time.monotonic())
+        if self._loop and all(s in self.stamps for s in self._wanted):
+            self._loop.quit()
+
+    def process(self, seconds=0.05):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+    def wait(self, timeout=2.0, stages=("received", "shown", "evidence")):
+        """Run the event loop until every stage of the next lockout is stamped; the stamps."""
+        self._wanted = stages
+        if not all(s in self.stamps for s in stages):
+            self._loop = QEventLoop()
+            QTimer.singleShot(int(timeout * 1000), self._loop.quit)
+            self._loop.exec()
+            self._loop = None
+        stamps, self.stamps = self.stamps, {}
+        stamps["detected"] = self.detected
+        self.window.hide()
+        self.app.processEvents()
+        return stamps
+
+
+def daemon_feed(path, timeout=5.0):
+    """A LockoutProbe on a DaemonFeed following the overmand at `path`, once it is subscribed."""
+    app = QApplication.instance() or QApplication([])
+    feed = DaemonFeed(OvermandClient(path))
+    ready = []
+    feed.snapshot_signal.connect(lambda snap: ready.append(True))
+    probe = LockoutProbe(feed).start()
+    deadline = time.monotonic() + timeout
+    while not ready and time.monotonic() < deadline:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
+        time.sleep(0.005)
+    return probe if ready else None
@@ -0,0 +1,203 @@
+"""
+Headless rendering cost of the Qt frontends under synthetic load.
+
+Each frontend is imported with HOME pointed at a throwaway directory (its
+module-level Store, EvidenceStore and Speaker land there) and no Hyprland,
+so its warden thread idles. Its dashboard is fed N distinct apps and window
+titles (N from 10 to 50k) and timed per update and per frame:
+
+    <frontend>.fill/N          first sighting of each app/title (tree rows inserted)
+    <frontend>.update/N        the slots one warden tick runs, plus the Qt events they post
+    <frontend>.paint/N         widget.grab(): one full frame of the window, offscreen
+    <frontend>.overlay.*       the progress overlay, which does not grow with N
+
+overman7/overman8 are the tree Dashboard, overman22 the Dashboard with the
+willpower pie, overman27 the ShameEngine, whose update is refresh_charts()
+(engine.charts pie and bars, re-rendered only when the values changed).
+update + paint over the 16 ms frame budget is listed at the end.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.render [--scales 10,1000,50000] [--only overman27]
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import synth
+from benchmarks.harness import Bench, add_report_args, finish, fmt_ns
+
+SCALES = (10, 100, 1000, 10_000, 50_000)
+UPDATES = 2000  # ticks timed per scale after the fill
+FRAMES = 30
+FRAME_NS = 16e6
+ALLOWED = ["mpv", "kitty", "obsidian", "anki", "libreoffice", "zathura"]
+
+
+def _sandbox():
+    """Throwaway HOME and no compositor, before any frontend (or engine.store) is imported."""
+    tmp = tempfile.mkdtemp(prefix="overman-render-")
+    os.environ.update(HOME=tmp, XDG_RUNTIME_DIR=tmp, HYPRLAND_INSTANCE_SIGNATURE="none")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return tmp
+
+
+def _frontend(bench, name):
+    """(module, QApplication), or (None, None) after recording why it was skipped."""
+    if bench.only and any(p.startswith("overman") for p in bench.only) and not bench.wanted(name):
+        return None, None  # --only named other frontends
+    try:
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        return importlib.import_module(name), app
+    except ImportError as e:
+        bench.skip(name, f"import failed ({e})")
+        return None, None
+
+
+def _status(app):
+    return "Productive" if any(a in app for a in ALLOWED) else "Drifting"
+
+
+def _fill(bench, name, n, slot, stream, app):
+    """Feed every distinct app/title once; recorded per item without a time budget."""
+    start = time.perf_counter()
+    for w in stream:
+        slot(w)
+    app.processEvents()
+    bench.add(f"{name}.fill/{n}", (time.perf_counter() - start) * 1e9 / max(len(stream), 1), len(stream))
+
+
+def _stop(thread):
+    """Frontend warden threads loop forever; end them before their QThread is collected."""
+    thread.terminate()
+    thread.wait()
+
+
+def bench_tree_dashboard(bench, scales, name):
+    mod, app = _frontend(bench, name)
+    if mod is None:
+        return
+    for n in scales:
+        dash = mod.Dashboard("benchmark", 60, list(ALLOWED))
+        dash.show()
+        stream = synth.windows(n, n + UPDATES, apps=synth.app_classes(n))
+
+        def update(w):  # WardenThread.data_signal -> Dashboard.update_data
+            dash.update_data(w[0], w[1], _status(w[0]), 2.0)
+            app.processEvents()
+
+        _fill(bench, name, n, update, stream[:n], app)
+        bench.time(f"{name}.update/{n}", update, stream[n:])
+        bench.time(f"{name}.paint/{n}", lambda _: dash.grab(), range(FRAMES))
+        if n == scales[0]:
+            bench.time(f"{name}.overlay.update", lambda _: dash.tick(), range(UPDATES))
+            bench.time(f"{name}.overlay.paint", lambda _: dash.overlay.grab(), range(FRAMES))
+        _stop(dash.warden)
+        dash.timer.stop()
+        dash.overlay.close()
+        dash.close()
+
+
+def bench_overman22(bench, scales, name="overman22"):
+    mod, app = _frontend(bench, name)
+    if mod is None:
+        return
+    mod.session.whitelist = list(ALLOWED)
+    overlay = mod.Overlay()
+    for n in scales:
+        mod.session.logs, mod.session.drift_seconds = {}, 0
+        dash = mod.Dashboard()
+        dash.resize(1200, 850)
+        dash.show()
+        stream = synth.windows(n, n + UPDATES, apps=synth.app_classes(n))
+
+        def update(w):  # Warden.logged -> tree_model.add, tick_sig -> refresh + update_bar
+            dash.tree_model.add(w[0], w[1], 2.0)
+            dash.refresh()
+            overlay.update_bar()
+            app.processEvents()
+
+        _fill(bench, name, n, update, stream[:n], app)
+        bench.time(f"{name}.update/{n}", update, stream[n:])
+        bench.time(f"{name}.paint/{n}", lambda _: dash.grab(), range(FRAMES))
+        bench.time(f"{name}.pie.paint/{n}", lambda _: dash.pie.grab(), range(FRAMES))
+        dash.close()
+    bench.time(f"{name}.overlay.update", lambda _: overlay.update_bar(), range(UPDATES))
+    bench.time(f"{name}.overlay.paint", lambda _: overlay.grab(), range(FRAMES))
+    overlay.close()
+
+
+def bench_overman27(bench, scales, name="overman27"):
+    mod, app = _frontend(bench, name)
+    if mod is None:
+        return
+    anchor = mod.TimeAnchor()
+    total = 60 * 60
+    for n in scales:
+        shame = mod.ShameEngine()
+        shame.resize(1000, 800)
+        shame.show()
+        # The warden thread owns app_logs and emits it whole every tick, so
+        # N apps are already in the dict the GUI receives.
+        logs = {cls: 2.0 for cls in synth.app_classes(n)}
+        stream = synth.windows(min(n, 1000), UPDATES, apps=list(logs))
+        totals = {"focus": 0.0, "drift": 0.0}
+
+        def update(w):  # WardenThread.update_stats -> sync_ui
+            logs[w[0]] += 2.0
+            totals["focus" if _status(w[0]) == "Productive" else "drift"] += 2.0
+            remaining = max(0, int(total - totals["focus"] - totals["drift"]))
+            anchor.update_bar(remaining, total)
+            shame.refresh_charts({**totals, "logs": logs, "remaining": remaining})
+            app.processEvents()
+
+        bench.time(f"{name}.update/{n}", update, stream)
+        bench.time(f"{name}.paint/{n}", lambda _: shame.grab(), range(FRAMES))
+        shame.close()
+    bench.time(f"{name}.overlay.paint", lambda _: anchor.grab(), range(FRAMES))
+    anchor.close()
+
+
+CASES = [
+    lambda bench, scales: bench_tree_dashboard(bench, scales, "overman7"),
+    lambda bench, scales: bench_tree_dashboard(bench, scales, "overman8"),
+    bench_overman22,
+    bench_overman27,
+]
+
+
+def over_budget(results):
+    """(name/N, update + paint ns) for every frontend and scale above FRAME_NS."""
+    out = []
+    for key, row in results.items():
+        frontend, _, rest = key.partition(".update/")
+        paint = results.get(f"{frontend}.paint/{rest}")
+        if rest and paint and row["ns"] + paint["ns"] > FRAME_NS:
+            out.append((f"{frontend}/{rest}", row["ns"] + paint["ns"]))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.render", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per variant and run")
+    parser.add_argument("--scales", default=None, help="comma-separated sizes, e.g. 10,1000,50000")
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    _sandbox()
+    bench = Bench(args.repeat, args.budget, args.only)
+    scales = [int(s) for s in args.scales.split(",")] if args.scales else list(SCALES)
+    for case in CASES:
+        case(bench, scales)
+    status = finish("render", bench, args)
+    for name, ns in over_budget(bench.results):
+        print(f"OVER FRAME BUDGET {name}: update + paint = {fmt_ns(ns)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
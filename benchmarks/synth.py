@@ -0,0 +1,65 @@
+"""Synthetic, seeded window streams and blocklists."""
+
+import json
+import random
+
+APPS = ["kitty", "firefox", "obsidian", "code", "discord", "mpv", "zathura", "anki",
+        "brave", "thorium", "libreoffice", "steam", "spotify", "telegram", "chromium"]
+WORDS = ("notes draft lecture chapter review inbox video stream chat thread issue diff "
+         "build report paper slides lesson search result page news update music").split()
+FORBIDDEN = ["porn", "xxx", "sex", "pornhub", "xvideos", "facebook",
+             "twitter", "instagram", "tiktok", "reddit", "9gag"]
+
+
+def keywords(n, seed=1):
+    """`n` distinct lowercase keywords: the real FORBIDDEN list, then random ones."""
+    rng = random.Random(seed)
+    out = list(FORBIDDEN[:n])
+    seen = set(out)
+    letters = "abcdefghijklmnopqrstuvwxyz0123456789"
+    while len(out) < n:
+        kw = "".join(rng.choice(letters) for _ in range(rng.randint(5, 12)))
+        if kw not in seen:
+            seen.add(kw)
+            out.append(kw)
+    return out
+
+
+def app_classes(n):
+    """`n` distinct window classes: the real APPS, then numbered variants of them."""
+    return [APPS[i] if i < len(APPS) else f"{APPS[i % len(APPS)]}-{i}" for i in range(n)]
+
+
+def titles(n, seed=2, blocklist=(), hit_rate=0.02):
+    """`n` distinct window titles; about `hit_rate` of them contain a blocklisted word."""
+    rng = random.Random(seed)
+    blocklist = list(blocklist)
+    out = []
+    for i in range(n):
+        words = rng.sample(WORDS, 4)
+        if blocklist and rng.random() < hit_rate:
+            words[rng.randrange(4)] = rng.choice(blocklist)
+        out.append(f"{' '.join(words)} #{i} — {rng.choice(APPS)}")
+    return out
+
+
+def windows(n_titles, length, seed=3, blocklist=(), apps=APPS):
+    """A focus stream of `length` (class, title, address) samples over `n_titles` distinct titles."""
+    rng = random.Random(seed)
+    pool = [(rng.choice(apps), title) for title in titles(n_titles, seed + 1, blocklist)]
+    stream = []
+    for i in range(length):
+        cls, title = pool[i] if i < n_titles else rng.choice(pool)  # every title appears once
+        stream.append((cls, title, f"0x{rng.getrandbits(48):012x}"))
+    return stream
+
+
+def activewindow_json(cls, title, address):
+    """What `hyprctl activewindow -j` prints for a window."""
+    return json.dumps({
+        "address": address, "mapped": True, "hidden": False, "at": [12, 48], "size": [1896, 1020],
+        "workspace": {"id": 1, "name": "1"}, "floating": False, "pseudo": False, "monitor": 0,
+        "class": cls, "title": title, "initialClass": cls, "initialTitle": title, "pid": 4242,
+        "xwayland": False, "pinned": False, "fullscreen": 0, "fullscreenClient": 0,
+        "grouped": [], "tags": [], "swallowing": "0x0", "focusHistoryID": 0,
+    }, indent=4).encode("utf-8")
@@ -0,0 +1,7 @@
+"""
+OVERMAN ENGINE
+Shared core for the warden frontends (window tracking, classification,
+enforcement and storage). The core and the overmand daemon are Qt-free; the
+shared widgets that import PyQt6 are activity_model, charts, daemonfeed,
+imageloader and lockout (startup imports it only inside its Qt hooks).
+"""
@@ -0,0 +1,145 @@
+"""
+Qt model for the "time expenditure" trees: apps at the top level, window
+titles beneath, both kept sorted by time spent.
+
+Updates are incremental. Adding time to a node emits dataChanged for that
+one cell; new apps/titles are inserted with rowsInserted. Re-sorting is
+throttled: a node that overtook a sibling only marks its parent, and the
+marked parents are re-sorted together at most every `resort_ms`, with one
+layoutChanged. (A view relayouts every expanded row on any move, so moving
+rows on each add() made a tick O(N).) Nothing is rebuilt, and the view keeps
+its scroll position and expansion state. Views should also set
+setUniformRowHeights(True), so that relayout does not measure every row.
+"""
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt, QTimer
+
+
+def fmt_duration(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    return f"{mins}m {secs}s"
+
+
+class _Node:
+    __slots__ = ("name", "seconds", "parent", "row", "children", "lookup")
+
+    def __init__(self, name, parent=None, row=0):
+        self.name = name
+        self.seconds = 0.0
+        self.parent = parent
+        self.row = row
+        self.children = []
+        self.lookup = {}
+
+
+class ActivityModel(QAbstractItemModel):
+    """
+    headers:     column titles; column 0 is the name, column 1 the time and
+                 an optional column 2 shows status_fn(app) on app rows.
+    title_chars: display truncation for window titles.
+    resort_ms:   how often rows are re-sorted by time, at most.
+    """
+
+    def __init__(self, headers=("App / URL", "Time"), status_fn=None, title_chars=50,
+                 resort_ms=1000, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.status_fn = status_fn
+        self.title_chars = title_chars
+        self.root = _Node(None)
+        self._unsorted = set()  # parents with a child out of order
+        self._resort_timer = QTimer(self)
+        self._resort_timer.setSingleShot(True)
+        self._resort_timer.setInterval(resort_ms)
+        self._resort_timer.timeout.connect(self.resort)
+
+    # --- UPDATES ---
+    def add(self, app, title, seconds):
+        """Credit `seconds` to app (and to app/title when title is given)."""
+        if seconds <= 0:
+            return
+        node = self._child(self.root, app)
+        self._bump(node, seconds)
+        if title is not None:
+            self._bump(self._child(node, title), seconds)
+
+    def _index_of(self, node, column=0):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def _child(self, parent, name):
+        node = parent.lookup.get(name)
+        if node is None:
+            row = len(parent.children)
+            self.beginInsertRows(self._index_of(parent), row, row)
+            node = _Node(name, parent, row)
+            parent.children.append(node)
+            parent.lookup[name] = node
+            self.endInsertRows()
+        return node
+
+    def _bump(self, node, seconds):
+        node.seconds += seconds
+        self.dataChanged.emit(self._index_of(node, 1), self._index_of(node, 1),
+                              [Qt.ItemDataRole.DisplayRole])
+        if node.row and node.parent.children[node.row - 1].seconds < node.seconds:
+            self._unsorted.add(node.parent)
+            if not self._resort_timer.isActive():
+                self._resort_timer.start()
+
+    def resort(self):
+        """Sort the children of every marked parent by time, in one layout change."""
+        parents, self._unsorted = self._unsorted, set()
+        if not parents:
+            return
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+        persistent = self.persistentIndexList()
+        for parent in parents:
+            parent.children.sort(key=lambda n: -n.seconds)  # stable: ties keep their order
+            for row, child in enumerate(parent.children):
+                child.row = row
+        # the nodes kept their identity, only their rows changed
+        self.changePersistentIndexList(
+            persistent, [self._index_of(i.internalPointer(), i.column()) for i in persistent])
+        self.layoutChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+
+    # --- QAbstractItemModel ---
+    def index(self, row, column, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self.root
+        if 0 <= row < len(node.children) and 0 <= column < len(self.headers):
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self.root
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        node = index.internalPointer()
+        is_app = node.parent is self.root
+        col = index.column()
+        if col == 0:
+            return node.name if is_app else node.name[:self.title_chars]
+        if col == 1:
+            return fmt_duration(node.seconds)
+        if col == 2 and is_app and self.status_fn:
+            return self.status_fn(node.name)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
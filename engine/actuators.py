@@ -0,0 +1,202 @@
+"""
+Enforcement side effects (brightness, screenshots, window kills) run off the
+warden thread so detection never waits on a slow grim or brightnessctl.
+"""
+
+import atexit
+import queue
+import subprocess
+import threading
+import time
+
+from engine.hypr import HyprlandClient
+
+_STOP = object()
+
+
+class Job:
+    """
+    One queued command. wait() blocks until it ran; `ok` is its outcome.
+    `then(job)` is called on the worker thread once it finished.
+    """
+
+    __slots__ = ("kind", "key", "action", "timeout", "then", "queued", "ok", "done")
+
+    def __init__(self, kind, key, action, timeout, then=None):
+        self.kind = kind
+        self.key = key
+        self.action = action
+        self.timeout = timeout
+        self.then = then
+        self.queued = time.monotonic()
+        self.ok = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        self.done.wait(timeout)
+        return self.ok
+
+
+class Actuators:
+    """
+    Small worker pool for enforcement commands.
+
+    Commands tagged with a device `key` are tracked by state: asking for
+    the state the device is already in (e.g. brightness 100% on every
+    focused tick) issues nothing, and a newer request for a key that is
+    still queued replaces the older one instead of queueing behind it.
+    Commands for the same key never run concurrently. Argv commands are
+    killed after `timeout` seconds. The queue is bounded; when it is full,
+    requests are dropped and counted rather than blocking the caller.
+    See stats() for queue depth and per-command wait/run latency.
+    """
+
+    def __init__(self, workers=2, timeout=5.0, maxsize=64):
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.state = {}     # key -> last requested state
+        self._pending = {}  # key -> newest not-yet-started Job
+        self._locks = {}    # key -> lock serialising that device
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._metrics = {}  # kind -> [calls, skipped, failed, timeouts, wait_s, run_s, max_run_s]
+        self.max_depth = 0
+        self.dropped = 0
+        self._closed = False
+        self._workers = [threading.Thread(target=self._work, name=f"actuator-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+        atexit.register(self.close)
+
+    # --- COMMANDS ---
+    def brightness(self, percent):
+        return self.submit(["brightnessctl", "s", f"{percent}%"], key="brightness", state=percent)
+
+    def screenshot(self, path, then=None):
+        return self.submit(["grim", str(path)], timeout=10.0, then=then)
+
+    def close_window(self, selector, then=None):
+        """selector as understood by hyprctl, e.g. `address:0x...` or `class:firefox`."""
+        return self.submit(lambda: self._hypr().dispatch("closewindow", selector),
+                           kind="closewindow", then=then)
+
+    def submit(self, action, key=None, state=None, kind=None, timeout=None, then=None):
+        """
+        Queue `action` (an argv list or a callable) and return its Job, or
+        None when it was skipped because `key` is already in `state` or the
+        queue is full.
+        """
+        kind = kind or (action[0] if isinstance(action, list) else key or "call")
+        job = Job(kind, key, action, timeout or self.timeout, then)
+        with self._lock:
+            if key is not None:
+                if state is not None and self.state.get(key) == state:
+                    self._count(kind, skipped=1)
+                    return None
+                self.state[key] = state
+                older = self._pending.get(key)
+                if older is not None:
+                    # Not started yet: the newer state supersedes it in place.
+                    self._pending[key] = job
+                    older.done.set()
+                    self._count(kind, skipped=1)
+                    return job
+                self._pending[key] = job
+            try:
+                self.queue.put_nowait(job)
+            except queue.Full:
+                self.dropped += 1
+                if key is not None:
+                    self._pending.pop(key, None)
+                    self.state.pop(key, None)
+                return None
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+        return job
+
+    def forget(self, key):
+        """Drop the remembered state, e.g. after the user changed it by hand."""
+        with self._lock:
+            self.state.pop(key, None)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self.queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout=self.timeout)
+
+    # --- METRICS ---
+    def stats(self):
+        """{"depth", "max_depth", "dropped", "commands": {kind: {...}}} with latencies in ms."""
+        with self._lock:
+            commands = {
+                kind: {"calls": n, "skipped": skipped, "failed": failed, "timeouts": timeouts,
+                       "mean_wait_ms": wait * 1000 / n if n else 0.0,
+                       "mean_ms": run * 1000 / n if n else 0.0,
+                       "max_ms": peak * 1000}
+                for kind, (n, skipped, failed, timeouts, wait, run, peak) in self._metrics.items()}
+        return {"depth": self.queue.qsize(), "max_depth": self.max_depth,
+                "dropped": self.dropped, "commands": commands}
+
+    def _count(self, kind, calls=0, skipped=0, failed=0, timeouts=0, wait=0.0, run=0.0):
+        entry = self._metrics.setdefault(kind, [0, 0, 0, 0, 0.0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += skipped
+        entry[2] += failed
+        entry[3] += timeouts
+        entry[4] += wait
+        entry[5] += run
+        entry[6] = max(entry[6], run)
+
+    # --- WORKERS ---
+    def _hypr(self):
+        client = getattr(self._local, "hypr", None)
+        if client is None:
+            client = self._local.hypr = HyprlandClient()
+        return client
+
+    def _work(self):
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+            if job.key is not None:
+                with self._lock:
+                    job = self._pending.pop(job.key, job)
+                    lock = self._locks.setdefault(job.key, threading.Lock())
+                with lock:
+                    self._run(job)
+            else:
+                self._run(job)
+
+    def _run(self, job):
+        start = time.monotonic()
+        timed_out = False
+        try:
+            if callable(job.action):
+                job.action()
+            else:
+                subprocess.run(job.action, timeout=job.timeout, check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            job.ok = True
+        except subprocess.TimeoutExpired:
+            job.ok = False
+            timed_out = True
+        except Exception:
+            job.ok = False
+        end = time.monotonic()
+        with self._lock:
+            if not job.ok and job.key is not None and self._pending.get(job.key) is None:
+                # Unknown device state: let the next request through.
+                self.state.pop(job.key, None)
+            self._count(job.kind, calls=1, failed=int(not job.ok), timeouts=int(timed_out),
+                        wait=start - job.queued, run=end - start)
+        job.done.set()
+        if job.then:
+            try:
+                job.then(job)
+            except Exception as e:
+                print(f"Actuator callback error ({job.kind}): {e}")
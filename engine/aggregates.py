@@ -0,0 +1,79 @@
+"""Running totals for the dashboard charts, updated in O(1) per span."""
+
+import threading
+from collections import defaultdict
+
+
+class RunningStats:
+    """
+    Seconds per status and per app plus the top-N apps, kept current by the
+    warden so charts never re-read the log. Totals only grow, so the top-N
+    list can be maintained in place: an app either moves up inside it or
+    displaces the current minimum.
+
+    `dirty` is set by every add() and cleared by take(), which lets the GUI
+    redraw on a fixed timer only when something actually changed.
+    """
+
+    def __init__(self, top_n=5):
+        self.top_n = top_n
+        self.status = defaultdict(float)
+        self.apps = defaultdict(float)
+        self._top = []
+        self._lock = threading.Lock()
+        self.dirty = False
+
+    def add(self, app, status, seconds):
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.status[status] += seconds
+            self.apps[app] += seconds
+            self._promote(app)
+            self.dirty = True
+
+    def seed(self, status_totals=(), app_totals=()):
+        """Start from historical totals (e.g. the store or an old CSV)."""
+        for status, sec in dict(status_totals).items():
+            self.status[status] += sec
+        for app, sec in dict(app_totals).items():
+            self.apps[app] += sec
+        self._top = sorted(self.apps, key=self.apps.get, reverse=True)[:self.top_n]
+        self.dirty = True
+
+    def replace(self, status_totals, app_totals):
+        """Swap in totals computed elsewhere (e.g. an overmand snapshot)."""
+        status, apps = dict(status_totals), dict(app_totals)
+        with self._lock:
+            if status == self.status and apps == self.apps:
+                return
+            self.status = defaultdict(float, status)
+            self.apps = defaultdict(float, apps)
+            self._top = sorted(self.apps, key=self.apps.get, reverse=True)[:self.top_n]
+            self.dirty = True
+
+    def _promote(self, app):
+        top, total = self._top, self.apps[app]
+        if app not in top:
+            if len(top) < self.top_n:
+                top.append(app)
+            elif total > self.apps[top[-1]]:
+                top[-1] = app
+            else:
+                return
+        i = top.index(app)
+        while i and self.apps[top[i - 1]] < total:
+            top[i - 1], top[i] = top[i], top[i - 1]
+            i -= 1
+
+    def top(self):
+        with self._lock:
+            return [(app, self.apps[app]) for app in self._top]
+
+    def take(self):
+        """(status totals, top apps) if changed since the last take, else None."""
+        with self._lock:
+            if not self.dirty:
+                return None
+            self.dirty = False
+            return dict(self.status), [(app, self.apps[app]) for app in self._top]
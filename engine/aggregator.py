@@ -0,0 +1,219 @@
+"""
+Long-running archive aggregator for the ovtop TUIs.
+
+Keeps archive_db.json's counters in memory, fed by Hyprland focus events,
+and persists them as a periodic atomic snapshot (the same JSON layout the
+TUI used to rewrite with jq) plus an append-only journal of deltas since
+that snapshot. Journal entries are numbered and the snapshot records the
+last one it contains, so a crash between writing the snapshot and emptying
+the journal cannot count a delta twice. Each tick it publishes a shell-sourceable stats file, so a
+TUI frame is a `. stats.sh` instead of hyprctl + several jq runs.
+When Hyprland's socket is missing or closes (a restart), the focused
+window's span is closed out, stats.sh shows Idle, and it reconnects with
+backoff.
+
+    python3 -m engine.aggregator --db archive_db.json --stats stats.sh \\
+        --surrender surrender.log --whitelist 'kitty|code'
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import signal
+import sys
+import time
+from datetime import datetime
+
+from engine.hypr import EventStream, FocusTracker, HyprlandClient, active_window
+
+EMPTY_DB = {"goal_sec": 0, "waste_sec": 0, "apps": {}, "total_tracked": 0, "streak": 0}
+
+
+class Archive:
+    """
+    archive_db.json in memory: snapshot + journal replay on load. Journal
+    lines are [seq, cls, title, sec, focus]; db["journal_seq"] is the last
+    seq folded into the snapshot, and replay skips everything up to it.
+    """
+
+    def __init__(self, path, snapshot_every=60.0):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.db = self._load()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._last_snapshot = time.monotonic()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                db = json.load(f)
+        except (OSError, ValueError):
+            db = json.loads(json.dumps(EMPTY_DB))
+        for key, value in EMPTY_DB.items():
+            db.setdefault(key, value)
+        done = self.seq = db.get("journal_seq", 0)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if len(entry) == 4:  # unnumbered, from before journal_seq
+                            entry = [None, *entry]
+                        seq, cls, title, sec, focus = entry
+                    except (ValueError, TypeError):
+                        break  # torn last line from a crash
+                    if seq is not None:
+                        if seq <= done:
+                            continue  # already in the snapshot
+                        self.seq = seq
+                    self._apply(db, cls, title, sec, focus)
+        return db
+
+    @staticmethod
+    def _apply(db, cls, title, sec, focus):
+        app = db["apps"].setdefault(cls, {"total": 0, "windows": {}})
+        app["total"] = app.get("total", 0) + sec
+        windows = app.setdefault("windows", {})
+        windows[title] = windows.get(title, 0) + sec
+        db["goal_sec" if focus else "waste_sec"] += sec
+        db["total_tracked"] += sec
+
+    def add(self, cls, title, sec, focus):
+        self._apply(self.db, cls, title, sec, focus)
+        self.seq += 1
+        self._journal.write(json.dumps([self.seq, cls, title, sec, focus]) + "\n")
+        self._journal.flush()
+        if time.monotonic() - self._last_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Atomically replace the JSON file, stamped with the last seq it holds, then empty the journal."""
+        self.db["journal_seq"] = self.seq
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.db, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._last_snapshot = time.monotonic()
+
+    def top(self, n_apps=3, n_windows=2):
+        apps = sorted(self.db["apps"].items(), key=lambda kv: kv[1].get("total", 0), reverse=True)
+        return [(name, app.get("total", 0),
+                 sorted(app.get("windows", {}).items(), key=lambda kv: kv[1], reverse=True)[:n_windows])
+                for name, app in apps[:n_apps]]
+
+    def close(self):
+        self.snapshot()
+        self._journal.close()
+
+
+def write_stats(path, archive, win, is_focus, top_apps=3, top_windows=2):
+    """Shell-sourceable snapshot of everything the TUI draws."""
+    q = shlex.quote
+    db = archive.db
+    lines = [
+        f"CLASS={q(win.cls if win else 'Idle')}",
+        f"TITLE={q(win.title if win else 'Empty')}",
+        f"IS_FOCUS={int(is_focus)}",
+        f"GOAL_SEC={int(db['goal_sec'])}",
+        f"WASTE_SEC={int(db['waste_sec'])}",
+        f"STREAK={int(db.get('streak') or 0)}",
+    ]
+    names, secs, wins = [], [], []
+    for i, (name, total, windows) in enumerate(archive.top(top_apps, top_windows)):
+        names.append(q(name))
+        secs.append(str(int(total)))
+        wins.extend(f"{i}|{int(sec)}|{title}" for title, sec in windows)
+    lines.append(f"TOP_APPS=({' '.join(names)})")
+    lines.append(f"TOP_SECS=({' '.join(secs)})")
+    lines.append(f"TOP_WINS=({' '.join(q(w) for w in wins)})")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+def run(args):
+    """Follow Hyprland until killed, reconnecting (with backoff) whenever its socket goes away."""
+    whitelist = re.compile(args.whitelist)
+    archive = Archive(args.db, args.snapshot_every)
+    delay = 1.0
+    try:
+        while True:
+            try:
+                if watch(args, archive, whitelist):
+                    delay = 1.0  # it was up; retry soon after a restart
+            except OSError:
+                pass  # Hyprland socket not up yet, or gone mid-read
+            write_stats(args.stats, archive, None, False)  # idle, not stale, while it is away
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+    finally:
+        archive.close()
+
+
+def watch(args, archive, whitelist):
+    """
+    Account one socket2 connection; True when any event arrived. Spans are
+    measured on the monotonic clock, and the focused window's span is
+    closed out when the stream ends or fails.
+    """
+    stream = EventStream(timeout=args.interval, clock=time.monotonic)
+    tracker = FocusTracker(lower=False)
+    mark = time.monotonic()
+    tracker.start(mark, active_window(HyprlandClient(), lower=False))
+    surrendered = None
+    seen = False
+
+    def account(win, start, end):
+        focus = bool(win and whitelist.search(win.cls))
+        if win and end > start:
+            archive.add(win.cls, win.title, end - start, focus)
+        return focus
+
+    try:
+        for event in stream:
+            now = time.monotonic()
+            if event:
+                seen = True
+                span = tracker.feed(*event)
+                if span:
+                    if span[2] > mark:
+                        account(span[0], mark, span[2])
+                    mark = max(mark, span[2])
+                if now - mark < args.interval:
+                    continue
+            win = tracker.focused
+            is_focus = account(win, mark, now)
+            mark = now
+            if win and not is_focus and surrendered is not win and args.surrender:
+                surrendered = win
+                with open(args.surrender, "a", encoding="utf-8") as f:
+                    f.write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] SURRENDER: {win.cls} | {win.title}\n")
+            write_stats(args.stats, archive, win, is_focus)
+    finally:
+        account(tracker.focused, mark, time.monotonic())
+        stream.close()
+    return seen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ovtop archive aggregator")
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--stats", required=True)
+    parser.add_argument("--whitelist", required=True)
+    parser.add_argument("--surrender")
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--snapshot-every", type=float, default=60.0)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # snapshot on kill too
+    try:
+        run(parser.parse_args())
+    except KeyboardInterrupt:
+        pass
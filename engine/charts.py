@@ -0,0 +1,298 @@
+"""
+QPainter charts for the dashboards: pie, horizontal bars and a status
+timeline, replacing matplotlib figures that went through Agg on every
+refresh.
+
+Each chart paints a cached pixmap. The static layer (background, title,
+axis) is rendered once per size; the data layer only when set_*() is given
+data that differs from what is on screen, so a dashboard can push the same
+totals every tick for nothing. The timeline paints new time onto its cached
+frame instead of repainting the history.
+"""
+
+import math
+from itertools import islice
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+from engine.activity_model import fmt_duration
+
+BACKGROUND = "#0d0d0d"
+TEXT = "#ffffff"
+AXIS = "#444444"
+STATUS_COLORS = {"Productive": "#00ff41", "Drifting": "#ff3333"}
+
+
+def last_items(mapping, n):
+    """The last `n` items of a dict in insertion order, without copying it."""
+    return list(islice(reversed(mapping.items()), n))[::-1]
+
+
+class Chart(QWidget):
+    """Base: layer caching and the title. Subclasses paint _static() and _data()."""
+
+    def __init__(self, title="", background=BACKGROUND, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.background = QColor(background)
+        self.text_font = QFont("Monospace", 9)
+        self.title_font = QFont("Monospace", 10, QFont.Weight.Bold)
+        self.setMinimumSize(240, 160)
+        self._static_layer = None  # background + title + axis at the current size
+        self._frame = None         # static layer + data
+        self.renders = 0           # data-layer renders, for benchmarks
+
+    # --- LAYERS ---
+    def plot_rect(self):
+        top = QFontMetrics(self.title_font).height() + 12 if self.title else 8
+        return QRectF(self.rect()).adjusted(10, top, -10, -10)
+
+    def invalidate(self):
+        """The data changed: re-render the data layer at the next paint."""
+        self._frame = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._static_layer = self._frame = None
+        super().resizeEvent(event)
+
+    def _layer(self):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+
+    def _render(self):
+        if self._static_layer is None:
+            self._static_layer = self._layer()
+            self._static_layer.fill(self.background)
+            p = QPainter(self._static_layer)
+            p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            if self.title:
+                p.setFont(self.title_font)
+                p.setPen(QColor(TEXT))
+                p.drawText(QRectF(self.rect()).adjusted(0, 6, 0, 0),
+                           Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, self.title)
+            self._static(p, self.plot_rect())
+            p.end()
+        self._frame = self._static_layer.copy()
+        p = QPainter(self._frame)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setFont(self.text_font)
+        self._data(p, self.plot_rect())
+        p.end()
+        self.renders += 1
+
+    def paintEvent(self, event):
+        if self._frame is None:
+            self._render()
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._frame)
+
+    def _static(self, p, plot):
+        pass
+
+    def _data(self, p, plot):
+        pass
+
+
+class PieChart(Chart):
+    """
+    Slices as (label, value, color), starting at twelve o'clock and running
+    counter-clockwise like WillpowerPie. Labels sit outside the pie and
+    percentages inside it (matplotlib's autopct='%1.1f%%').
+    """
+
+    def __init__(self, title="", background=BACKGROUND, parent=None):
+        super().__init__(title, background, parent)
+        self.slices = []
+
+    def set_slices(self, slices):
+        """Returns False (and schedules nothing) when the slices did not change."""
+        slices = [(str(label), float(value), QColor(color).name())
+                  for label, value, color in slices if value > 0]
+        if slices == self.slices:
+            return False
+        self.slices = slices
+        self.invalidate()
+        return True
+
+    def _data(self, p, plot):
+        total = sum(value for _, value, _ in self.slices)
+        if not total:
+            return
+        radius = min(plot.width(), plot.height()) * 0.36
+        center = plot.center()
+        box = QRectF(center.x() - radius, center.y() - radius, 2 * radius, 2 * radius)
+        angle = 90.0
+        for label, value, color in self.slices:
+            span = 360.0 * value / total
+            p.setPen(QPen(self.background, 1.5))
+            p.setBrush(QColor(color))
+            if span >= 360.0:
+                p.drawEllipse(box)
+            else:
+                p.drawPie(box, round(angle * 16), round(span * 16))
+            mid = math.radians(angle + span / 2)
+            p.setPen(QColor(TEXT))
+            self._text(p, _polar(center, radius * 0.6, mid), f"{100 * value / total:.1f}%")
+            self._text(p, _polar(center, radius * 1.25, mid), label)
+            angle += span
+
+    @staticmethod
+    def _text(p, at, text):
+        rect = QRectF(at.x() - 60, at.y() - 10, 120, 20)
+        p.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+
+class BarChart(Chart):
+    """
+    Horizontal bars as (label, value), top to bottom in the order given.
+    Labels take a fixed left column (elided to fit) so the axis belongs to
+    the static layer; values are printed with `fmt` (default: "Xm Ys").
+    """
+
+    def __init__(self, title="", color="#00aaff", fmt=fmt_duration, label_share=0.35,
+                 background=BACKGROUND, parent=None):
+        super().__init__(title, background, parent)
+        self.color = QColor(color)
+        self.fmt = fmt
+        self.label_share = label_share
+        self.bars = []
+
+    def set_bars(self, bars):
+        bars = [(str(label), float(value)) for label, value in bars]
+        if bars == self.bars:
+            return False
+        self.bars = bars
+        self.invalidate()
+        return True
+
+    def _axis_x(self, plot):
+        return plot.left() + plot.width() * self.label_share
+
+    def _static(self, p, plot):
+        x = self._axis_x(plot)
+        p.setPen(QPen(QColor(AXIS), 1))
+        p.drawLine(QPointF(x, plot.top()), QPointF(x, plot.bottom()))
+
+    def _data(self, p, plot):
+        if not self.bars:
+            return
+        x0 = self._axis_x(plot) + 1
+        width = plot.right() - x0
+        peak = max(value for _, value in self.bars) or 1.0
+        row = plot.height() / len(self.bars)
+        bar = min(row * 0.7, 28.0)
+        metrics = QFontMetrics(self.text_font)
+        label_width = int(x0 - plot.left() - 8)
+        for i, (label, value) in enumerate(self.bars):
+            top = plot.top() + i * row + (row - bar) / 2
+            length = width * value / peak
+            p.fillRect(QRectF(x0, top, length, bar), self.color)
+            p.setPen(QColor(TEXT))
+            p.drawText(QRectF(plot.left(), top, label_width, bar),
+                       Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                       metrics.elidedText(label, Qt.TextElideMode.ElideRight, label_width))
+            text = self.fmt(value)
+            inside = metrics.horizontalAdvance(text) + 8 < length
+            p.setPen(QColor(BACKGROUND if inside else TEXT))
+            p.drawText(QRectF(x0 + 4, top, max(length - 8, 0), bar) if inside
+                       else QRectF(x0 + length + 4, top, width, bar),
+                       (Qt.AlignmentFlag.AlignRight if inside else Qt.AlignmentFlag.AlignLeft)
+                       | Qt.AlignmentFlag.AlignVCenter, text)
+
+
+class TimelineChart(Chart):
+    """
+    Status over a session as one coloured band from `start` (epoch seconds)
+    across `span` seconds, with minute ticks in the static layer.
+    add(ts, status) extends the current segment or starts a new one; only
+    the time since the last paint is drawn onto the cached frame. set_span()
+    rescales everything when the session is extended (penalties).
+    """
+
+    def __init__(self, start, span, colors=STATUS_COLORS, title="", background=BACKGROUND,
+                 parent=None):
+        super().__init__(title, background, parent)
+        self.setMinimumSize(240, 60)
+        self.start = start
+        self.span = max(span, 1.0)
+        self.colors = {k: QColor(v) for k, v in colors.items()}
+        self.segments = []   # [start, end, status], oldest first
+        self._painted = None  # session time painted onto _frame so far
+
+    def add(self, ts, status):
+        if self.segments and self.segments[-1][2] == status and ts >= self.segments[-1][1]:
+            self.segments[-1][1] = ts
+        else:
+            begin = self.segments[-1][1] if self.segments else ts
+            self.segments.append([begin, ts, status])
+        self.update()
+
+    def set_span(self, span):
+        """Returns False (and schedules nothing) when the span did not change."""
+        span = max(span, 1.0)
+        if span == self.span:
+            return False
+        self.span = span
+        self._static_layer = None  # the minute ticks move too
+        self.invalidate()
+        return True
+
+    def _band(self, plot):
+        metrics = QFontMetrics(self.text_font)
+        return QRectF(plot.left(), plot.top(), plot.width(), plot.height() - metrics.height() - 4)
+
+    def _x(self, plot, ts):
+        return plot.left() + plot.width() * min(max((ts - self.start) / self.span, 0.0), 1.0)
+
+    def _static(self, p, plot):
+        band = self._band(plot)
+        p.setPen(QPen(QColor(AXIS), 1))
+        p.drawRect(band)
+        p.setFont(self.text_font)
+        minutes = self.span / 60
+        step = next((s for s in (1, 5, 10, 15, 30, 60, 120) if minutes / s <= 8), 240)
+        for m in range(0, int(minutes) + 1, step):
+            x = self._x(plot, self.start + m * 60)
+            p.setPen(QPen(QColor(AXIS), 1))
+            p.drawLine(QPointF(x, band.bottom()), QPointF(x, band.bottom() + 3))
+            p.setPen(QColor(TEXT))
+            p.drawText(QRectF(x - 30, band.bottom() + 3, 60, plot.bottom() - band.bottom()),
+                       Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, f"{m}m")
+
+    def _data(self, p, plot, since=None):
+        band = self._band(plot).adjusted(1, 1, -1, -1)
+        for begin, end, status in self.segments:
+            if since is not None and end <= since:
+                continue
+            x0 = self._x(plot, begin if since is None else max(begin, since))
+            x1 = self._x(plot, end)
+            p.fillRect(QRectF(x0, band.top(), max(x1 - x0, 1.0), band.height()),
+                       self.colors.get(status, QColor(AXIS)))
+        self._painted = self.segments[-1][1] if self.segments else None
+
+    def invalidate(self):
+        self._painted = None
+        super().invalidate()
+
+    def resizeEvent(self, event):
+        self._painted = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self._frame is not None and self.segments:
+            if self._painted is None:
+                self._frame = None  # first data since the frame was rendered empty
+            elif self.segments[-1][1] > self._painted:
+                p = QPainter(self._frame)
+                self._data(p, self.plot_rect(), since=self._painted)
+                p.end()
+        super().paintEvent(event)
+
+
+def _polar(center, radius, angle):
+    return QPointF(center.x() + radius * math.cos(angle), center.y() - radius * math.sin(angle))
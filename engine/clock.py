@@ -0,0 +1,107 @@
+"""
+Time for the warden loops.
+
+Accounting, audits and drift thresholds are measured on a monotonic clock
+instead of assuming every loop iteration took exactly its sleep: a slow
+hyprctl or grim makes an iteration longer, and that time is now counted.
+A VirtualClock stands in for the real one so a day-long session can be
+run through a warden in seconds.
+"""
+
+import threading
+import time
+
+
+class Clock:
+    """Real time: time() for timestamps that get stored, monotonic() for durations."""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+SYSTEM = Clock()
+
+
+class VirtualClock(Clock):
+    """
+    Time that only moves when told to. sleep() and advance() jump it forward
+    immediately, or at `speed` times real time when a speed is given.
+    time() starts at `start` (default: now) and moves in step with monotonic().
+    """
+
+    def __init__(self, start=None, speed=None):
+        self.start = time.time() if start is None else start
+        self.speed = speed
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.start + self.elapsed
+
+    def monotonic(self):
+        return self.elapsed
+
+    def advance(self, seconds):
+        with self._lock:
+            self.elapsed += max(seconds, 0.0)
+        return self.elapsed
+
+    def sleep(self, seconds):
+        if self.speed and seconds > 0:
+            time.sleep(seconds / self.speed)
+        self.advance(seconds)
+
+
+class Lap:
+    """
+    lap() returns the seconds since the previous call (or since creation),
+    for adding up time spent in whatever was just sampled.
+    """
+
+    def __init__(self, clock=SYSTEM):
+        self.clock = clock
+        self.last = clock.monotonic()
+
+    def __call__(self):
+        now = self.clock.monotonic()
+        elapsed, self.last = now - self.last, now
+        return elapsed
+
+
+class Every:
+    """
+    every() is True once per `period` seconds of monotonic time, however
+    irregular the calls; periods missed while blocked are not replayed.
+    """
+
+    def __init__(self, period, clock=SYSTEM):
+        self.period = period
+        self.clock = clock
+        self.next = clock.monotonic() + period
+
+    def __call__(self):
+        now = self.clock.monotonic()
+        if now < self.next:
+            return False
+        self.next = now + self.period
+        return True
+
+    def reset(self):
+        self.next = self.clock.monotonic() + self.period
+
+
+def wall(mono, clock=SYSTEM):
+    """The time() timestamp of a monotonic() instant, for storing a span measured on the latter."""
+    return clock.time() - (clock.monotonic() - mono)
+
+
+def crossed(before, after, step):
+    """True when a running total went past a multiple of `step` between two samples."""
+    return before // step != after // step
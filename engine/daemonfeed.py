@@ -0,0 +1,48 @@
+"""Qt side of the overmand protocol: a drop-in for a frontend's WardenThread."""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from engine.aggregates import RunningStats
+from engine.overmand import OvermandClient
+
+
+class DaemonFeed(QThread):
+    """
+    Follows a running overmand instead of watching Hyprland itself. It emits
+    the same signals as the dashboards' WardenThread and keeps `stats` in
+    step with the daemon's totals, so a frontend only has to choose which
+    one to start.
+    """
+
+    lockout_signal = pyqtSignal(str, float)         # evidence path, monotonic detection time
+    update_signal = pyqtSignal(str, str)            # app, status
+    data_signal = pyqtSignal(str, str, str, float)  # app, title, status, seconds credited
+    snapshot_signal = pyqtSignal(dict)              # every tick
+
+    def __init__(self, client=None):
+        super().__init__()
+        self.client = client or OvermandClient()
+        self.stats = RunningStats()
+
+    def run(self):
+        while True:
+            try:
+                for event in self.client.subscribe():
+                    if event:
+                        self.dispatch(event)
+            except (OSError, ValueError):
+                pass
+            self.msleep(2000)  # daemon restarting
+
+    def dispatch(self, event):
+        kind = event.get("event")
+        if kind in ("tick", "snapshot"):
+            self.stats.replace(event["totals"], event["top"])
+            if event["app"]:
+                self.update_signal.emit(event["app"], event["status"] or "")
+            self.snapshot_signal.emit(event)
+        elif kind == "span":
+            self.data_signal.emit(event["app"] or "idle", event["title"] or "", event["status"],
+                                  event["seconds"])
+        elif kind == "lockout":
+            self.lockout_signal.emit(event["path"], event["detected"])
@@ -0,0 +1,308 @@
+"""
+Audit evidence: screenshots of the focused output (or window), encoded off
+the warden thread, stored by content hash next to a thumbnail and pruned
+by age and total size. A capture that looks like a recent one (perceptual
+hash within a few bits) is not stored again; it references that object.
+
+Layout under `root`:
+    objects/ab/abcdef....jpg    evidence, named by the SHA-256 of its bytes
+    thumbs/ab/abcdef....jpg     thumbnail of the same capture
+    phash.json                  perceptual hashes of recent objects
+"""
+
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import subprocess
+import threading
+import time
+
+from engine.hypr import HyprlandClient
+
+EVIDENCE_DIR = os.path.expanduser("~/.local/share/overman/evidence")
+FORMATS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+
+def capture_region(mode="monitor", client=None):
+    """grim arguments selecting the focused monitor or window; [] captures everything."""
+    client = client or HyprlandClient()
+    try:
+        if mode == "window":
+            win = client.json("activewindow")
+            (x, y), (w, h) = win.get("at", (0, 0)), win.get("size", (0, 0))
+            if w and h:
+                return ["-g", f"{x},{y} {w}x{h}"]
+        for mon in client.json("monitors"):
+            if mon.get("focused"):
+                return ["-o", mon["name"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return []
+
+
+# ==========================================
+# PERCEPTUAL HASHES (64-bit ints)
+# ==========================================
+def dhash(img):
+    """Difference hash: is each pixel brighter than its left neighbour (9x8 grey)."""
+    import numpy as np
+    from PIL import Image
+
+    px = np.asarray(img.convert("L").resize((9, 8), Image.Resampling.BOX), dtype=np.int16)
+    return int(np.packbits(px[:, 1:] > px[:, :-1]).view(">u8")[0])
+
+
+def phash(img):
+    """DCT hash: low 8x8 frequencies of a 32x32 grey image against their median."""
+    import numpy as np
+    from PIL import Image
+
+    px = np.asarray(img.convert("L").resize((32, 32), Image.Resampling.BOX), dtype=np.float64)
+    k = np.arange(32)
+    dct = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / 64)
+    low = (dct @ px @ dct.T)[:8, :8].ravel()
+    return int(np.packbits(low > np.median(low[1:])).view(">u8")[0])
+
+
+HASHES = {"dhash": dhash, "phash": phash}
+
+
+def hamming(h, hashes):
+    """Bit distance from `h` to each of `hashes`, as a NumPy array."""
+    import numpy as np
+
+    diff = np.asarray(hashes, dtype=np.uint64) ^ np.uint64(h)
+    return np.unpackbits(diff.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def encode(raw, root, fmt="jpeg", quality=80, max_size=(1920, 1080), thumb_size=(320, 180),
+           hash_fn="dhash", recent=(), threshold=0):
+    """
+    Downscale and encode one raw capture, then write it and its thumbnail
+    under `root` unless an identical object already exists. When a `recent`
+    (hash, path, bytes) entry is within `threshold` bits, nothing is written
+    and that object is returned with ref=True.
+    Top-level and free of shared state, so it also runs in a process pool.
+    """
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(raw))
+    img = img.convert("RGB")
+    img.thumbnail(max_size)
+    h = HASHES[hash_fn](img)
+    recent = [r for r in recent if os.path.exists(r[1])]
+    if recent:
+        dist = hamming(h, [r[0] for r in recent])
+        best = int(dist.argmin())
+        if dist[best] <= threshold:
+            _, path, size = recent[best]
+            os.utime(path)
+            digest = os.path.splitext(os.path.basename(path))[0]
+            return {"digest": digest, "path": path,
+                    "thumb": os.path.join(root, "thumbs", digest[:2], f"{digest}.jpg"),
+                    "bytes": size, "width": img.width, "height": img.height,
+                    "new": False, "ref": True, "phash": h, "distance": int(dist[best])}
+    width, height = img.size
+    data = _save(img, fmt, quality)
+    digest = hashlib.sha256(data).hexdigest()
+    ext = FORMATS[fmt]
+    path = os.path.join(root, "objects", digest[:2], f"{digest}.{ext}")
+    thumb = os.path.join(root, "thumbs", digest[:2], f"{digest}.jpg")
+    exists = os.path.exists(path)
+    if exists:
+        os.utime(path)
+    else:
+        _write(path, data)
+    if not os.path.exists(thumb):
+        img.thumbnail(thumb_size)
+        _write(thumb, _save(img, "jpeg", 70))
+    return {"digest": digest, "path": path, "thumb": thumb, "bytes": len(data),
+            "width": width, "height": height, "new": not exists, "ref": False, "phash": h}
+
+
+def _save(img, fmt, quality):
+    buf = io.BytesIO()
+    img.save(buf, format=fmt.upper(), quality=quality, optimize=fmt != "png")
+    return buf.getvalue()
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class EvidenceStore:
+    """
+    capture() never blocks: grim runs on a thread of the store's own and
+    the image is encoded on `executor` (two threads by default; Pillow
+    releases the GIL while resizing and encoding). Only the top-level
+    encode() is submitted to `executor`, so a ProcessPoolExecutor works as
+    well. `then(evidence)` gets the dict returned by encode(), or None when
+    the capture failed.
+
+    mode:          "monitor" (focused output), "window" (focused window) or "all".
+    max_bytes:     total size of objects/ kept on disk.
+    max_age_days:  objects untouched for longer are deleted.
+    hash_fn:       "dhash" or "phash" for near-duplicate detection.
+    threshold:     max differing bits (of 64) to count as the same screen;
+                   None turns deduplication off.
+    window:        how many recent objects a capture is compared against.
+    """
+
+    def __init__(self, root=EVIDENCE_DIR, mode="monitor", fmt="jpeg", quality=80,
+                 max_size=(1920, 1080), thumb_size=(320, 180),
+                 max_bytes=1 << 30, max_age_days=60, hash_fn="dhash", threshold=6,
+                 window=48, executor=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"unsupported evidence format: {fmt}")
+        if hash_fn not in HASHES:
+            raise ValueError(f"unsupported perceptual hash: {hash_fn}")
+        self.root = root
+        self.mode = mode
+        self.options = {"fmt": fmt, "quality": quality, "max_size": max_size,
+                        "thumb_size": thumb_size, "hash_fn": hash_fn}
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.threshold = threshold
+        self.window = window
+        self.executor = executor or concurrent.futures.ThreadPoolExecutor(2, thread_name_prefix="evidence")
+        self._grabber = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="evidence-grab")
+        self._prune_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.captured = 0
+        self.failed = 0
+        self.pruned = 0
+        self.deduped = 0
+        self.saved_bytes = 0
+        os.makedirs(root, exist_ok=True)
+        self._index = os.path.join(root, "phash.json")
+        self.recent = self._load_recent()  # [(hash, path, bytes)], newest last
+
+    def capture(self, then=None):
+        future = self._grabber.submit(self._grab)
+        future.add_done_callback(lambda f: self._encode(f, then))
+        return future
+
+    def _grab(self):
+        region = capture_region(self.mode) if self.mode != "all" else []
+        return subprocess.run(["grim", "-t", "ppm", *region, "-"], capture_output=True,
+                              timeout=10, check=True).stdout
+
+    def _encode(self, grabbed, then):
+        try:
+            raw = grabbed.result()
+        except Exception as e:
+            print(f"Evidence capture failed: {e}")
+            self._done(None, then)
+            return
+        with self._lock:
+            recent = list(self.recent) if self.threshold is not None else []
+        future = self.executor.submit(encode, raw, self.root, recent=recent,
+                                      threshold=self.threshold or 0, **self.options)
+        future.add_done_callback(lambda f: self._stored(f, then))
+
+    def _stored(self, future, then):
+        try:
+            evidence = future.result()
+        except Exception as e:
+            print(f"Evidence encode failed: {e}")
+            evidence = None
+        if evidence:
+            self._remember(evidence)
+        self._done(evidence, then)
+        if evidence and evidence["new"]:
+            self.prune()
+
+    def _done(self, evidence, then):
+        with self._lock:
+            if evidence:
+                self.captured += 1
+            else:
+                self.failed += 1
+        if then:
+            then(evidence)
+
+    # --- NEAR-DUPLICATES ---
+    def _remember(self, evidence):
+        with self._lock:
+            if evidence["ref"]:
+                self.deduped += 1
+                self.saved_bytes += evidence["bytes"]
+            # An object keeps the hash of the image actually stored: a ref hit
+            # only moves it to the newest end, otherwise a slowly changing
+            # screen would keep matching an ever older object.
+            stored = [r for r in self.recent if r[1] == evidence["path"]]
+            self.recent = [r for r in self.recent if r[1] != evidence["path"]]
+            if stored:
+                self.recent.append(stored[0])
+            elif not evidence["ref"]:
+                self.recent.append((evidence["phash"], evidence["path"], evidence["bytes"]))
+            del self.recent[:-self.window]
+            recent = list(self.recent)
+        try:
+            tmp = self._index + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(recent, f)
+            os.replace(tmp, self._index)
+        except OSError as e:
+            print(f"Evidence index error: {e}")
+
+    def _load_recent(self):
+        try:
+            with open(self._index) as f:
+                return [tuple(r) for r in json.load(f) if os.path.exists(r[1])][-self.window:]
+        except (OSError, ValueError):
+            return []
+
+    def stats(self):
+        return {"captured": self.captured, "failed": self.failed, "deduped": self.deduped,
+                "saved_bytes": self.saved_bytes, "pruned": self.pruned}
+
+    # --- RETENTION ---
+    def prune(self, now=None):
+        """Delete objects past max_age, then the oldest until under max_bytes."""
+        now = now or time.time()
+        with self._prune_lock:
+            objects = []
+            for entry in self._scan("objects"):
+                st = entry.stat()
+                objects.append((st.st_mtime, st.st_size, entry.path))
+            objects.sort()
+            total = sum(size for _, size, _ in objects)
+            for mtime, size, path in objects[:-1]:  # never the newest capture
+                if now - mtime <= self.max_age and total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+            return total
+
+    def _remove(self, path):
+        digest = os.path.splitext(os.path.basename(path))[0]
+        thumb = os.path.join(self.root, "thumbs", digest[:2], f"{digest}.jpg")
+        for p in (path, thumb):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self.pruned += 1
+
+    def _scan(self, kind):
+        base = os.path.join(self.root, kind)
+        if not os.path.isdir(base):
+            return
+        for bucket in os.scandir(base):
+            if bucket.is_dir():
+                for entry in os.scandir(bucket.path):
+                    if not entry.name.endswith(".tmp"):
+                        yield entry
+
+    def usage(self):
+        """(object count, total bytes) currently on disk."""
+        sizes = [entry.stat().st_size for entry in self._scan("objects")]
+        return len(sizes), sum(sizes)
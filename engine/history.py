@@ -0,0 +1,109 @@
+"""
+Focus history for the willpower graphs: a fixed-capacity ring buffer that
+can hold a whole day of 2-second samples, and LTTB downsampling to the
+number of pixel columns actually drawn.
+"""
+
+import threading
+from array import array
+
+DAY_AT_2S = 24 * 3600 // 2
+
+
+class FocusHistory:
+    """
+    (timestamp, value) samples in two preallocated arrays; append() is O(1)
+    and overwrites the oldest sample once `capacity` is reached.
+
+    Samples are addressed by absolute index: the n-th sample ever appended
+    has index n whether or not it is still held, so a reader can ask for
+    what arrived since the last index it saw (since()). `first` is the index
+    of the oldest sample still held, `total` one past the newest.
+    """
+
+    def __init__(self, capacity=DAY_AT_2S):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.ts = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def append(self, ts, value):
+        with self._lock:
+            i = self.total % self.capacity
+            self.ts[i] = ts
+            self.values[i] = float(value)
+            self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def __bool__(self):
+        return self.total > 0
+
+    @property
+    def first(self):
+        return self.total - len(self)
+
+    def at(self, index):
+        """(timestamp, value) of the sample with absolute `index`, which must still be held."""
+        if not self.first <= index < self.total:
+            raise IndexError(index)
+        i = index % self.capacity
+        return self.ts[i], self.values[i]
+
+    def since(self, index=0):
+        """(first index, timestamps, values) of the samples from `index` on, oldest first."""
+        with self._lock:
+            start = max(index, self.total - min(self.total, self.capacity))
+            count = self.total - start
+            if count <= 0:
+                return self.total, [], []
+            head = start % self.capacity
+            tail = head + count
+            if tail <= self.capacity:
+                return start, self.ts[head:tail].tolist(), self.values[head:tail].tolist()
+            wrap = tail - self.capacity
+            return (start, self.ts[head:].tolist() + self.ts[:wrap].tolist(),
+                    self.values[head:].tolist() + self.values[:wrap].tolist())
+
+    def __iter__(self):
+        _, ts, values = self.since(0)
+        return iter(zip(ts, values))
+
+
+def lttb(xs, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets: `threshold` of the points (first and last
+    always kept) that preserve the visual shape of the series. Returns the
+    chosen (xs, ys); inputs with no more than `threshold` points come back
+    unchanged.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    every = (n - 2) / (threshold - 2)
+    out_x, out_y = [xs[0]], [ys[0]]
+    a = 0
+    for i in range(threshold - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        span = nxt_end - hi
+        avg_x = sum(xs[hi:nxt_end]) / span
+        avg_y = sum(ys[hi:nxt_end]) / span
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        best, pick = -1.0, lo
+        for j in range(lo, hi):
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best:
+                best, pick = area, j
+        out_x.append(xs[pick])
+        out_y.append(ys[pick])
+        a = pick
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
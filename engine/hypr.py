@@ -0,0 +1,310 @@
+"""Hyprland IPC: socket2 event stream and focus tracking."""
+
+import os
+import json
+import socket
+import subprocess
+import sys
+import time
+
+
+# ==========================================
+# SOCKET PATHS
+# ==========================================
+def socket_dir():
+    """Runtime directory of the running Hyprland instance."""
+    sig = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    runtime = os.environ.get("XDG_RUNTIME_DIR", "")
+    candidates = [os.path.join(runtime, "hypr", sig)] if runtime else []
+    candidates.append(os.path.join("/tmp/hypr", sig))
+    for path in candidates:
+        if os.path.exists(os.path.join(path, ".socket2.sock")):
+            return path
+    return candidates[0]
+
+
+def event_socket_path():
+    return os.path.join(socket_dir(), ".socket2.sock")
+
+
+def request_socket_path():
+    return os.path.join(socket_dir(), ".socket.sock")
+
+
+def active_window(client=None, lower=True):
+    """Focused window as a Window (or None), used to seed a FocusTracker."""
+    try:
+        data = (client or HyprlandClient()).json("activewindow")
+    except Exception:
+        return None
+    return window_from_json(data, lower)
+
+
+def window_from_json(data, lower=True):
+    if not data or (not data.get("class") and not data.get("title")):
+        return None
+    norm = str.lower if lower else str
+    return Window(data.get("address") or None, norm(data.get("class", "")),
+                  norm(data.get("title", "")))
+
+
+# ==========================================
+# REQUEST CLIENT (.socket.sock)
+# ==========================================
+class HyprlandClient:
+    """
+    Talks to Hyprland's request socket directly instead of forking hyprctl.
+
+    Hyprland answers one request per connection, so the win comes from
+    skipping the process spawn, reusing one receive buffer and packing several
+    commands into a single `[[BATCH]]` round trip. Every call is timed;
+    see stats().
+    """
+
+    BATCH_SEP = "\n\n\n"
+
+    def __init__(self, path=None, timeout=1.0, bufsize=65536):
+        self.path = path or request_socket_path()
+        self.timeout = timeout
+        self._buf = bytearray(bufsize)
+        self._latency = {}  # command -> [calls, total_s, max_s]
+
+    def request(self, command):
+        """Send a raw command (e.g. `j/clients`) and return the reply text."""
+        start = time.perf_counter()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+            sock.sendall(command.encode("utf-8"))
+            size = 0
+            while True:
+                if size == len(self._buf):
+                    self._buf.extend(bytes(len(self._buf)))
+                with memoryview(self._buf) as view:
+                    n = sock.recv_into(view[size:])
+                if not n:
+                    break
+                size += n
+            reply = self._buf[:size].decode("utf-8", "replace")
+        finally:
+            sock.close()
+        self._record(command, time.perf_counter() - start)
+        return reply
+
+    def json(self, what):
+        return json.loads(self.request(f"j/{what}"))
+
+    def batch(self, commands):
+        """Run several commands in one round trip; returns one reply each."""
+        replies = self.request("[[BATCH]]" + ";".join(commands)).split(self.BATCH_SEP)
+        return replies + [""] * (len(commands) - len(replies))
+
+    def batch_json(self, whats):
+        return [json.loads(r) if r.strip() else None
+                for r in self.batch([f"j/{w}" for w in whats])]
+
+    def dispatch(self, *args):
+        return self.request("dispatch " + " ".join(args))
+
+    def close_windows(self, addresses):
+        """Close every address with a single batched dispatch."""
+        if addresses:
+            self.batch([f"dispatch closewindow address:{a}" for a in addresses])
+
+    def stats(self):
+        """Per-command latency: {command: {"calls", "mean_ms", "max_ms"}}."""
+        return {cmd: {"calls": n, "mean_ms": total * 1000 / n, "max_ms": peak * 1000}
+                for cmd, (n, total, peak) in self._latency.items()}
+
+    def _record(self, command, elapsed):
+        if command.startswith("[[BATCH]]"):
+            key = "batch"
+        elif command.startswith("dispatch "):
+            key = " ".join(command.split(" ", 2)[:2])
+        else:
+            key = command
+        entry = self._latency.setdefault(key, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+
+
+# ==========================================
+# EVENT STREAM (.socket2.sock)
+# ==========================================
+class EventStream:
+    """
+    Line reader over Hyprland's event socket.
+    Iterating yields (timestamp, event, data) per event, or None when
+    `timeout` seconds pass without one so callers can run timers.
+    """
+
+    def __init__(self, path=None, timeout=2.0, clock=time.time):
+        self.path = path or event_socket_path()
+        self.timeout = timeout
+        self.clock = clock
+        self.sock = None
+        self._buf = b""
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+        return self
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def __iter__(self):
+        if self.sock is None:
+            self.connect()
+        while self.sock is not None:
+            try:
+                chunk = self.sock.recv(4096)
+            except socket.timeout:
+                yield None
+                continue
+            if not chunk:
+                return
+            ts = self.clock()
+            self._buf += chunk
+            *lines, self._buf = self._buf.split(b"\n")
+            for line in lines:
+                name, sep, data = line.decode("utf-8", "replace").partition(">>")
+                if sep:
+                    yield ts, name, data
+
+
+# ==========================================
+# FOCUS TRACKER
+# ==========================================
+class Window:
+    __slots__ = ("address", "cls", "title")
+
+    def __init__(self, address, cls, title):
+        self.address = address
+        self.cls = cls
+        self.title = title
+
+
+class FocusTracker:
+    """
+    Folds socket2 events into the currently focused window.
+
+    feed() returns the span that just ended as (window, start, end) whenever
+    the focused class/title changes, so time is accounted from event
+    timestamps instead of fixed poll increments. `focused` is None when
+    nothing has focus. Class and title are lowercased unless lower=False.
+    """
+
+    EVENTS = ("activewindow", "activewindowv2", "windowtitle", "windowtitlev2",
+              "openwindow", "closewindow")
+
+    def __init__(self, lower=True):
+        self.windows = {}
+        self.focused = None
+        self.since = None
+        self._norm = str.lower if lower else str
+
+    def start(self, ts, window=None):
+        """Seed state (e.g. from `j/activewindow`) before events arrive."""
+        self.focused = window
+        self.since = ts
+        if window and window.address:
+            self.windows[window.address] = window
+
+    def feed(self, ts, name, data):
+        if name == "activewindow":
+            cls, _, title = data.partition(",")
+            cls, title = self._norm(cls), self._norm(title)
+            if not cls and not title:
+                return self._focus(ts, None)
+            current = self.focused
+            if current and current.cls == cls and current.title == title:
+                return None
+            return self._focus(ts, Window(None, cls, title))
+
+        if name == "activewindowv2":
+            address = self._addr(data)
+            if self.focused and address:
+                self.focused.address = address
+                self.windows[address] = self.focused
+            return None
+
+        if name == "openwindow":
+            address, _, rest = data.partition(",")
+            _, _, rest = rest.partition(",")
+            cls, _, title = rest.partition(",")
+            address = self._addr(address)
+            self.windows[address] = Window(address, self._norm(cls), self._norm(title))
+            return None
+
+        if name == "windowtitlev2":
+            address, _, title = data.partition(",")
+            return self._retitle(ts, self._addr(address), self._norm(title))
+
+        if name == "windowtitle":
+            # v1 carries no title; the focused window's new title follows
+            # as an activewindow event.
+            return None
+
+        if name == "closewindow":
+            address = self._addr(data)
+            self.windows.pop(address, None)
+            if self.focused and self.focused.address == address:
+                return self._focus(ts, None)
+        return None
+
+    def _retitle(self, ts, address, title):
+        win = self.windows.get(address)
+        if win is None:
+            return None
+        if win is not self.focused:
+            win.title = title
+            return None
+        if win.title == title:
+            return None
+        return self._focus(ts, Window(address, win.cls, title))
+
+    def _focus(self, ts, window):
+        span = None
+        if self.since is not None:
+            span = (self.focused, self.since, ts)
+        self.focused = window
+        self.since = ts
+        if window and window.address:
+            self.windows[window.address] = window
+        return span
+
+    def elapsed(self, now):
+        """Seconds the current window has held focus."""
+        return 0.0 if self.since is None else now - self.since
+
+    @staticmethod
+    def _addr(raw):
+        raw = raw.strip()
+        if raw and not raw.startswith("0x"):
+            raw = "0x" + raw
+        return raw
+
+
+# ==========================================
+# LATENCY CHECK
+# ==========================================
+if __name__ == "__main__":
+    # python -m engine.hypr [N]: socket client vs. fork-per-call hyprctl
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    client = HyprlandClient()
+    for _ in range(n):
+        client.json("activewindow")
+        client.batch_json(["activewindow", "clients"])
+    start = time.perf_counter()
+    for _ in range(min(n, 50)):
+        subprocess.check_output(["hyprctl", "activewindow", "-j"])
+    fork_ms = (time.perf_counter() - start) * 1000 / min(n, 50)
+    for cmd, row in client.stats().items():
+        print(f"{cmd:20s} calls={row['calls']:<6d} mean={row['mean_ms']:.3f}ms max={row['max_ms']:.3f}ms")
+    print(f"{'hyprctl (fork)':20s} mean={fork_ms:.3f}ms")
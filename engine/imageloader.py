@@ -0,0 +1,49 @@
+"""
+Off-thread evidence decoding for the lockout windows.
+
+A full-resolution grim capture of a 4K screen takes hundreds of
+milliseconds to decode and scale on the GUI thread. ImageLoader decodes on
+the global QThreadPool, letting QImageReader scale while decoding, and
+hands back a QImage already sized for display.
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+
+
+class _Decode(QRunnable):
+    def __init__(self, loader, token, path, size):
+        super().__init__()
+        self.loader = loader
+        self.token = token
+        self.path = path
+        self.size = size
+
+    def run(self):
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        source = reader.size()
+        if source.isValid() and (source.width() > self.size.width() or source.height() > self.size.height()):
+            reader.setScaledSize(source.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        self.loader.loaded.emit(self.token, image if not image.isNull() else QImage())
+
+
+class ImageLoader(QObject):
+    """
+    load() returns a token and later emits loaded(token, image) on the
+    loader's thread; `image` is null when the file could not be read.
+    Only the newest request matters to a lockout, so callers compare the
+    token with `latest` and drop anything older.
+    """
+
+    loaded = pyqtSignal(int, QImage)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.latest = 0
+
+    def load(self, path, width, height):
+        self.latest += 1
+        QThreadPool.globalInstance().start(_Decode(self, self.latest, str(path), QSize(width, height)))
+        return self.latest
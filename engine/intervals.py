@@ -0,0 +1,97 @@
+"""
+Run-length focus log: one interval per stretch of unchanged focus instead of
+one row per poll. Class and title strings are interned to small ids.
+"""
+
+from collections import defaultdict
+
+
+class Interner:
+    """Maps strings to dense ids and back."""
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def __call__(self, name):
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def __getitem__(self, i):
+        return self.names[i]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class IntervalLog:
+    """
+    Focus intervals as [start, end, class_id, title_id, status].
+
+    add(start, end, ...) extends the open interval when the window and
+    status are unchanged and the new span starts where it ended; anything
+    else closes it (handing the row to `on_close`) and opens a new one.
+    Totals are sums of end - start, so they match adding up the individual
+    spans (e.g. 2-second samples) that were fed in.
+    """
+
+    def __init__(self, on_close=None):
+        self.classes = Interner()
+        self.titles = Interner()
+        self.intervals = []
+        self.current = None
+        self.on_close = on_close
+
+    def add(self, start, end, cls, title, status):
+        cid, tid = self.classes(cls), self.titles(title)
+        cur = self.current
+        if cur and cur[1] == start and cur[2] == cid and cur[3] == tid and cur[4] == status:
+            cur[1] = end
+            return
+        self.close()
+        self.current = [start, end, cid, tid, status]
+
+    def close(self):
+        """Finish the open interval (window change, shutdown)."""
+        if self.current is None:
+            return
+        self.intervals.append(self.current)
+        if self.on_close:
+            self.on_close(self.row(self.current))
+        self.current = None
+
+    def row(self, interval):
+        """Interval with class/title resolved back to strings."""
+        start, end, cid, tid, status = interval
+        return start, end, self.classes[cid], self.titles[tid], status
+
+    def __iter__(self):
+        yield from self.intervals
+        if self.current:
+            yield self.current
+
+    def __len__(self):
+        return len(self.intervals) + (self.current is not None)
+
+    # --- AGGREGATES ---
+    def by_status(self):
+        totals = defaultdict(float)
+        for start, end, _, _, status in self:
+            totals[status] += end - start
+        return dict(totals)
+
+    def by_app(self):
+        totals = defaultdict(float)
+        for start, end, cid, _, _ in self:
+            totals[self.classes[cid]] += end - start
+        return dict(totals)
+
+    def by_title(self):
+        """{app: {title: seconds}}, the shape of the dashboards' session.logs."""
+        totals = defaultdict(lambda: defaultdict(float))
+        for start, end, cid, tid, _ in self:
+            totals[self.classes[cid]][self.titles[tid]] += end - start
+        return {app: dict(titles) for app, titles in totals.items()}
@@ -0,0 +1,163 @@
+"""
+Multi-keyword matching for FORBIDDEN / BANNED / KILL_KEYWORDS lists.
+
+KeywordMatcher compiles the list once into an Aho-Corasick automaton, so a
+window class/title is scanned in one pass no matter how many keywords there
+are. Short lists (the shipped ones have 5-25 entries) skip the automaton:
+a substring test per keyword runs in C and beats the per-character Python
+loop until the list is a few dozen long (benchmarks/hotpath.py keywords.*).
+Matching is case-insensitive.
+"""
+
+import sys
+from collections import deque
+
+SCAN_MAX = 32  # up to this many keywords, test each with `in` instead of the automaton
+
+
+class KeywordMatcher:
+    """
+    word_boundary=True only accepts matches that are not glued to letters or
+    digits on either side; an int N applies that rule to keywords of N chars
+    or fewer (so "x" or "sh" stop matching inside words while "porn" still
+    matches "pornhub"). Lists longer than `scan_max` use the automaton.
+    """
+
+    def __init__(self, keywords, word_boundary=False, scan_max=SCAN_MAX):
+        self.keywords = []
+        self._keys = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._bounded = []
+        seen = set()
+        for kw in keywords:
+            key = kw.strip().lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            if word_boundary is True:
+                bounded = True
+            elif word_boundary is False:
+                bounded = False
+            else:
+                bounded = len(key) <= word_boundary
+            self._keys.append(key)
+            self.keywords.append(kw.strip())
+            self._bounded.append(bounded)
+        self._lengths = [len(k) for k in self._keys]
+        self.automaton = len(self._keys) > scan_max
+        if self.automaton:
+            for index, key in enumerate(self._keys):
+                self._add(key, index)
+            self._build()
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _add(self, key, index):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (index,)
+
+    def _build(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+    @staticmethod
+    def _whole(text, start, end):
+        """text[start:end] is not glued to letters or digits on either side."""
+        return not (start > 0 and text[start - 1].isalnum()) and \
+            not (end < len(text) and text[end].isalnum())
+
+    def _iter(self, text):
+        if not self.automaton:
+            yield from self._iter_find(text)
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        bounded, lengths = self._bounded, self._lengths
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for k in out[state]:
+                if not bounded[k] or self._whole(text, i - lengths[k] + 1, i + 1):
+                    yield k
+
+    def _iter_find(self, text):
+        """Keywords in list order: `in` first (C speed), positions only for bounded ones."""
+        bounded = self._bounded
+        for k, key in enumerate(self._keys):
+            if key in text and (not bounded[k] or self._find_whole(text, key)):
+                yield k
+
+    def _find_whole(self, text, key):
+        start = text.find(key)
+        while start >= 0:
+            if self._whole(text, start, start + len(key)):
+                return True
+            start = text.find(key, start + 1)
+        return False
+
+    def scan(self, *texts):
+        """All keywords found in any of the texts, in keyword-list order."""
+        found = set()
+        for text in texts:
+            if text:
+                found.update(self._iter(text.lower()))
+        return [self.keywords[k] for k in sorted(found)]
+
+    def search(self, *texts):
+        """A keyword found (or None); stops at the first hit."""
+        if not self.automaton:
+            lowered = [text.lower() for text in texts if text]
+            bounded = self._bounded
+            for k, key in enumerate(self._keys):
+                for text in lowered:
+                    if key in text and (not bounded[k] or self._find_whole(text, key)):
+                        return self.keywords[k]
+            return None
+        for text in texts:
+            if text:
+                for k in self._iter(text.lower()):
+                    return self.keywords[k]
+        return None
+
+
+if __name__ == "__main__":
+    # Shell filter used by nmsr.sh:
+    #   <tsv: id \t field \t field ...> | python3 -m engine.keywords [--word N] KEYWORD...
+    # prints "id \t keyword" for every keyword found on a line. A blank input
+    # line ends a batch and is answered with a blank line, flushed, so one
+    # long-lived process (a coprocess) can serve every pass.
+    args = sys.argv[1:]
+    boundary = False
+    if args[:1] == ["--word"]:
+        boundary = int(args[1])
+        args = args[2:]
+    matcher = KeywordMatcher(args, word_boundary=boundary)
+    for line in sys.stdin:
+        if line == "\n":
+            print(flush=True)
+            continue
+        ident, _, rest = line.rstrip("\n").partition("\t")
+        for kw in matcher.scan(*rest.split("\t")):
+            print(f"{ident}\t{kw}")
@@ -0,0 +1,260 @@
+"""
+Live session numbers in shared memory, for readers that poll fast.
+
+overmand writes a small fixed-layout block in /dev/shm whenever its
+counters change; progress bars, ovtop and status-bar widgets map it and read
+it directly, without a socket round-trip, JSON or waking the warden.
+
+Writes are guarded by a sequence lock: the writer makes `seq` odd, updates
+the fields and makes it even again. A reader copies the block and retries
+while `seq` was odd or changed underneath it, so it never sees half an
+update. There is one writer per segment: it holds an flock on
+$XDG_RUNTIME_DIR/overman/<segment>.lock for as long as it runs, and a
+second writer refuses to start.
+
+    python -m engine.livestats [--watch 1] [--json]
+"""
+
+import argparse
+import fcntl
+import json
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+SEGMENT = "overman-live"
+MAGIC = 0x4F564C53  # "OVLS"
+VERSION = 1
+
+# magic, version, seq | ts, focus, drift, remaining | penalty, violations, app_id, status | app
+_HEADER = struct.Struct("<IIQ")
+_BODY = struct.Struct("<ddddIIIB3x64s")
+SIZE = _HEADER.size + _BODY.size
+_SEQ = 8
+_STATUS = {None: 0, "Productive": 1, "Drifting": 2}
+_STATUS_NAMES = {v: k for k, v in _STATUS.items()}
+
+
+def app_id(name):
+    """Stable id for a window class: the same number in every process and run."""
+    return zlib.crc32(name.encode("utf-8")) if name else 0
+
+
+class LiveStats(namedtuple("LiveStats", "seq ts focus_seconds drift_seconds remaining "
+                                        "penalty_minutes violations app_id status app")):
+    """
+    One consistent read of the segment. `remaining` is None outside a timed
+    session; `status` is "Productive", "Drifting" or None.
+    """
+
+    __slots__ = ()
+
+    def at(self, now=None):
+        """
+        (focus, drift, remaining) extrapolated to `now`: the writer only
+        updates on its tick, the clock keeps running between them.
+        """
+        elapsed = max(0.0, (now or time.time()) - self.ts)
+        focus = self.focus_seconds + (elapsed if self.status == "Productive" else 0.0)
+        drift = self.drift_seconds + (elapsed if self.status == "Drifting" else 0.0)
+        remaining = None if self.remaining is None else max(0.0, self.remaining - elapsed)
+        return focus, drift, remaining
+
+
+_owned = set()  # segments a LiveStatsWriter of this process has open
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    # The resource tracker would unlink a segment it saw this process open;
+    # only the writer owns it. A writer in this same process registered it
+    # already, and unregistering here would make its unlink fail at exit.
+    if name not in _owned:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def lock_path(name=SEGMENT):
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/overman-{os.getuid()}"
+    return os.path.join(runtime, "overman", f"{name}.lock")
+
+
+class LiveStatsWriter:
+    """
+    Owns the segment. RuntimeError when another writer is still running;
+    one left behind by a writer that died (its lock released with it) is
+    reused. close() marks it dead for readers and unlinks it.
+    """
+
+    def __init__(self, name=SEGMENT):
+        self.name = name
+        self._lock = self._take_lock(name)
+        _owned.add(name)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=SIZE)
+        except FileExistsError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if self.shm.size < SIZE:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=SIZE)
+        self.buf = self.shm.buf
+        self.seq = 0
+        magic, version, seq = _HEADER.unpack_from(self.buf, 0)
+        if magic == MAGIC and version == VERSION:
+            self.seq = seq + (seq & 1)  # carry on from an even number
+        _HEADER.pack_into(self.buf, 0, MAGIC, VERSION, self.seq)
+        self._app = None
+        self._app_bytes = b""
+        self._closed = False
+
+    @staticmethod
+    def _take_lock(name):
+        path = lock_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            owner = os.read(fd, 32).decode(errors="replace").strip() or "?"
+            os.close(fd)
+            raise RuntimeError(f"{name}: already written by pid {owner}") from None
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        return fd
+
+    def write(self, ts, focus_seconds, drift_seconds, remaining=None, penalty_minutes=0,
+              violations=0, app=None, status=None):
+        if app != self._app:
+            self._app = app
+            self._app_bytes = (app or "").encode("utf-8")[:64]
+        struct.pack_into("<Q", self.buf, _SEQ, self.seq + 1)
+        _BODY.pack_into(self.buf, _HEADER.size, ts, focus_seconds, drift_seconds,
+                        math.nan if remaining is None else remaining,
+                        penalty_minutes, violations, app_id(app), _STATUS.get(status, 0),
+                        self._app_bytes)
+        self.seq += 2
+        struct.pack_into("<Q", self.buf, _SEQ, self.seq)
+
+    def close(self, unlink=True):
+        if self._closed:
+            return
+        self._closed = True
+        _HEADER.pack_into(self.buf, 0, 0, 0, self.seq + 1)
+        self.buf.release()
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+        _owned.discard(self.name)
+        os.close(self._lock)  # releases the flock
+
+
+class LiveStatsReader:
+    """
+    Maps an existing segment (FileNotFoundError when no writer is up).
+    read() is a few memory copies; call it as often as the display needs.
+    Once the writer has closed, read() returns None and `closed` is set;
+    open a new reader to follow a restarted daemon.
+    """
+
+    def __init__(self, name=SEGMENT):
+        self.shm = _attach(name)
+        self.buf = self.shm.buf
+        magic, version, _ = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{name}: not an overman live stats segment (v{VERSION})")
+        self._names = {0: None}
+        self.retries = 0
+        self.closed = False
+
+    @classmethod
+    def open(cls, name=SEGMENT):
+        """A reader, or None when the daemon is not running."""
+        try:
+            return cls(name)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def read(self, spins=1000):
+        """The latest LiveStats, or None if there is none (yet) or the writer never settled."""
+        for _ in range(spins):
+            magic, _, seq = _HEADER.unpack_from(self.buf, 0)
+            if magic != MAGIC:
+                self.closed = True
+                return None
+            if seq & 1:
+                self.retries += 1
+                continue
+            body = bytes(self.buf[_HEADER.size:SIZE])
+            if struct.unpack_from("<Q", self.buf, _SEQ)[0] != seq:
+                self.retries += 1
+                continue
+            if seq == 0:
+                return None  # created, nothing written yet
+            ts, focus, drift, remaining, penalty, violations, aid, status, raw = _BODY.unpack(body)
+            name = self._names.get(aid)
+            if name is None and aid:
+                name = self._names[aid] = raw.rstrip(b"\0").decode("utf-8", "replace")
+            return LiveStats(seq, ts, focus, drift, None if math.isnan(remaining) else remaining,
+                             penalty, violations, aid, _STATUS_NAMES.get(status), name)
+        return None
+
+    def close(self):
+        self.buf.release()
+        self.shm.close()
+
+
+def _mmss(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" if seconds >= 3600 \
+        else f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def format_line(stats, now=None):
+    """One-line summary for status bars."""
+    focus, drift, remaining = stats.at(now)
+    parts = [f"FOCUS {_mmss(focus)}", f"DRIFT {_mmss(drift)}"]
+    if remaining is not None:
+        parts.append(f"LEFT {_mmss(remaining)}")
+    if stats.penalty_minutes:
+        parts.append(f"+{stats.penalty_minutes}m")
+    if stats.app:
+        parts.append(stats.app)
+    return " | ".join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="livestats", description="Print overmand's live numbers.")
+    parser.add_argument("--name", default=SEGMENT)
+    parser.add_argument("--watch", type=float, default=None, help="repeat every N seconds")
+    parser.add_argument("--json", action="store_true", help="waybar-style JSON instead of text")
+    args = parser.parse_args(argv)
+
+    reader = LiveStatsReader.open(args.name)
+    if reader is None:
+        print("overmand not running", file=sys.stderr)
+        return 1
+    while True:
+        stats = reader.read()
+        if stats:
+            line = format_line(stats)
+            if args.json:
+                line = json.dumps({"text": line, "class": (stats.status or "idle").lower(),
+                                   "tooltip": f"{stats.violations} violations"})
+            print(line, flush=True)
+        if args.watch is None:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
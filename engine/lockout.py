@@ -0,0 +1,68 @@
+"""
+The lockout window ubermensch shows on a violation, importable on its own
+so the latency harness (benchmarks.latency) drives the shipped class.
+"""
+
+import time
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtWidgets import QLabel, QLineEdit, QMainWindow, QVBoxLayout, QWidget
+
+from engine.imageloader import ImageLoader
+
+
+class LockoutWindow(QMainWindow):
+    """The Punishment Cell. Built hidden once; present() re-arms it per violation."""
+    def __init__(self):
+        super().__init__()
+        self.setProperty("class", "truth-lockout")
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        self.shown_ms = [] # violation -> lockout painted
+        self._since = None
+        self.setStyleSheet("background: black; border: 4px solid red;")
+        
+        layout = QVBoxLayout()
+        w = QWidget(); w.setLayout(layout); self.setCentralWidget(w)
+
+        lbl = QLabel("YOU SURRENDERED TO IMPULSE")
+        lbl.setFont(QFont("Impact", 40)); lbl.setStyleSheet("color: red")
+        layout.addWidget(lbl, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        # Show the screenshot of what you were doing (decoded off the GUI thread)
+        self.evidence = QLabel(); self.evidence.setMinimumSize(800, 500)
+        self.evidence.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.evidence.setStyleSheet("color: #666; border: none;")
+        layout.addWidget(self.evidence, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.loader = ImageLoader(self)
+        self.loader.loaded.connect(self.show_evidence)
+
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("Type: 'I command myself' to release")
+        self.input.setStyleSheet("font-size: 20px; padding: 10px; color: white; background: #222; border: 1px solid red;")
+        self.input.setFixedWidth(500)
+        self.input.returnPressed.connect(self.check_mantra)
+        layout.addWidget(self.input, alignment=Qt.AlignmentFlag.AlignCenter)
+
+    def present(self, img_path, since=None):
+        self._since = since if since is not None else time.monotonic()
+        self.input.clear()
+        self.evidence.clear(); self.evidence.setText("LOADING EVIDENCE...")
+        self.loader.load(img_path, 800, 500)
+        self.showFullScreen(); self.raise_(); self.activateWindow()
+        self.input.setFocus()
+
+    def show_evidence(self, token, image):
+        if token != self.loader.latest: return
+        if image.isNull(): self.evidence.setText("")
+        else: self.evidence.setPixmap(QPixmap.fromImage(image))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._since is not None:
+            self.shown_ms.append((time.monotonic() - self._since) * 1000)
+            self._since = None
+
+    def check_mantra(self):
+        if self.input.text().lower() == "i command myself":
+            self.hide()
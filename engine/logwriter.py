@@ -0,0 +1,80 @@
+"""Background CSV writer so warden ticks never wait on disk I/O."""
+
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class LogWriter(threading.Thread):
+    """
+    Appends rows to `path` from a dedicated thread.
+
+    write() only enqueues; rows are flushed in batches once `batch_size`
+    rows are pending or `flush_interval` seconds have passed, and
+    everything left is flushed on close() (also registered with atexit).
+    The queue is bounded: when the disk falls behind by `maxsize` rows,
+    new rows are dropped and counted in `dropped` rather than blocking.
+    """
+
+    def __init__(self, path, header=None, batch_size=64, flush_interval=5.0, maxsize=4096):
+        super().__init__(name=f"logwriter:{os.path.basename(path)}", daemon=True)
+        self.path = path
+        self.header = header
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.written = 0
+        self._closed = False
+        atexit.register(self.close)
+        self.start()
+
+    def write(self, row):
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(_STOP)
+        self.join()
+
+    def run(self):
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                row = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                row = None
+            if row is _STOP:
+                self._flush(pending)
+                return
+            if row is not None:
+                pending.append(row)
+            if len(pending) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(pending)
+                pending = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, rows):
+        if not rows:
+            return
+        try:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="") as f:
+                out = csv.writer(f)
+                if new and self.header:
+                    out.writerow(self.header)
+                out.writerows(rows)
+            self.written += len(rows)
+        except OSError as e:
+            print(f"LogWriter error ({self.path}): {e}")
@@ -0,0 +1,579 @@
+"""
+overmand: the warden as one headless daemon (no Qt) that owns window
+tracking, classification, enforcement and storage, and serves any number
+of frontends over a Unix socket.
+
+Protocol: one JSON object per line in each direction.
+    {"cmd": "snapshot"}                          -> {"event": "snapshot", ...}
+    {"cmd": "subscribe"}                         -> a snapshot, then every event
+    {"cmd": "start", "goal": g, "duration": m}   -> {"event": "session", ...}
+    {"cmd": "end"}                               -> {"event": "session", ...}
+    {"cmd": "stats"}                             -> {"event": "stats", ...}
+Pushed events: tick (a snapshot every `tick` seconds), focus, span (time
+credited to an app/title), drift, violation, lockout (evidence path +
+monotonic detection time), session. Audits run only while a session is open.
+Each event is serialised once and the same bytes are queued for every
+subscriber, so extra clients cost a send() each. The handful of numbers a
+progress bar needs are also kept in shared memory (engine.livestats).
+
+    python -m engine.overmand [--tick 1] [--audit-every 600 (0: off)] ...
+    python -m engine.overmand snapshot | watch
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import selectors
+import signal
+import socket
+import sys
+import threading
+
+from engine.actuators import Actuators
+from engine.aggregates import RunningStats
+from engine.clock import SYSTEM, Every, wall
+from engine.evidence import EvidenceStore
+from engine.hypr import EventStream, FocusTracker, HyprlandClient, active_window
+from engine.intervals import IntervalLog
+from engine.keywords import KeywordMatcher
+from engine.livestats import SEGMENT, LiveStatsWriter
+from engine.speech import URGENT, Speaker
+from engine.store import DB_PATH, Store
+
+ALLOWED_APPS = ["mpv", "kitty", "obsidian", "anki", "libreoffice", "zathura"]
+DRIFT_APPS = ["firefox", "brave", "chrome", "chromium", "discord", "thorium"]
+FORBIDDEN = ["porn", "xxx", "sex", "pornhub", "xvideos", "facebook",
+             "twitter", "instagram", "tiktok", "reddit", "9gag"]
+PENALTY_MINUTES = 10  # added to the session per violation
+
+
+def socket_path():
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/overman-{os.getuid()}"
+    return os.path.join(runtime, "overman", "overmand.sock")
+
+
+def _line(obj):
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# ==========================================
+# WARDEN (tracking, classification, enforcement)
+# ==========================================
+class Warden:
+    """
+    The Qt-free warden loop. Everything a frontend used to compute for
+    itself ends up in snapshot(); changes are announced through
+    `publish(event, payload)`. With a `live` LiveStatsWriter, the session
+    counters are also written to shared memory whenever they change. All
+    timing goes through `clock`; a VirtualClock runs it in simulated time.
+    """
+
+    def __init__(self, store, publish, allowed=ALLOWED_APPS, drift_apps=DRIFT_APPS,
+                 forbidden=FORBIDDEN, tick=2.0, audit_every=None,
+                 actuators=None, evidence=None, speaker=None, live=None, clock=SYSTEM):
+        self.store = store
+        self.publish = publish
+        self.allowed = list(allowed)
+        self.drift_apps = list(drift_apps)
+        self.forbidden = KeywordMatcher(forbidden)
+        self.tick = tick
+        self.audit_every = audit_every
+        self.actuators = actuators or Actuators()
+        self.evidence = evidence or EvidenceStore()
+        self.speaker = speaker or Speaker()
+        self.live = live
+        self.clock = clock
+        self.intervals = IntervalLog(on_close=store.add_interval)
+        self.stats = RunningStats()
+        self.stats.seed(store.status_totals(), store.app_totals())
+        self._lock = threading.Lock()
+        self.accounted = clock.monotonic()  # end of the last recorded span
+        self.focused = None
+        self.status = None
+        self.session = None
+        self._started = None  # monotonic start of the session
+        self._audit_due = None  # Every(audit_every) while a session is open
+        self._reset_session_counters()
+
+    def _reset_session_counters(self):
+        self.focus_seconds = 0.0
+        self.drift_seconds = 0.0
+        self.violations = 0
+        self.audits = 0
+
+    # --- SESSION ---
+    def start_session(self, goal, duration=None, allowed=None):
+        with self._lock:
+            started = self.clock.time()
+            self.store.start_session(goal, duration, started)
+            self.session = {"id": int(started * 1000), "goal": goal, "started": started,
+                            "duration": duration}
+            self._started = self.clock.monotonic()
+            self._audit_due = Every(self.audit_every, self.clock) if self.audit_every else None
+            if allowed:
+                self.allowed = [a.strip().lower() for a in allowed if a.strip()]
+            self._reset_session_counters()
+        self._write_live(self._started)
+        self.publish("session", self.snapshot())
+        return self.session
+
+    def end_session(self):
+        with self._lock:
+            if self.session is None:
+                return None
+            total = self.focus_seconds + self.drift_seconds
+            ratio = 100 * self.focus_seconds / total if total else 0.0
+            self.store.end_session(ratio, self.clock.time())
+            self.session["ratio"] = ratio
+            ended, self.session = self.session, None
+            self._audit_due = None
+        self._write_live()
+        self.publish("session", {"ended": ended})
+        return ended
+
+    # --- SNAPSHOT ---
+    def snapshot(self, now=None):
+        """State at monotonic time `now` (default: the current instant)."""
+        now = self.clock.monotonic() if now is None else now
+        with self._lock:
+            session = dict(self.session) if self.session else None
+            penalty = self.violations * PENALTY_MINUTES
+            if session:
+                session["remaining"] = self._remaining(now)
+            win = self.focused
+            return {
+                "ts": wall(now, self.clock),
+                "app": win.cls if win else None,
+                "title": win.title if win else None,
+                "status": self.status,
+                "focus_seconds": self.focus_seconds,
+                "drift_seconds": self.drift_seconds,
+                "violations": self.violations,
+                "audits": self.audits,
+                "penalty_minutes": penalty,
+                "session": session,
+                "totals": dict(self.stats.status),
+                "top": self.stats.top(),
+            }
+
+    def _remaining(self, now):
+        """Seconds left at monotonic `now` in a timed session, penalties included; None otherwise."""
+        session = self.session
+        planned = ((session["duration"] or 0) + self.violations * PENALTY_MINUTES) * 60 if session else 0
+        return max(0.0, planned - (now - self._started)) if planned else None
+
+    def _write_live(self, now=None):
+        if self.live is None:
+            return
+        with self._lock:
+            now = self.accounted if now is None else now
+            win = self.focused
+            self.live.write(wall(now, self.clock), self.focus_seconds, self.drift_seconds, self._remaining(now),
+                            self.violations * PENALTY_MINUTES, self.violations,
+                            win.cls if win else None, self.status)
+
+    # --- LOOP ---
+    def run(self):
+        while True:
+            try:
+                self.watch(EventStream(timeout=self.tick, clock=self.clock.monotonic))
+            except OSError:
+                self.clock.sleep(2)  # Hyprland socket not up yet
+
+    def watch(self, stream, seed=True):
+        """
+        Run over `stream`, whose events carry monotonic timestamps; seed=False
+        skips asking Hyprland what has focus (replays). Spans, drift and ticks
+        are measured on clock.monotonic(); only stored rows get time() stamps.
+        """
+        tracker = FocusTracker()
+        mark = last_tick = self.accounted = self.clock.monotonic()
+        tracker.start(mark, active_window(HyprlandClient()) if seed else None)
+        self._set_focus(tracker.focused)
+        drift_start, warned, last_nag, killed = None, False, 0, None
+
+        for event in stream:
+            now = self.clock.monotonic()
+            if event:
+                span = tracker.feed(*event)
+                if span:
+                    if span[0] and span[2] > mark:
+                        self.record(span[0], mark, span[2])
+                    mark = max(mark, span[2])
+                    self._set_focus(tracker.focused)
+            win = tracker.focused
+
+            if win is not None:
+                # Kill protocol, as soon as the window has focus
+                keyword = self.forbidden.search(win.title, win.cls)
+                if keyword and win.address and win.address != killed:
+                    killed = win.address
+                    self.violation(win, keyword)
+                    continue
+
+                # Drift protocol, measured from the focus event
+                if any(d in win.cls for d in self.drift_apps) and not self.is_allowed(win.cls):
+                    if drift_start is None:
+                        drift_start, warned = tracker.since, False
+                    drift = now - drift_start
+                    if drift >= 60 and not warned:
+                        warned = True
+                        self.speaker.say(f"Focus check. You are in {win.cls}.")
+                        self.publish("drift", {"app": win.cls, "seconds": drift})
+                    elif drift > 120 and now - last_nag >= 2:
+                        last_nag = now
+                        self.speaker.say("Close the browser. Return to the goal.")
+                else:
+                    drift_start = None
+            else:
+                drift_start = None
+
+            audit_due = self._audit_due
+            if audit_due and audit_due():
+                self.audit("10 MINUTE CHECK")
+
+            if now - mark >= self.tick:
+                if win:
+                    self.record(win, mark, now)
+                mark = now
+            if now - last_tick >= self.tick:
+                last_tick = now
+                self.publish("tick", self.snapshot(now))
+
+    def is_allowed(self, app):
+        return any(a in app for a in self.allowed)
+
+    def record(self, win, start, end):
+        """Account the monotonic span start..end; the interval row is stored in time() terms."""
+        status = "Productive" if self.is_allowed(win.cls) else "Drifting"
+        seconds = end - start
+        offset = wall(0.0, self.clock)
+        self.intervals.add(round(offset + start, 3), round(offset + end, 3), win.cls, win.title, status)
+        self.stats.add(win.cls, status, seconds)
+        self.publish("span", {"app": win.cls, "title": win.title, "status": status, "seconds": seconds})
+        with self._lock:
+            self.status = status
+            self.accounted = end
+            if status == "Productive":
+                self.focus_seconds += seconds
+            else:
+                self.drift_seconds += seconds
+        self._write_live(end)
+        return status
+
+    def _set_focus(self, win):
+        with self._lock:
+            self.focused = win
+            self.status = None if win is None else (
+                "Productive" if self.is_allowed(win.cls) else "Drifting")
+        self._write_live()
+        self.publish("focus", {"app": win.cls if win else None,
+                               "title": win.title if win else None, "status": self.status})
+
+    # --- ENFORCEMENT ---
+    def violation(self, win, keyword):
+        detected = self.clock.monotonic()
+        self.actuators.close_window(f"address:{win.address}")
+        self.store.add_violation(win.cls, win.title, keyword, "closewindow", self.clock.time())
+        with self._lock:
+            self.violations += 1
+        self._write_live()
+        self.speaker.say("Protocol violation. The animal has taken over.", URGENT)
+        self.publish("violation", {"app": win.cls, "title": win.title, "keyword": keyword,
+                                   "penalty_minutes": self.violations * PENALTY_MINUTES})
+        self._lockout("VIOLATION DETECTED", detected)
+
+    def audit(self, reason):
+        with self._lock:
+            self.audits += 1
+        self.speaker.say(f"{reason}. Audit initiated.")
+        self._lockout(reason, self.clock.monotonic())
+
+    def _lockout(self, reason, detected):
+        ts = self.clock.time()
+
+        def captured(ev):
+            path = ev["path"] if ev else ""
+            self.store.add_audit(reason, path or None, ts)
+            self.publish("lockout", {"reason": reason, "path": path, "detected": detected})
+
+        self.evidence.capture(then=captured)
+
+
+# ==========================================
+# SOCKET SERVER
+# ==========================================
+class _Conn:
+    __slots__ = ("sock", "inbuf", "out", "subscribed")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.inbuf = b""
+        self.out = bytearray()
+        self.subscribed = False
+
+
+class Server(threading.Thread):
+    """
+    Single-threaded selector loop over the listening socket and every client.
+    publish() may be called from any thread; the line is handed over through
+    a queue and a wake-up socketpair. Subscribers that fall more than
+    `max_backlog` bytes behind are disconnected instead of buffering forever.
+    """
+
+    def __init__(self, path, handler, max_backlog=1 << 20):
+        super().__init__(name="overmand-server", daemon=True)
+        self.path = path
+        self.handler = handler
+        self.max_backlog = max_backlog
+        self.sel = selectors.DefaultSelector()
+        self.conns = {}
+        self._outbox = queue.SimpleQueue()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.published = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.unlink(path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(path)
+        os.chmod(path, 0o600)
+        self.listener.listen(16)
+        self.listener.setblocking(False)
+        self.sel.register(self.listener, selectors.EVENT_READ, "accept")
+        self.sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        atexit.register(self.close)
+
+    def publish(self, event, payload):
+        self._outbox.put(_line({"event": event, **payload}))
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # a wake-up is already pending
+
+    def close(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def run(self):
+        while True:
+            for key, mask in self.sel.select():
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    self._drain()
+                else:
+                    if mask & selectors.EVENT_READ:
+                        self._read(key.data)
+                    if mask & selectors.EVENT_WRITE and key.data.sock in self.conns:
+                        self._flush(key.data)
+
+    def _accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        conn = _Conn(sock)
+        self.conns[sock] = conn
+        self.sel.register(sock, selectors.EVENT_READ, conn)
+
+    def _drain(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                line = self._outbox.get_nowait()
+            except queue.Empty:
+                return
+            self.published += 1
+            for conn in list(self.conns.values()):
+                if conn.subscribed:
+                    self._send(conn, line)
+
+    def _read(self, conn):
+        try:
+            chunk = conn.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._drop(conn)
+            return
+        conn.inbuf += chunk
+        *lines, conn.inbuf = conn.inbuf.split(b"\n")
+        for raw in lines:
+            if not raw.strip():
+                continue
+            try:
+                request = json.loads(raw)
+                reply = self.handler(request, conn)
+            except Exception as e:
+                reply = {"event": "error", "error": str(e)}
+            if reply is not None:
+                self._send(conn, _line(reply))
+
+    def _send(self, conn, data):
+        conn.out += data
+        if len(conn.out) > self.max_backlog:
+            self._drop(conn)
+            return
+        self._flush(conn)
+
+    def _flush(self, conn):
+        try:
+            sent = conn.sock.send(conn.out)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(conn)
+            return
+        del conn.out[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.out else 0)
+        self.sel.modify(conn.sock, events, conn)
+
+    def _drop(self, conn):
+        if self.conns.pop(conn.sock, None) is None:
+            return
+        self.sel.unregister(conn.sock)
+        conn.sock.close()
+
+
+class Daemon:
+    """Wires a Warden to a Server and answers the protocol commands."""
+
+    def __init__(self, path=None, db=DB_PATH, live=None, **warden_options):
+        self.store = Store(db)
+        self.server = Server(path or socket_path(), self.handle)
+        self.live = live
+        self.warden = Warden(self.store, self.server.publish, live=live, **warden_options)
+
+    def handle(self, request, conn):
+        cmd = request.get("cmd")
+        if cmd == "snapshot":
+            return {"event": "snapshot", **self.warden.snapshot()}
+        if cmd == "subscribe":
+            conn.subscribed = True
+            return {"event": "snapshot", **self.warden.snapshot()}
+        if cmd == "start":
+            session = self.warden.start_session(request.get("goal", ""), request.get("duration"),
+                                                request.get("allowed"))
+            return {"event": "session", "session": session}
+        if cmd == "end":
+            return {"event": "session", "ended": self.warden.end_session()}
+        if cmd == "stats":
+            return {"event": "stats", "clients": len(self.server.conns),
+                    "published": self.server.published,
+                    "actuators": self.warden.actuators.stats(),
+                    "evidence": self.warden.evidence.stats()}
+        return {"event": "error", "error": f"unknown command: {cmd}"}
+
+    def run(self):
+        self.server.start()
+        self.warden.run()
+
+
+# ==========================================
+# CLIENT
+# ==========================================
+class OvermandClient:
+    """Frontend side of the protocol; one connection per request, like hyprctl."""
+
+    def __init__(self, path=None, timeout=2.0):
+        self.path = path or socket_path()
+        self.timeout = timeout
+
+    def available(self):
+        try:
+            self.request("snapshot")
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def request(self, cmd, **args):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(_line({"cmd": cmd, **args}))
+            reader = sock.makefile("rb")
+            return json.loads(reader.readline())
+
+    def snapshot(self):
+        return self.request("snapshot")
+
+    def subscribe(self):
+        """Yield the initial snapshot and then every pushed event; None on timeout."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(_line({"cmd": "subscribe"}))
+            sock.settimeout(self.timeout)
+            buf = b""
+            while True:
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    yield None
+                    continue
+                if not chunk:
+                    return
+                buf += chunk
+                *lines, buf = buf.split(b"\n")
+                for raw in lines:
+                    if raw:
+                        yield json.loads(raw)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="overmand", description=__doc__.split("\n\n")[0])
+    parser.add_argument("client", nargs="?", choices=["snapshot", "watch", "stats"],
+                        help="talk to a running daemon instead of starting one")
+    parser.add_argument("--socket", default=None)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--tick", type=float, default=2.0, help="seconds between samples/ticks")
+    parser.add_argument("--audit-every", type=float, default=600.0,
+                        help="seconds between audits during a session (0 disables them)")
+    parser.add_argument("--allow", nargs="*", default=ALLOWED_APPS)
+    parser.add_argument("--drift", nargs="*", default=DRIFT_APPS)
+    parser.add_argument("--forbid", nargs="*", default=FORBIDDEN)
+    parser.add_argument("--live", default=SEGMENT, help="shared-memory segment name ('' disables it)")
+    args = parser.parse_args(argv)
+
+    if args.client:
+        client = OvermandClient(args.socket)
+        if args.client == "watch":
+            for event in client.subscribe():
+                if event:
+                    print(json.dumps(event), flush=True)
+        else:
+            print(json.dumps(client.request(args.client), indent=2))
+        return
+
+    try:
+        live = LiveStatsWriter(args.live) if args.live else None
+    except RuntimeError as e:
+        sys.exit(f"overmand: {e}")  # another overmand is running
+    daemon = Daemon(args.socket, args.db, live=live, allowed=args.allow, drift_apps=args.drift,
+                    forbidden=args.forbid, tick=args.tick, audit_every=args.audit_every)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    atexit.register(daemon.store.close)  # atexit runs in reverse: intervals flush first
+    atexit.register(daemon.warden.intervals.close)
+    if live:
+        atexit.register(live.close)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+ovtop: curses version of omarchy-tui/ovtopv2.sh.
+
+Same sections (state, behavioral spectrum with the decay graph, cognitive
+hierarchy, alerts, daily summary), without a fork per frame:
+  - state and session numbers come from overmand's shared-memory segment
+    (engine.livestats) on every frame, or from the store's last interval
+    when no daemon runs;
+  - the archive (month totals, top apps and windows, streak, violations)
+    is queried from the store every `--slow` seconds;
+  - each frame is a list of rows of (text, attr) runs, and only rows that
+    differ from the previous frame are rewritten, so curses sends just the
+    changed cells to the terminal.
+
+    python -m engine.ovtop [--refresh 0.1] [--db ...] [--whitelist 'kitty|code']
+"""
+
+import argparse
+import curses
+import re
+import sqlite3
+import sys
+import time
+from collections import deque
+from datetime import date, datetime, timedelta
+
+from engine.livestats import LiveStatsReader
+from engine.overmand import OvermandClient
+from engine.store import DB_PATH, Store
+
+WHITELIST = "anki|sublime_text|code|obsidian|kitty|alacritty|zathura"
+GOAL_TARGET_SEC = 108000  # 30 hours a month
+RULE = "━" * 62
+THIN = "─" * 62
+QUOTE = "Man is something to be overcome."
+IDLE_AFTER = 300  # seconds without a recorded interval before the store fallback shows Idle
+
+
+def fmt_time(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+def month_start(now=None):
+    today = datetime.fromtimestamp(now or time.time())
+    return datetime(today.year, today.month, 1).timestamp()
+
+
+def streak(days, today=None):
+    """Consecutive days, up to today, with more focus than drift (today may still be open)."""
+    good = {day for day, focus, waste in days if focus > waste}
+    day = today or date.today()
+    if day.isoformat() not in good:
+        day -= timedelta(days=1)
+    count = 0
+    while day.isoformat() in good:
+        count += 1
+        day -= timedelta(days=1)
+    return count
+
+
+# ==========================================
+# DATA
+# ==========================================
+class Feed:
+    """
+    Everything a frame shows. poll() is called every frame: the current
+    state is a shared-memory read, the store and the daemon's window title
+    are refreshed only every `slow` seconds.
+    """
+
+    def __init__(self, store, whitelist=WHITELIST, slow=5.0, client=None):
+        self.store = store
+        self.whitelist = re.compile(whitelist)
+        self.slow = slow
+        self.client = client or OvermandClient(timeout=0.2)
+        self.live = LiveStatsReader.open()
+        self.cls, self.title, self.is_focus = "Idle", "Empty", False
+        self.session = None  # (focus, drift, remaining, penalty) from the daemon
+        self.goal_sec = self.waste_sec = 0
+        self.top = []         # [(app, seconds, [(title, seconds)])]
+        self.streak = 0
+        self.violations = []  # today's, oldest first
+        self.queries = 0
+        self._next_slow = 0.0
+
+    def poll(self, now):
+        stats = self.live.read() if self.live else None
+        if stats is None and (self.live is None or self.live.closed) and now >= self._next_slow:
+            self.live = LiveStatsReader.open()  # daemon (re)started?
+            stats = self.live.read() if self.live else None
+        if now >= self._next_slow:
+            self._next_slow = now + self.slow
+            self._refresh(now, stats)
+        if stats:
+            focus, drift, remaining = stats.at(now)
+            self.session = (focus, drift, remaining, stats.penalty_minutes)
+            if stats.app:
+                if stats.app != self.cls:
+                    self.title = self._daemon_title()
+                self.cls, self.is_focus = stats.app, stats.status == "Productive"
+            else:
+                self.cls, self.title, self.is_focus = "Idle", "Empty", False
+        else:
+            self.session = None
+
+    def _daemon_title(self):
+        """The title is not in the shared segment; ask on focus changes and slow ticks."""
+        try:
+            return self.client.snapshot().get("title") or ""
+        except (OSError, ValueError):
+            return self.title
+
+    def _refresh(self, now, stats):
+        try:
+            self._query(now, stats)
+        except sqlite3.Error:
+            pass  # no database yet
+
+    def _query(self, now, stats):
+        self.queries += 1
+        since = month_start(now)
+        totals = self.store.status_totals(since)
+        self.goal_sec = totals.get("Productive", 0) or 0
+        self.waste_sec = sum(v or 0 for k, v in totals.items() if k != "Productive")
+        self.top = [(app, sec, self.store.title_totals(app, since, limit=2))
+                    for app, sec in self.store.app_totals(since, limit=3)]
+        self.streak = streak(self.store.daily_totals(now - 366 * 86400))
+        day = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.violations = self.store.violations(day.timestamp())
+        if stats:
+            self.title = self._daemon_title()
+            return
+        last = self.store.last_interval()
+        if last and now - last[3] < IDLE_AFTER:
+            self.cls, self.title, self.is_focus = last[0], last[1], last[2] == "Productive"
+        else:
+            self.cls, self.title, self.is_focus = "Idle", "Empty", False
+
+
+# ==========================================
+# RENDERING
+# ==========================================
+class Screen:
+    """
+    Diff-based redraw: a frame is a list of rows, each a tuple of (text, attr)
+    runs. Rows equal to what is already on screen are skipped.
+    """
+
+    def __init__(self, win):
+        self.win = win
+        self.rows = []
+        self.rewritten = 0
+
+    def invalidate(self):
+        self.rows = []
+        self.win.erase()
+
+    def draw(self, rows):
+        height, width = self.win.getmaxyx()
+        rows = rows[:height]
+        for y, row in enumerate(rows):
+            if y < len(self.rows) and self.rows[y] == row:
+                continue
+            self.rewritten += 1
+            self.win.move(y, 0)
+            self.win.clrtoeol()
+            x = 0
+            for text, attr in row:
+                if x >= width - 1:
+                    break
+                text = text[:width - 1 - x]
+                try:
+                    self.win.addstr(text, attr)
+                except curses.error:
+                    break
+                x += len(text)
+        for y in range(len(rows), min(len(self.rows), height)):
+            self.win.move(y, 0)
+            self.win.clrtoeol()
+        self.rows = rows
+        self.win.noutrefresh()
+        curses.doupdate()
+
+
+class Palette:
+    def __init__(self, color=True):
+        self.G = self.R = self.B = self.Y = self.C = curses.A_NORMAL
+        if color and curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            for i, c in enumerate((curses.COLOR_GREEN, curses.COLOR_RED, curses.COLOR_BLUE,
+                                   curses.COLOR_YELLOW, curses.COLOR_CYAN), 1):
+                curses.init_pair(i, c, -1)
+            self.G, self.R, self.B = curses.color_pair(1), curses.color_pair(2), curses.color_pair(3)
+            self.Y = curses.color_pair(4) | curses.A_BOLD
+            self.C = curses.color_pair(5)
+        self.N = curses.A_NORMAL
+
+
+def bar(val, maximum, attr, p, width=35):
+    perc = int(val * 100 / (maximum if maximum > 0 else 1))
+    fill = min(perc * width // 100, width)
+    return (("█" * fill, attr), ("░" * (width - fill), p.N), (f" {perc}%", p.N))
+
+
+def graph(history, p):
+    """Decay graph runs: one addstr per run of equal samples, not per sample."""
+    runs, prev, count = [("  ", p.N)], None, 0
+    for focus in history:
+        if focus != prev and count:
+            runs.append(("▴" * count if prev else "▾" * count, p.G if prev else p.R))
+            count = 0
+        prev = focus
+        count += 1
+    if count:
+        runs.append(("▴" * count if prev else "▾" * count, p.G if prev else p.R))
+    return tuple(runs)
+
+
+def frame(feed, history, p):
+    rows = []
+
+    def row(*runs):
+        rows.append(tuple((t, a) for t, a in runs))
+
+    def header(title):
+        row()
+        row((RULE, p.B))
+        row((f"  {title}", p.N))
+        row((THIN, p.B))
+
+    row((RULE, p.B))
+    row(("  ÜBERMENSCH // SELF-OVERCOMING TRACKER", p.Y))
+    row((RULE, p.B))
+    row()
+    state = ("OVERMAN (ASCENDING)", p.G) if feed.is_focus else ("ANIMAL (DECAYING)", p.R)
+    row(("  STATE        : ", p.N), state)
+    row(("  ACTIVE       : ", p.N), (feed.cls, p.C))
+    row(("  WINDOW       : ", p.N), (feed.title, p.N))
+    if feed.session:
+        focus, drift, remaining, penalty = feed.session
+        left = f" | LEFT {fmt_time(remaining)}" if remaining is not None else ""
+        extra = (f" (+{penalty}m)", p.R) if penalty else ("", p.N)
+        row(("  SESSION      : ", p.N), (f"focus {fmt_time(focus)}", p.G),
+            (f" | drift {fmt_time(drift)}", p.R), (left, p.N), extra)
+
+    header("⏱ BEHAVIORAL SPECTRUM")
+    row(("  GOAL EXECUTION   ", p.N), *bar(feed.goal_sec, GOAL_TARGET_SEC, p.G, p),
+        (f" ({fmt_time(feed.goal_sec)} / 30h)", p.N))
+    row(("  DECADENCE INDEX  ", p.N), *bar(feed.waste_sec, feed.goal_sec + feed.waste_sec, p.R, p),
+        (f" ({fmt_time(feed.waste_sec)} wasted)", p.N))
+    row()
+    rows.append(graph(history, p))
+    row(("  ANIMAL <───────────────────────────> OVERMAN", p.R))
+
+    header("📂 COGNITIVE HIERARCHY")
+    for app, sec, windows in feed.top:
+        ok = bool(feed.whitelist.search(app))
+        row((f"  {'✓' if ok else '✗'} {app}", p.G if ok else p.R), (f" ({fmt_time(sec)})", p.N))
+        for title, wsec in windows:
+            row(("  │   └── ", p.B), (f"{title[:40]}...", p.C), (f" ({fmt_time(wsec)})", p.N))
+
+    header("⚡ ALERTS & ENFORCEMENT")
+    if not feed.is_focus:
+        row(("  [!] ", p.N), (f"Recommended: CLOSE {feed.cls} NOW", p.R))
+    if feed.violations:
+        ts, app, _, keyword, _ = feed.violations[-1]
+        row(("  [!] ", p.N), (f"{len(feed.violations)} violations today, last {app} "
+                              f"({keyword}) at {datetime.fromtimestamp(ts):%H:%M}", p.R))
+    row(("  [!] ", p.N), (f'"{QUOTE}"', p.Y))
+
+    header("📊 DAILY SUMMARY")
+    row(("  FOCUS TIME    : ", p.N), (fmt_time(feed.goal_sec), p.N))
+    row(("  DISTRACTIONS  : ", p.N), (fmt_time(feed.waste_sec), p.N))
+    row(("  STREAK        : ", p.N), (f"{feed.streak} days", p.N))
+    verdict = ("Rising.", p.G) if feed.goal_sec > feed.waste_sec else \
+        ("You obey impulse. Reclaim control now.", p.R)
+    row(("  VERDICT       : ", p.N), verdict)
+    row((RULE, p.B))
+    return rows
+
+
+# ==========================================
+# MAIN LOOP
+# ==========================================
+def run(stdscr, args):
+    curses.curs_set(0)
+    stdscr.timeout(int(args.refresh * 1000))  # getch() doubles as the frame sleep
+    palette = Palette(not args.no_color)
+    screen = Screen(stdscr)
+    feed = Feed(Store(args.db, readonly=True), args.whitelist, args.slow)
+    history = deque(maxlen=args.history)  # decay graph ring buffer
+    next_sample = 0.0
+    frames = 0
+    started = time.process_time(), time.monotonic()
+    while True:
+        now = time.time()
+        feed.poll(now)
+        if now >= next_sample:
+            next_sample = now + args.sample
+            history.append(feed.is_focus)
+        screen.draw(frame(feed, history, palette))
+        frames += 1
+        if args.frames and frames >= args.frames:
+            break
+        key = stdscr.getch()
+        if key in (ord("q"), 27):
+            break
+        if key == curses.KEY_RESIZE:
+            screen.invalidate()
+    cpu, wall = time.process_time() - started[0], time.monotonic() - started[1]
+    return {"frames": frames, "rows_rewritten": screen.rewritten, "queries": feed.queries,
+            "cpu_percent": 100 * cpu / wall if wall else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="ovtop", description="Übermensch tracker TUI.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--refresh", type=float, default=1.0, help="seconds per frame (>= 0.1)")
+    parser.add_argument("--slow", type=float, default=5.0, help="seconds between store queries")
+    parser.add_argument("--sample", type=float, default=2.0, help="seconds per decay graph sample")
+    parser.add_argument("--history", type=int, default=40, help="decay graph samples kept")
+    parser.add_argument("--whitelist", default=WHITELIST)
+    parser.add_argument("--no-color", action="store_true")
+    parser.add_argument("--frames", type=int, default=0, help="exit after N frames and print usage")
+    args = parser.parse_args(argv)
+    args.refresh = max(args.refresh, 0.1)
+    try:
+        usage = curses.wrapper(run, args)
+    except KeyboardInterrupt:
+        return 0
+    if args.frames:
+        print(usage)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+Offline replay of recorded Hyprland traces through the overmand warden.
+
+A trace (one `<offset>\t<event>>data` line per event, optionally .gz) is fed to Warden.watch()
+on a VirtualClock, with poll ticks filled in between events the way
+EventStream times out, so a recorded day replays in seconds. Side effects
+are recorded instead of performed. The report has the accounting totals,
+every violation, audit and spoken warning (at trace offsets), and
+per-stage timings; reports from two engine versions can be diffed.
+
+    python -m engine.replay record day.trace.gz [--duration 86400]
+    python -m engine.replay run day.trace.gz [--loops 10] [--out report.json]
+    python -m engine.replay diff before.json after.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from engine import overmand
+from engine.clock import VirtualClock
+from engine.hypr import FocusTracker, event_socket_path
+from engine.store import Store
+
+EPOCH = 1_700_000_000.0  # replays start at a fixed wall time so reports compare
+ADDRESS_EVENTS = ("openwindow", "closewindow", "activewindowv2", "windowtitle",
+                  "windowtitlev2", "movewindow", "movewindowv2")
+
+
+# ==========================================
+# TRACE FILES
+# ==========================================
+def open_trace(path, mode="r"):
+    """Trace files ending in .gz are gzip-compressed."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_trace(path):
+    """Trace file: one `<seconds offset>\\t<event>>data` line per event."""
+    events = []
+    with open_trace(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            offset, _, payload = line.partition("\t")
+            events.append((float(offset), payload))
+    return events
+
+
+def record_trace(path, duration=None):
+    """Capture the live socket2 stream into a trace file."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(event_socket_path())
+    start = time.monotonic()
+    buf = b""
+    with open_trace(path, "w") as out:
+        while True:
+            if duration is not None:
+                left = duration - (time.monotonic() - start)
+                if left <= 0:
+                    break
+                sock.settimeout(left)  # a quiet session still ends on time
+            try:
+                chunk = sock.recv(4096)
+            except socket.timeout:
+                break
+            if not chunk:
+                break
+            offset = time.monotonic() - start
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                out.write(f"{offset:.3f}\t{line.decode('utf-8', 'replace')}\n")
+            out.flush()
+    sock.close()
+
+# ==========================================
+# INSTRUMENTATION
+# ==========================================
+class Timings:
+    """Inclusive wall time per stage; a stage that calls another counts both."""
+
+    def __init__(self):
+        self.stages = {}  # stage -> [calls, total_s, max_s]
+
+    def add(self, stage, seconds):
+        entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def wrap(self, fn, stage):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return timed
+
+    def report(self):
+        return {stage: {"calls": n, "total_ms": total * 1000,
+                        "mean_us": total * 1e6 / n if n else 0.0, "max_us": peak * 1e6}
+                for stage, (n, total, peak) in sorted(self.stages.items())}
+
+
+class _Recorder:
+    """Stands in for Actuators / EvidenceStore / Speaker and logs what was asked."""
+
+    def __init__(self, clock, log):
+        self.clock = clock
+        self.log = log
+
+    def close_window(self, selector, then=None):
+        self.log.append({"t": self.clock.monotonic(), "action": "closewindow", "target": selector})
+
+    def brightness(self, percent):
+        self.log.append({"t": self.clock.monotonic(), "action": "brightness", "target": percent})
+
+    def say(self, text, priority=None):
+        self.log.append({"t": self.clock.monotonic(), "action": "say", "target": text})
+        return True
+
+    def capture(self, then=None):
+        if then:
+            then({"path": ""})
+
+    def stats(self):
+        return {}
+
+
+@contextmanager
+def _timed_tracker(timings):
+    """Time FocusTracker.feed for the Warden built inside the block."""
+    class TimedTracker(FocusTracker):
+        def feed(self, ts, name, data):
+            start = time.perf_counter()
+            try:
+                return super().feed(ts, name, data)
+            finally:
+                timings.add("track", time.perf_counter() - start)
+
+    original = overmand.FocusTracker
+    overmand.FocusTracker = TimedTracker
+    try:
+        yield
+    finally:
+        overmand.FocusTracker = original
+
+
+# ==========================================
+# REPLAY
+# ==========================================
+def _readdress(name, data, loop):
+    """Give each loop its own window addresses, as a real compositor would."""
+    if not loop or name not in ADDRESS_EVENTS:
+        return data
+    address, sep, rest = data.partition(",")
+    return f"{address}{loop:04x}{sep}{rest}"
+
+
+def stream(events, clock, tick=2.0, loops=1, gap=5.0, timings=None):
+    """
+    Yield (ts, name, data) for each trace line, advancing `clock` to its
+    offset, and None every `tick` seconds of silence in between. The time the
+    consumer spends on each item is added to timings as "engine".
+    """
+    length = (events[-1][0] if events else 0.0) + gap
+    t = 0.0
+    for loop in range(loops):
+        for offset, payload in events:
+            at = loop * length + offset
+            while at - t > tick:
+                t += tick
+                clock.advance(t - clock.monotonic())
+                yield from _timed(None, timings)
+            t = max(t, at)
+            clock.advance(t - clock.monotonic())
+            name, _, data = payload.partition(">>")
+            yield from _timed((clock.monotonic(), name, _readdress(name, data, loop)), timings)
+    clock.advance(tick)
+    yield from _timed(None, timings)
+
+
+def _timed(item, timings):
+    start = time.perf_counter()
+    yield item
+    if timings is not None:
+        timings.add("engine", time.perf_counter() - start)
+
+
+def replay(events, tick=2.0, audit_every=600.0, loops=1, session_minutes=None, **warden_options):
+    """Run `events` through a fresh Warden and return the report dict."""
+    clock = VirtualClock(start=EPOCH)
+    timings = Timings()
+    actions, published = [], []
+
+    def publish(event, payload):
+        if event not in ("tick", "focus", "span"):
+            published.append({"t": clock.monotonic(), "event": event,
+                              **{k: v for k, v in payload.items() if k != "detected"}})
+
+    with tempfile.TemporaryDirectory(prefix="overman-replay-") as tmp:
+        store = Store(os.path.join(tmp, "replay.db"))
+        recorder = _Recorder(clock, actions)
+        with _timed_tracker(timings):
+            warden = overmand.Warden(store, timings.wrap(publish, "publish"), tick=tick,
+                                     audit_every=audit_every, actuators=recorder,
+                                     evidence=recorder, speaker=recorder, clock=clock,
+                                     **warden_options)
+            warden.forbidden.search = timings.wrap(warden.forbidden.search, "classify")
+            warden.is_allowed = timings.wrap(warden.is_allowed, "classify.allowed")
+            warden.record = timings.wrap(warden.record, "account")
+            warden.violation = timings.wrap(warden.violation, "enforce.violation")
+            warden.audit = timings.wrap(warden.audit, "enforce.audit")
+            if session_minutes is not None:
+                warden.start_session("replay", session_minutes)
+            start = time.perf_counter()
+            warden.watch(stream(events, clock, tick, loops, timings=timings), seed=False)
+            wall = time.perf_counter() - start
+            warden.intervals.close()
+        snap = warden.snapshot()
+        store.close()
+
+    simulated = clock.monotonic()
+    return {
+        "events": len(events) * loops,
+        "simulated_seconds": simulated,
+        "wall_seconds": wall,
+        "speedup": simulated / wall if wall else None,
+        "totals": snap["totals"],
+        "apps": dict(sorted(warden.stats.apps.items())),
+        "focus_seconds": snap["focus_seconds"],
+        "drift_seconds": snap["drift_seconds"],
+        "violations": [e for e in published if e["event"] == "violation"],
+        "audits": [e for e in published if e["event"] == "lockout"],
+        "warnings": [a for a in actions if a["action"] == "say"],
+        "actions": [a for a in actions if a["action"] != "say"],
+        "timings": timings.report(),
+    }
+
+
+# ==========================================
+# DIFF
+# ==========================================
+def diff(a, b, tolerance=0.5):
+    """Human-readable differences in results (not timings) between two reports."""
+    out = []
+    for key in ("totals", "apps"):
+        for name in sorted(set(a[key]) | set(b[key])):
+            x, y = a[key].get(name, 0.0), b[key].get(name, 0.0)
+            if abs(x - y) > tolerance:
+                out.append(f"{key}[{name}]: {x:.1f}s -> {y:.1f}s ({y - x:+.1f}s)")
+    for key in ("focus_seconds", "drift_seconds"):
+        if abs(a[key] - b[key]) > tolerance:
+            out.append(f"{key}: {a[key]:.1f}s -> {b[key]:.1f}s")
+    for key, fields in (("violations", ("app", "keyword")), ("audits", ("reason",)),
+                        ("warnings", ("target",)), ("actions", ("action", "target"))):
+        left = [(round(e["t"]), *(e.get(f) for f in fields)) for e in a[key]]
+        right = [(round(e["t"]), *(e.get(f) for f in fields)) for e in b[key]]
+        for item in sorted(set(left) - set(right), key=str):
+            out.append(f"- {key[:-1]} {item}")
+        for item in sorted(set(right) - set(left), key=str):
+            out.append(f"+ {key[:-1]} {item}")
+    return out
+
+
+def timing_table(a, b=None):
+    lines = []
+    for stage in sorted(set(a["timings"]) | set(b["timings"] if b else ())):
+        x = a["timings"].get(stage, {}).get("mean_us", 0.0)
+        if b is None:
+            calls = a["timings"][stage]["calls"]
+            lines.append(f"  {stage:<20} {calls:>9} calls {x:>10.2f} us/call")
+        else:
+            y = b["timings"].get(stage, {}).get("mean_us", 0.0)
+            change = f"{(y / x - 1) * 100:+.0f}%" if x else "new"
+            lines.append(f"  {stage:<20} {x:>10.2f} -> {y:>10.2f} us/call  {change}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="replay", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record", help="record the live socket2 stream")
+    rec.add_argument("trace")
+    rec.add_argument("--duration", type=float, default=None)
+    run = sub.add_parser("run", help="replay a trace and report")
+    run.add_argument("trace")
+    run.add_argument("--tick", type=float, default=2.0)
+    run.add_argument("--audit-every", type=float, default=600.0)
+    run.add_argument("--loops", type=int, default=1, help="replay the trace N times back to back")
+    run.add_argument("--session", type=float, default=None, help="start a session of N minutes")
+    run.add_argument("--out", help="write the JSON report here")
+    cmp = sub.add_parser("diff", help="compare two reports")
+    cmp.add_argument("before")
+    cmp.add_argument("after")
+    cmp.add_argument("--tolerance", type=float, default=0.5, help="seconds")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "record":
+        try:
+            record_trace(args.trace, args.duration)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.cmd == "run":
+        report = replay(load_trace(args.trace), args.tick, args.audit_every, args.loops, args.session)
+        report["trace"] = args.trace
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=1)
+        print(f"{report['events']} events, {report['simulated_seconds']:.0f}s simulated in "
+              f"{report['wall_seconds']:.3f}s ({report['speedup']:.0f}x)")
+        print(f"  focus {report['focus_seconds']:.1f}s  drift {report['drift_seconds']:.1f}s  "
+              f"violations {len(report['violations'])}  audits {len(report['audits'])}  "
+              f"warnings {len(report['warnings'])}")
+        print("\n".join(timing_table(report)))
+        return 0
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+    changes = diff(before, after, args.tolerance)
+    print("\n".join(changes) if changes else "results identical")
+    print("timings:")
+    print("\n".join(timing_table(before, after)))
+    return 1 if changes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Warden voice: one speech worker instead of an espeak-ng process per phrase.
+"""
+
+import atexit
+import hashlib
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+CACHE_DIR = os.path.expanduser("~/.cache/overman/speech")
+PLAYERS = (["pw-play"], ["paplay"], ["aplay", "-q"])
+
+URGENT, NORMAL, LOW = 0, 1, 2
+_STOP = 99
+
+
+class Speaker(threading.Thread):
+    """
+    Speaks phrases one at a time, most urgent first.
+
+    say() never blocks. A phrase that is already queued, or was spoken less
+    than `repeat_after` seconds ago, is dropped, so a warning fired on every
+    tick is heard once per interval instead of piling up overlapping voices.
+    Phrases heard `cache_after` times (or passed to warm()) are rendered
+    once to a WAV in `cache_dir` and played back from there, skipping
+    synthesis; without a WAV player everything goes through espeak-ng.
+    """
+
+    def __init__(self, voice="en-us", speed=170, repeat_after=10.0, cache_after=2,
+                 cache_dir=CACHE_DIR, timeout=30.0):
+        super().__init__(name="speaker", daemon=True)
+        self.voice = voice
+        self.speed = speed
+        self.repeat_after = repeat_after
+        self.cache_after = cache_after
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.player = next((p for p in PLAYERS if shutil.which(p[0])), None)
+        self.queue = queue.PriorityQueue()
+        self._queued = set()
+        self._last = {}   # text -> monotonic time last spoken
+        self._heard = {}  # text -> times spoken
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.spoken = 0
+        self.suppressed = 0
+        self.cache_hits = 0
+        self._closed = False
+        atexit.register(self.close)
+        self.start()
+
+    def say(self, text, priority=NORMAL):
+        """Queue `text`; returns False when it was deduplicated or rate limited."""
+        now = time.monotonic()
+        with self._lock:
+            if text in self._queued or now - self._last.get(text, -self.repeat_after) < self.repeat_after:
+                self.suppressed += 1
+                return False
+            self._queued.add(text)
+            self._put(priority, "say", text)
+        return True
+
+    def warm(self, *phrases):
+        """Pre-render phrases to the cache in the background."""
+        with self._lock:
+            for text in phrases:
+                self._put(LOW, "render", text)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            self._put(_STOP, None, None)
+        self.join(timeout=self.timeout)
+
+    def stats(self):
+        return {"spoken": self.spoken, "suppressed": self.suppressed,
+                "cache_hits": self.cache_hits, "queued": self.queue.qsize()}
+
+    def _put(self, priority, kind, text):
+        self._seq += 1
+        self.queue.put((priority, self._seq, kind, text))
+
+    # --- WORKER ---
+    def run(self):
+        while True:
+            _, _, kind, text = self.queue.get()
+            if kind is None:
+                return
+            try:
+                if kind == "render":
+                    self._render(text)
+                    continue
+                with self._lock:
+                    self._queued.discard(text)
+                    self._last[text] = time.monotonic()
+                    heard = self._heard[text] = self._heard.get(text, 0) + 1
+                self._speak(text, heard)
+                self.spoken += 1
+            except (OSError, subprocess.SubprocessError) as e:
+                print(f"Speaker error: {e}")
+            finally:
+                if kind == "say":
+                    with self._lock:
+                        self._last[text] = time.monotonic()
+
+    def _speak(self, text, heard):
+        wav = self._wav_path(text)
+        if self.player and os.path.exists(wav):
+            self.cache_hits += 1
+        elif self.player and heard >= self.cache_after:
+            self._render(text)
+        else:
+            subprocess.run(["espeak-ng", "-s", str(self.speed), "-v", self.voice, text],
+                           stderr=subprocess.DEVNULL, timeout=self.timeout)
+            return
+        subprocess.run(self.player + [wav], stderr=subprocess.DEVNULL, timeout=self.timeout)
+
+    def _render(self, text):
+        wav = self._wav_path(text)
+        if os.path.exists(wav):
+            return wav
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{wav}.{os.getpid()}.tmp"
+        subprocess.run(["espeak-ng", "-s", str(self.speed), "-v", self.voice, "-w", tmp, text],
+                       stderr=subprocess.DEVNULL, timeout=self.timeout, check=True)
+        os.replace(tmp, wav)
+        return wav
+
+    def _wav_path(self, text):
+        key = hashlib.sha1(f"{self.voice}\0{self.speed}\0{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".wav")
@@ -0,0 +1,146 @@
+"""
+Startup profiling for the Qt entry points.
+
+    python ubermensch.py --profile-startup
+
+re-runs the script under `python -X importtime`, offscreen, stops it as soon
+as its first window has painted and prints the time to first window against
+TARGET_MS with the slowest imports. The entry point cooperates by calling
+first_window() on the window it shows first.
+
+Module-level services (Store, Actuators, EvidenceStore, Speaker) are
+wrapped in Deferred so they are built on first use, when the warden or
+dashboard starts, and warm-up work goes through after_paint().
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+FLAG = "--profile-startup"
+TARGET_MS = 300
+_CHILD = "OVERMAN_PROFILE_STARTUP"
+_MARKER = "overman-first-window"
+
+
+def requested(argv=None):
+    return FLAG in (sys.argv if argv is None else argv)
+
+
+def platform(default):
+    """QT_QPA_PLATFORM for an entry point: `default`, or offscreen while being profiled."""
+    return "offscreen" if os.environ.get(_CHILD) else default
+
+
+def first_window(widget):
+    """When profiling, report the first paint of `widget` and exit right after it."""
+    if not os.environ.get(_CHILD):
+        return
+    from PyQt6.QtCore import QEvent, QObject
+
+    class Painted(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                print(_MARKER, flush=True)
+                os._exit(0)
+            return False
+
+    widget._first_paint = Painted(widget)
+    widget.installEventFilter(widget._first_paint)
+
+
+class Deferred:
+    """
+    Stands in for `factory(*args, **kwargs)` and builds it on the first
+    attribute access (from any thread), so importing a frontend does not
+    open databases, start worker threads or spawn espeak.
+    """
+
+    def __init__(self, factory, *args, **kwargs):
+        self._factory = factory
+        self._args = args
+        self._kwargs = kwargs
+        self._obj = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._obj is None:
+            with self._lock:
+                if self._obj is None:
+                    self._obj = self._factory(*self._args, **self._kwargs)
+        return self._obj
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def after_paint(widget, fn):
+    """Run fn() once, from the event loop, right after `widget` first paints."""
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+
+    class Painted(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                obj.removeEventFilter(self)
+                QTimer.singleShot(0, fn)
+            return False
+
+    filt = Painted(widget)
+    widget.installEventFilter(filt)
+    return filt
+
+
+def parse_importtime(lines):
+    """`-X importtime` stderr as [(module, self_us, cumulative_us, depth)]."""
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative), depth))
+    return rows
+
+
+def profile(script, args=(), top=12, timeout=30.0):
+    """Run `script` to its first window; print the breakdown and return an exit status."""
+    import tempfile
+
+    env = dict(os.environ, **{_CHILD: "1", "QT_QPA_PLATFORM": "offscreen"})
+    cmd = [sys.executable, "-X", "importtime", os.path.abspath(script),
+           *[a for a in args if a != FLAG]]
+    with tempfile.TemporaryFile("w+") as stderr:  # a pipe would fill up and stall the child
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        first = None
+        for line in proc.stdout:
+            if line.strip() == _MARKER:
+                first = (time.perf_counter() - start) * 1000
+                break
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        stderr.seek(0)
+        err = stderr.read()
+    rows = parse_importtime(err.splitlines())
+
+    name = os.path.basename(script)
+    if first is None:
+        print(f"{name}: no window painted (exit status {proc.returncode})")
+        print("\n".join(line for line in err.splitlines() if not line.startswith("import time:"))[-2000:])
+        return 1
+    total = sum(r[1] for r in rows) / 1000
+    verdict = "ok" if first <= TARGET_MS else "OVER"
+    print(f"{name}: first window after {first:.0f} ms (target {TARGET_MS} ms, {verdict}); "
+          f"imports {total:.0f} ms of that")
+    print(f"  {'top-level import':<40} {'cumulative':>10}")
+    for module, _, cumulative, _ in sorted((r for r in rows if r[3] == 0), key=lambda r: -r[2])[:top]:
+        print(f"  {module:<40} {cumulative / 1000:>8.1f} ms")
+    print(f"  {'slowest modules (self)':<40} {'self':>10}")
+    for module, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"  {module:<40} {self_us / 1000:>8.1f} ms")
+    return 0 if first <= TARGET_MS else 1
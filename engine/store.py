@@ -0,0 +1,374 @@
+"""
+Session history in one SQLite database (WAL mode).
+
+Replaces the CSV / history.json / archive_db.json / surrender.log files.
+All writes go through a single LogWriter-style thread and are committed in
+batched transactions (bulk imports excepted: Store.apply() runs them in one
+transaction of their own); readers open their own connections and, thanks
+to WAL, never block (or wait on) the writer.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from engine.logwriter import LogWriter
+
+DB_PATH = Path.home() / ".local/share/overman/overman.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    app_id INTEGER NOT NULL REFERENCES apps(id),
+    title TEXT NOT NULL,
+    UNIQUE (app_id, title)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    goal TEXT,
+    start REAL NOT NULL,
+    end REAL,
+    planned_sec INTEGER,
+    ratio REAL
+);
+CREATE TABLE IF NOT EXISTS intervals (
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    app_id INTEGER NOT NULL REFERENCES apps(id),
+    title_id INTEGER NOT NULL REFERENCES titles(id),
+    status TEXT NOT NULL,
+    session_id INTEGER REFERENCES sessions(id)
+);
+CREATE TABLE IF NOT EXISTS audits (
+    ts REAL NOT NULL,
+    reason TEXT,
+    evidence TEXT,
+    session_id INTEGER REFERENCES sessions(id)
+);
+CREATE TABLE IF NOT EXISTS violations (
+    ts REAL NOT NULL,
+    app TEXT,
+    title TEXT,
+    keyword TEXT,
+    action TEXT,
+    session_id INTEGER REFERENCES sessions(id)
+);
+CREATE INDEX IF NOT EXISTS intervals_start ON intervals(start);
+CREATE INDEX IF NOT EXISTS intervals_app ON intervals(app_id, start);
+CREATE INDEX IF NOT EXISTS intervals_session ON intervals(session_id);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions(start);
+CREATE INDEX IF NOT EXISTS audits_ts ON audits(ts);
+CREATE INDEX IF NOT EXISTS violations_ts ON violations(ts);
+CREATE INDEX IF NOT EXISTS violations_app ON violations(app, ts);
+"""
+
+
+def connect(path, readonly=False):
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class _Ops:
+    """
+    The write ops on one connection, with its app/title id caches. Each op is
+    (name, args) and runs as self._<name>(*args).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._app_ids = {}
+        self._title_ids = {}
+
+    def commit(self, ops):
+        """Runs `ops` (any iterable) in one transaction; the number applied."""
+        n = 0
+        self.conn.execute("BEGIN")
+        for op, args in ops:
+            getattr(self, "_" + op)(*args)
+            n += 1
+        self.conn.execute("COMMIT")
+        return n
+
+    def rollback(self):
+        # ids handed out inside the failed transaction no longer exist
+        self._app_ids.clear()
+        self._title_ids.clear()
+        if self.conn.in_transaction:
+            self.conn.execute("ROLLBACK")
+
+    def _app_id(self, name):
+        i = self._app_ids.get(name)
+        if i is None:
+            self.conn.execute("INSERT OR IGNORE INTO apps(name) VALUES (?)", (name,))
+            i = self.conn.execute("SELECT id FROM apps WHERE name=?", (name,)).fetchone()[0]
+            self._app_ids[name] = i
+        return i
+
+    def _title_id(self, app_id, title):
+        key = (app_id, title)
+        i = self._title_ids.get(key)
+        if i is None:
+            self.conn.execute("INSERT OR IGNORE INTO titles(app_id, title) VALUES (?, ?)", key)
+            i = self.conn.execute("SELECT id FROM titles WHERE app_id=? AND title=?", key).fetchone()[0]
+            self._title_ids[key] = i
+        return i
+
+    def _interval(self, start, end, app, title, status, session_id):
+        app_id = self._app_id(app)
+        self.conn.execute(
+            "INSERT INTO intervals VALUES (?, ?, ?, ?, ?, ?)",
+            (start, end, app_id, self._title_id(app_id, title), status, session_id))
+
+    def _session_start(self, sid, goal, start, planned_sec):
+        self.conn.execute("INSERT OR REPLACE INTO sessions(id, goal, start, planned_sec) VALUES (?, ?, ?, ?)",
+                          (sid, goal, start, planned_sec))
+
+    def _session_end(self, sid, end, ratio):
+        self.conn.execute("UPDATE sessions SET end=?, ratio=? WHERE id=?", (end, ratio, sid))
+
+    def _audit(self, *row):
+        self.conn.execute("INSERT INTO audits VALUES (?, ?, ?, ?)", row)
+
+    def _violation(self, *row):
+        self.conn.execute("INSERT INTO violations VALUES (?, ?, ?, ?, ?, ?)", row)
+
+
+class _StoreWriter(LogWriter):
+    """
+    LogWriter whose batches become one SQLite transaction. A batch that
+    fails is retried op by op, so one bad row loses only itself (counted in
+    `failed`); no error stops the thread.
+    """
+
+    def __init__(self, store, **kw):
+        self.store = store
+        self.ops = None
+        self.failed = 0
+        super().__init__(str(store.path), **kw)
+
+    def _flush(self, ops):
+        if not ops:
+            return
+        try:
+            self._commit(ops)
+            self.written += len(ops)
+            return
+        except Exception as e:
+            self._rollback()
+            if len(ops) == 1:
+                self.failed += 1
+                print(f"Store error ({ops[0][0]}): {e}")
+                return
+        for op in ops:
+            self._flush([op])
+
+    def _commit(self, ops):
+        if self.ops is None:
+            self.ops = _Ops(connect(self.store.path))
+        self.ops.commit(ops)
+
+    def _rollback(self):
+        try:
+            if self.ops is not None:
+                self.ops.rollback()
+        except sqlite3.Error as e:
+            print(f"Store rollback failed: {e}")
+            self.ops = None  # reconnect on the next batch
+
+
+class Store:
+    """
+    Write methods only enqueue and return immediately. Read methods run on a
+    per-thread read-only connection, so a dashboard or TUI can query while
+    the warden is writing. readonly=True skips the schema setup and the
+    writer thread, for viewers of a database someone else writes.
+    """
+
+    def __init__(self, path=DB_PATH, batch_size=256, flush_interval=2.0, readonly=False):
+        self.path = Path(path)
+        self.session_id = None
+        self._local = threading.local()
+        self._writer = None
+        if readonly:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = connect(self.path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._writer = _StoreWriter(self, batch_size=batch_size, flush_interval=flush_interval)
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+
+    def apply(self, ops):
+        """
+        Runs `ops` in one transaction on a connection of its own, bypassing
+        the writer's bounded queue, and returns how many were applied. For
+        bulk imports, which must land completely or not at all: on error
+        the transaction is rolled back and the error raised.
+        """
+        conn = connect(self.path)
+        batch = _Ops(conn)
+        try:
+            return batch.commit(ops)
+        except BaseException:
+            batch.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # --- WRITES (queued, batched) ---
+    def start_session(self, goal, duration_mins=None, ts=None):
+        ts = ts or time.time()
+        self.session_id = int(ts * 1000)
+        planned = duration_mins * 60 if duration_mins else None
+        self._writer.write(("session_start", (self.session_id, goal, ts, planned)))
+        return self.session_id
+
+    def end_session(self, ratio=None, ts=None):
+        if self.session_id is not None:
+            self._writer.write(("session_end", (self.session_id, ts or time.time(), ratio)))
+
+    def add_interval(self, row):
+        """row = (start, end, app, title, status), as written by IntervalLog."""
+        self._writer.write(("interval", (*row, self.session_id)))
+
+    def add_audit(self, reason, evidence=None, ts=None):
+        self._writer.write(("audit", (ts or time.time(), reason, evidence, self.session_id)))
+
+    def add_violation(self, app, title, keyword=None, action=None, ts=None):
+        self._writer.write(("violation", (ts or time.time(), app, title, keyword, action, self.session_id)))
+
+    # --- READS (concurrent with the writer) ---
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path, readonly=True)
+        return conn
+
+    def query(self, sql, params=()):
+        return self._reader().execute(sql, params).fetchall()
+
+    def status_totals(self, since=0.0):
+        return dict(self.query(
+            "SELECT status, SUM(end - start) FROM intervals WHERE start >= ? GROUP BY status", (since,)))
+
+    def app_totals(self, since=0.0, limit=None):
+        sql = ("SELECT a.name, SUM(i.end - i.start) AS sec FROM intervals i JOIN apps a ON a.id = i.app_id "
+               "WHERE i.start >= ? GROUP BY i.app_id ORDER BY sec DESC")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.query(sql, (since,))
+
+    def title_totals(self, app, since=0.0, limit=None):
+        sql = ("SELECT t.title, SUM(i.end - i.start) AS sec FROM intervals i "
+               "JOIN apps a ON a.id = i.app_id JOIN titles t ON t.id = i.title_id "
+               "WHERE a.name = ? AND i.start >= ? GROUP BY i.title_id ORDER BY sec DESC")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.query(sql, (app, since))
+
+    def daily_totals(self, since=0.0):
+        """[(YYYY-MM-DD, productive_sec, other_sec)] per local day, newest first."""
+        return self.query(
+            "SELECT date(start, 'unixepoch', 'localtime') AS day, "
+            "SUM(CASE WHEN status = 'Productive' THEN end - start ELSE 0 END), "
+            "SUM(CASE WHEN status = 'Productive' THEN 0 ELSE end - start END) "
+            "FROM intervals WHERE start >= ? GROUP BY day ORDER BY day DESC", (since,))
+
+    def last_interval(self):
+        """(app, title, status, end) of the most recently recorded interval, or None."""
+        rows = self.query("SELECT a.name, t.title, i.status, i.end FROM intervals i "
+                          "JOIN apps a ON a.id = i.app_id JOIN titles t ON t.id = i.title_id "
+                          "ORDER BY i.start DESC LIMIT 1")
+        return rows[0] if rows else None
+
+    def sessions(self, limit=10):
+        """Most recent finished sessions, oldest first, as dicts."""
+        rows = self.query("SELECT id, goal, start, end, planned_sec, ratio FROM sessions "
+                          "WHERE ratio IS NOT NULL ORDER BY start DESC LIMIT ?", (limit,))
+        keys = ("id", "goal", "start", "end", "planned_sec", "ratio")
+        return [dict(zip(keys, r)) for r in reversed(rows)]
+
+    def violations(self, since=0.0):
+        return self.query("SELECT ts, app, title, keyword, action FROM violations WHERE ts >= ? ORDER BY ts",
+                          (since,))
+
+
+# ==========================================
+# IMPORT OF THE OLD FLAT FILES
+# ==========================================
+def import_history_json(store, path):
+    """overman22/26 history.json: [{"date", "ratio", "goal"}, ...]"""
+    from datetime import datetime
+
+    def ops():
+        for entry in json.loads(Path(path).read_text()):
+            ts = datetime.fromisoformat(entry["date"]).timestamp()
+            yield "session_start", (int(ts * 1000), entry.get("goal"), ts, None)
+            yield "session_end", (int(ts * 1000), ts, entry.get("ratio"))
+    return store.apply(ops())
+
+
+def import_surrender_log(store, path):
+    """ovtopv2.sh surrender.log: [YYYY-mm-dd HH:MM:SS] SURRENDER: class | title"""
+    from datetime import datetime
+
+    def ops():
+        for line in Path(path).read_text(errors="replace").splitlines():
+            stamp, _, rest = line.partition("] SURRENDER: ")
+            if not rest:
+                continue
+            app, _, title = rest.partition(" | ")
+            ts = datetime.strptime(stamp.lstrip("["), "%Y-%m-%d %H:%M:%S").timestamp()
+            yield "violation", (ts, app, title, None, "surrender", None)
+    return store.apply(ops())
+
+
+def import_intervals_csv(store, path):
+    """session_intervals.csv written by IntervalLog (start,end,app,title,status)."""
+    import csv
+
+    def ops():
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                yield "interval", (float(row["start"]), float(row["end"]), row["app"],
+                                   row["title"], row["status"], None)
+    return store.apply(ops())
+
+
+if __name__ == "__main__":
+    # python -m engine.store import FILE...
+    if sys.argv[1:2] != ["import"]:
+        sys.exit("usage: python -m engine.store import history.json|surrender.log|*.csv ...")
+    importers = {".json": import_history_json, ".log": import_surrender_log, ".csv": import_intervals_csv}
+    store = Store()
+    failed = False
+    for name in sys.argv[2:]:
+        importer = importers.get(os.path.splitext(name)[1])
+        if importer is None:
+            print(f"skipped {os.path.basename(name)}: unknown file type")
+            failed = True
+            continue
+        try:
+            print(f"imported {importer(store, name)} records from {os.path.basename(name)}")
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            print(f"FAILED {os.path.basename(name)} (nothing imported): {e!r}")
+            failed = True
+    store.close()
+    sys.exit(1 if failed else 0)
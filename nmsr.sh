@@ -8,6 +8,10 @@ mkdir -p "$DATA_DIR"
 
 # HARD BANNED APPS (Immediate Kill -9)
 BANNED=("porn" "how to" "nano" "sh" "ai" "gemini" "chatgpt" "sex" "xhamster" "instagram" "tiktok" "reddit" "shorts" "reels" "twitter" "facebook" "gemini" "deepseek" "opsec" "x" "Teligram" "nano" "sh")
+# Entries this short must match a whole word ("x" no longer hits "firefox",
+# "sh"/"ai" no longer hit "bash"/"mail"); "sex" still matches inside words
+BANNED_WORD_MAX=2
+OVERMAN_HOME="$(dirname "$(readlink -f "$0")")"
 
 # --- MANUAL CONFIGURATION ---
 SESSION_GOAL="Deep Work Protocol"
@@ -87,6 +91,14 @@ function get_random_mantra() {
     echo "${MANTRA_ARRAY[$RANDOM % ${#MANTRA_ARRAY[@]}]}"
 }
 
+# One long-lived keyword filter: the matcher is built once, not on every pass.
+# A blank line ends a batch; it answers with a blank line when the batch is done.
+# Its pipes are copied to plain fds, which (unlike coproc fds) subshells inherit.
+function start_keywords() {
+    coproc KEYWORDS { PYTHONPATH="$OVERMAN_HOME" exec python3 -m engine.keywords --word "$BANNED_WORD_MAX" "${BANNED[@]}"; }
+    exec {KW_IN}>&"${KEYWORDS[1]}" {KW_OUT}<&"${KEYWORDS[0]}"
+}
+
 function monitor_clients() {
     if ! command -v hyprctl &> /dev/null; then return; fi
 
@@ -95,20 +107,19 @@ function monitor_clients() {
     VIOLATION_FOUND=0
     KILLED_APP=""
 
-    while IFS=$'\t' read -r PID CLASS TITLE I_CLASS I_TITLE; do
-        FULL_META="${CLASS} ${TITLE} ${I_CLASS} ${I_TITLE}"
-        FULL_META="${FULL_META,,}"
-
-        for bad in "${BANNED[@]}"; do
-            if [[ "$FULL_META" == *"$bad"* ]]; then
-                kill -9 "$PID" 2>/dev/null
-                notify-send "OVERMAN" "EXECUTED: $bad (+10 MIN PENALTY)"
-                VIOLATION_FOUND=1
-                KILLED_APP="$bad"
-                ADDED_PENALTY_MINUTES=$((ADDED_PENALTY_MINUTES + 10))
-            fi
-        done
-    done < <(echo "$CLIENTS_JSON" | jq -r '.[] | "\(.pid)\t\(.class)\t\(.title)\t\(.initialClass)\t\(.initialTitle)"')
+    # One Aho-Corasick pass over every client instead of a bash loop per keyword
+    if ! kill -0 "$KEYWORDS_PID" 2>/dev/null; then
+        exec {KW_IN}>&- {KW_OUT}<&-
+        start_keywords # the filter died: restart it rather than write into a closed pipe
+    fi
+    { echo "$CLIENTS_JSON" | jq -r '.[] | "\(.pid)\t\(.class)\t\(.title)\t\(.initialClass)\t\(.initialTitle)"'; echo; } >&$KW_IN
+    while IFS=$'\t' read -r PID bad && [ -n "$PID" ]; do
+        kill -9 "$PID" 2>/dev/null
+        notify-send "OVERMAN" "EXECUTED: $bad (+10 MIN PENALTY)"
+        VIOLATION_FOUND=1
+        KILLED_APP="$bad"
+        ADDED_PENALTY_MINUTES=$((ADDED_PENALTY_MINUTES + 10))
+    done <&$KW_OUT
 
     if [ $VIOLATION_FOUND -eq 1 ]; then
         # When caught, force a random mantra to unlock
@@ -184,6 +195,7 @@ START_TIME=$(date +%s)
 LAST_BIO_CHECK=$START_TIME
 
 trap "rm -f $CSS_FILE; exit" SIGINT SIGTERM
+start_keywords
 
 notify-send "OVERMAN" "Protocol Engaged: $SESSION_GOAL"
 
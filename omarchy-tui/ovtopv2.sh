@@ -28,6 +28,15 @@ fi
 WHITELIST="anki|sublime_text|code|obsidian|kitty|alacritty|zathura"
 GOAL_TARGET_SEC=108000 # 30 Hours
 
+# --- AGGREGATOR (owns archive_db.json; we only read its stats file) ---
+OVERMAN_HOME="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+STATS_FILE="$DATA_DIR/stats.sh"
+PYTHONPATH="$OVERMAN_HOME" python3 -m engine.aggregator \
+    --db "$DB_FILE" --stats "$STATS_FILE" --surrender "$SURRENDER_LOG" --whitelist "$WHITELIST" &
+AGGREGATOR_PID=$!
+trap 'kill $AGGREGATOR_PID 2>/dev/null; exit' INT TERM EXIT
+exec {SLEEP_FD}<> <(:) # read -t on this fd is a fork-free sleep
+
 # COLORS
 G='\033[0;32m' # Focus Green
 R='\033[0;31m' # Animal Red
@@ -46,9 +55,8 @@ draw_decay_graph() {
     echo -e "\n  ${R}ANIMAL <───────────────────────────> OVERMAN${NC}"
 }
 
-fmt_time() {
-    local sec=$1
-    echo "$((sec/3600))h $(((sec%3600)/60))m"
+fmt_time() { # fmt_time SECONDS VAR
+    printf -v "$2" "%dh %dm" $(($1/3600)) $((($1%3600)/60))
 }
 
 draw_bar() {
@@ -65,55 +73,48 @@ draw_bar() {
 
 # --- RENDER LOOP ---
 while true; do
-    ACTIVE=$(hyprctl activewindow -j)
-    CLASS=$(echo "$ACTIVE" | jq -r '.class // "Idle"')
-    TITLE=$(echo "$ACTIVE" | jq -r '.title // "Empty"')
-    IS_FOCUS=0
-    [[ "$CLASS" =~ ($WHITELIST) ]] && IS_FOCUS=1
+    CLASS="Idle"; TITLE="Empty"; IS_FOCUS=0; GOAL_SEC=0; WASTE_SEC=0; STREAK=0
+    TOP_APPS=(); TOP_SECS=(); TOP_WINS=()
+    [ -f "$STATS_FILE" ] && . "$STATS_FILE"
 
     # Update Graph History (Last 40 intervals)
     HISTORY+=($IS_FOCUS)
     if [ ${#HISTORY[@]} -gt 40 ]; then HISTORY=("${HISTORY[@]:1}"); fi
 
-    # Update Database
-    tmp=$(mktemp)
-    if [ "$IS_FOCUS" -eq 1 ]; then
-        jq --arg cls "$CLASS" --arg tit "$TITLE" '.apps[$cls].total += 2 | .apps[$cls].windows[$tit] += 2 | .goal_sec += 2 | .total_tracked += 2' "$DB_FILE" > "$tmp"
-    else
-        jq --arg cls "$CLASS" --arg tit "$TITLE" '.apps[$cls].total += 2 | .apps[$cls].windows[$tit] += 2 | .waste_sec += 2 | .total_tracked += 2' "$DB_FILE" > "$tmp"
-        echo "[$(date '+%Y-%m-%d %H:%M:%S')] SURRENDER: $CLASS | $TITLE" >> "$SURRENDER_LOG"
-    fi
-    mv "$tmp" "$DB_FILE"
-
-    GOAL_SEC=$(jq -r '.goal_sec' "$DB_FILE")
-    WASTE_SEC=$(jq -r '.waste_sec' "$DB_FILE")
-    STREAK=$(jq -r '.streak // 0' "$DB_FILE")
+    fmt_time "$GOAL_SEC" GOAL_FMT
+    fmt_time "$WASTE_SEC" WASTE_FMT
 
-    clear
+    printf '\033[H\033[2J'
     echo -e "${B}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo -e "  ${Y}ÜBERMENSCH // SELF-OVERCOMING TRACKER${NC}"
     echo -e "${B}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}\n"
 
-    echo -e "  STATE        : $([ $IS_FOCUS -eq 1 ] && echo -e "${G}OVERMAN (ASCENDING)${NC}" || echo -e "${R}ANIMAL (DECAYING)${NC}")"
+    if [ $IS_FOCUS -eq 1 ]; then STATE="${G}OVERMAN (ASCENDING)${NC}"; else STATE="${R}ANIMAL (DECAYING)${NC}"; fi
+    echo -e "  STATE        : $STATE"
     echo -e "  ACTIVE       : ${C}$CLASS${NC}"
     echo -e "  WINDOW       : $TITLE"
 
     echo -e "\n${B}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo -e "  ⏱ BEHAVIORAL SPECTRUM"
     echo -e "${B}──────────────────────────────────────────────────────────────${NC}"
-    echo -ne "  GOAL EXECUTION   "; draw_bar "$GOAL_SEC" "$GOAL_TARGET_SEC" "$G"; echo -e " ($(fmt_time $GOAL_SEC) / 30h)"
-    echo -ne "  DECADENCE INDEX  "; draw_bar "$WASTE_SEC" "$((GOAL_SEC+WASTE_SEC))" "$R"; echo -e " ($(fmt_time $WASTE_SEC) wasted)"
+    echo -ne "  GOAL EXECUTION   "; draw_bar "$GOAL_SEC" "$GOAL_TARGET_SEC" "$G"; echo -e " ($GOAL_FMT / 30h)"
+    echo -ne "  DECADENCE INDEX  "; draw_bar "$WASTE_SEC" "$((GOAL_SEC+WASTE_SEC))" "$R"; echo -e " ($WASTE_FMT wasted)"
     echo -e ""
     draw_decay_graph
 
     echo -e "\n${B}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo -e "  📂 COGNITIVE HIERARCHY"
     echo -e "${B}──────────────────────────────────────────────────────────────${NC}"
-    jq -r '.apps | to_entries | sort_by(.value.total) | reverse | .[:3] | .[] | "\(.key)|\(.value.total)"' "$DB_FILE" | while IFS='|' read -r app sec; do
+    for i in "${!TOP_APPS[@]}"; do
+        app="${TOP_APPS[$i]}"
         MARK="✓"; COLOR=$G; [[ ! "$app" =~ ($WHITELIST) ]] && { MARK="✗"; COLOR=$R; }
-        echo -e "  ${COLOR}${MARK} ${app}${NC} ($(fmt_time $sec))"
-        jq -r --arg app "$app" '.apps[$app].windows | to_entries | sort_by(.value) | reverse | .[:2] | .[] | "\(.key)|\(.value)"' "$DB_FILE" | while IFS='|' read -r win val; do
-            echo -e "  ${B}│   └──${NC} ${C}${win:0:40}...${NC} ($(fmt_time $val))"
+        fmt_time "${TOP_SECS[$i]}" T
+        echo -e "  ${COLOR}${MARK} ${app}${NC} ($T)"
+        for entry in "${TOP_WINS[@]}"; do
+            IFS='|' read -r idx val win <<< "$entry"
+            [ "$idx" = "$i" ] || continue
+            fmt_time "$val" T
+            echo -e "  ${B}│   └──${NC} ${C}${win:0:40}...${NC} ($T)"
         done
     done
 
@@ -126,11 +127,12 @@ while true; do
     echo -e "\n${B}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo -e "  📊 DAILY SUMMARY"
     echo -e "${B}──────────────────────────────────────────────────────────────${NC}"
-    echo -e "  FOCUS TIME    : $(fmt_time $GOAL_SEC)"
-    echo -e "  DISTRACTIONS  : $(fmt_time $WASTE_SEC)"
+    echo -e "  FOCUS TIME    : $GOAL_FMT"
+    echo -e "  DISTRACTIONS  : $WASTE_FMT"
     echo -e "  STREAK        : $STREAK days"
-    echo -e "  VERDICT       : $([ $GOAL_SEC -gt $WASTE_SEC ] && echo -e "${G}Rising.${NC}" || echo -e "${R}You obey impulse. Reclaim control now.${NC}")"
+    if [ $GOAL_SEC -gt $WASTE_SEC ]; then VERDICT="${G}Rising.${NC}"; else VERDICT="${R}You obey impulse. Reclaim control now.${NC}"; fi
+    echo -e "  VERDICT       : $VERDICT"
     echo -e "${B}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 
-    sleep 2
+    read -rt 2 -u "$SLEEP_FD"
 done
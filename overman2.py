@@ -3,26 +3,38 @@ import os
 import json
 import random
 import subprocess
-import pandas as pd
+import time
+import csv
 from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QProgressBar, 
                              QFrame, QPushButton, QTabWidget, QTextEdit)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QPixmap, QColor
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+
+from engine import startup
+from engine.actuators import Actuators
+from engine.aggregates import RunningStats
+from engine.charts import BarChart, PieChart
+from engine.clock import Every, Lap
+from engine.evidence import EvidenceStore
+from engine.imageloader import ImageLoader
+from engine.logwriter import LogWriter
+from engine.speech import NORMAL, URGENT, Speaker
 
 # --- GLOBAL CONFIG ---
 BASE_DIR = os.path.expanduser("~/.local/share/overman")
 DATA_FILE = os.path.join(BASE_DIR, "session_history.csv")
 SCREENSHOT_DIR = os.path.join(BASE_DIR, "audit_evidence")
-os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+actuators = startup.Deferred(Actuators) # built when the warden first needs them
+evidence = startup.Deferred(EvidenceStore, SCREENSHOT_DIR)
 
 # Default forbidden keywords (Always active - The "Porn" Blocker)
 FORBIDDEN_KEYWORDS = ["porn", "facebook", "twitter", "instagram", "tiktok", "reddit", "xxx"]
 # Drifting triggers voice alarm
 DRIFT_APPS = ["firefox", "brave", "chrome", "discord"]
+# Charts are polled this often and repaint only when the totals changed
+CHART_REFRESH_MS = 2000
 
 NIETZSCHE_QUOTES = [
     "He who cannot obey himself will be commanded.",
@@ -34,27 +46,44 @@ NIETZSCHE_QUOTES = [
     "I teach you the Overman. Man is something that shall be overcome."
 ]
 
-def speak(text):
+speaker = startup.Deferred(Speaker, speed=170)
+WARM_PHRASES = ("Drift detected. Return to the goal.", "VIOLATION DETECTED. Audit initiated.")
+
+def speak(text, priority=NORMAL):
     """The Voice of the Warden."""
-    subprocess.Popen(["espeak-ng", "-s", "170", "-v", "en-us", text], stderr=subprocess.DEVNULL)
+    speaker.say(text, priority)
+
+def load_history(path):
+    """Per-status and per-app seconds from the session CSV (one row = 2s sample)."""
+    status, apps = {}, {}
+    if os.path.exists(path):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                status[row["status"]] = status.get(row["status"], 0) + 2
+                apps[row["app"]] = apps.get(row["app"], 0) + 2
+    return status, apps
 
 # --- WORKER THREAD (THE WARDEN) ---
 class WardenThread(QThread):
-    lockout_signal = pyqtSignal(str)     # Trigger Audit Window
+    lockout_signal = pyqtSignal(str, float) # Trigger Audit Window (path, detection time)
     update_signal = pyqtSignal(str, str) # Send data to Dashboard
 
     def __init__(self, allowed_apps_list):
         super().__init__()
         self.allowed_apps = [a.strip().lower() for a in allowed_apps_list if a.strip()]
         self.running = True
+        self.log = LogWriter(DATA_FILE, header=("timestamp", "app", "status", "is_allowed"))
+        self.stats = RunningStats()
+        self.stats.seed(*load_history(DATA_FILE))
 
     def run(self):
         drift_timer = 0
-        audit_timer = 0 
+        lap = Lap() # Time actually spent since the last poll, not the nominal 2s
+        audit_due = Every(600) # 10 Minutes
         
         while self.running:
             self.msleep(2000) # Poll every 2 seconds
-            audit_timer += 2
+            dt = lap()
             
             try:
                 # 1. GET HYPRLAND WINDOW DATA
@@ -66,22 +95,21 @@ class WardenThread(QThread):
 
                 # 2. IMMEDIATE KILL PROTOCOL (Forbidden Keywords)
                 if any(k in title for k in FORBIDDEN_KEYWORDS):
-                    subprocess.run(["hyprctl", "dispatch", "closewindow", f"address:{data['address']}"])
+                    actuators.close_window(f"address:{data['address']}")
                     self.trigger_audit("VIOLATION DETECTED")
                     continue
 
                 # 3. THE 10-MINUTE MANDATORY AUDIT
-                if audit_timer >= 600: # 10 Minutes
+                if audit_due():
                     self.trigger_audit("10 MINUTE CHECK")
-                    audit_timer = 0
 
                 # 4. DRIFT DETECTION (Voice Warning)
                 # If app is NOT in Allowed Apps, it counts as drift
                 is_allowed = any(a in app_class for a in self.allowed_apps)
                 
                 if not is_allowed:
-                    drift_timer += 2
-                    if drift_timer == 60: # 1 min grace
+                    drift_timer += dt
+                    if drift_timer - dt < 60 <= drift_timer: # 1 min grace
                         speak(f"Samidu, focus. You are in {app_class}.")
                     elif drift_timer > 120:
                         speak("Drift detected. Return to the goal.")
@@ -92,30 +120,26 @@ class WardenThread(QThread):
                 status = "Productive" if is_allowed else "Drifting"
                 self.update_signal.emit(app_class, status)
                 
-                df = pd.DataFrame([{
-                    "timestamp": datetime.now(), 
-                    "app": app_class, 
-                    "status": status,
-                    "is_allowed": is_allowed
-                }])
-                df.to_csv(DATA_FILE, mode='a', header=not os.path.exists(DATA_FILE), index=False)
+                self.stats.add(app_class, status, dt)
+                self.log.write((datetime.now(), app_class, status, is_allowed))
 
             except Exception:
                 pass
 
     def trigger_audit(self, reason):
-        speak(f"{reason}. Audit initiated.")
-        snap_path = os.path.join(SCREENSHOT_DIR, f"audit_{datetime.now().strftime('%H%M%S')}.png")
-        subprocess.run(["grim", snap_path])
-        self.lockout_signal.emit(snap_path)
+        detected = time.monotonic()
+        speak(f"{reason}. Audit initiated.", URGENT)
+        evidence.capture(then=lambda ev: self.lockout_signal.emit(ev["path"] if ev else "", detected))
 
 # --- UI: THE LOCKOUT (AUDIT) ---
 class LockoutWindow(QMainWindow):
-    def __init__(self, img_path):
+    """Built hidden once; present() re-arms it for every audit."""
+    def __init__(self):
         super().__init__()
         self.setProperty("class", "overman-lockout")
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
-        self.setWindowState(Qt.WindowState.WindowFullScreen)
+        self.shown_ms = [] # violation -> lockout painted
+        self._since = None
         self.setStyleSheet("background: black; border: 4px solid red;")
         
         layout = QVBoxLayout()
@@ -125,29 +149,50 @@ class LockoutWindow(QMainWindow):
         lbl.setFont(QFont("Impact", 40)); lbl.setStyleSheet("color: red")
         layout.addWidget(lbl, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        # Show evidence of what you were doing
-        if os.path.exists(img_path):
-            pix = QPixmap(img_path).scaled(900, 600, Qt.AspectRatioMode.KeepAspectRatio)
-            img = QLabel(); img.setPixmap(pix)
-            layout.addWidget(img, alignment=Qt.AlignmentFlag.AlignCenter)
+        # Show evidence of what you were doing (decoded off the GUI thread)
+        self.evidence = QLabel(); self.evidence.setMinimumSize(900, 600)
+        self.evidence.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.evidence.setStyleSheet("color: #666; border: none;")
+        layout.addWidget(self.evidence, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.loader = ImageLoader(self)
+        self.loader.loaded.connect(self.show_evidence)
 
-        # Random Nietzsche Quote for the Audit
-        self.target_phrase = random.choice(["I am a bridge", "Will to power", "Kill the worm", "Command myself"])
-        
-        q_lbl = QLabel(f"TYPE TO UNLOCK: '{self.target_phrase}'")
-        q_lbl.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
-        layout.addWidget(q_lbl, alignment=Qt.AlignmentFlag.AlignCenter)
+        # Random Nietzsche Quote for the Audit (picked per audit)
+        self.target_phrase = ""
+        self.q_lbl = QLabel()
+        self.q_lbl.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
+        layout.addWidget(self.q_lbl, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.input = QLineEdit()
         self.input.setStyleSheet("font-size: 24px; padding: 10px; color: white; background: #222; border: 1px solid red;")
         self.input.setFixedWidth(500)
         self.input.returnPressed.connect(self.check_mantra)
         layout.addWidget(self.input, alignment=Qt.AlignmentFlag.AlignCenter)
+
+    def present(self, img_path, since=None):
+        self._since = since if since is not None else time.monotonic()
+        self.target_phrase = random.choice(["I am a bridge", "Will to power", "Kill the worm", "Command myself"])
+        self.q_lbl.setText(f"TYPE TO UNLOCK: '{self.target_phrase}'")
+        self.input.clear()
+        self.evidence.clear(); self.evidence.setText("LOADING EVIDENCE...")
+        self.loader.load(img_path, 900, 600)
+        self.showFullScreen(); self.raise_(); self.activateWindow()
         self.input.setFocus()
 
+    def show_evidence(self, token, image):
+        if token != self.loader.latest: return
+        if image.isNull(): self.evidence.setText("")
+        else: self.evidence.setPixmap(QPixmap.fromImage(image))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._since is not None:
+            self.shown_ms.append((time.monotonic() - self._since) * 1000)
+            self._since = None
+
     def check_mantra(self):
         if self.input.text().lower().strip() == self.target_phrase.lower():
-            self.close()
+            self.hide()
 
 # --- UI: THE OVERLAY (FLOATING TIMER) ---
 class OverlayWindow(QMainWindow):
@@ -187,12 +232,19 @@ class Dashboard(QMainWindow):
         self.overlay = OverlayWindow(duration)
         self.overlay.show()
         
+        self.lock = LockoutWindow() # Built once, hidden, reused per audit
+
         self.warden = WardenThread(allowed_apps)
         self.warden.lockout_signal.connect(self.trigger_lockout)
         self.warden.update_signal.connect(self.update_live_data)
         self.warden.start()
 
         self.setup_ui(goal, duration)
+        self.refresh_charts()
+
+        self.chart_timer = QTimer()
+        self.chart_timer.timeout.connect(self.refresh_charts)
+        self.chart_timer.start(CHART_REFRESH_MS)
         
         self.timer = QTimer()
         self.timer.timeout.connect(self.tick)
@@ -249,14 +301,12 @@ class Dashboard(QMainWindow):
         self.tabs.setStyleSheet("QTabWidget::pane { border: 0; } QTabBar::tab { background: #222; color: #888; padding: 10px; } QTabBar::tab:selected { background: #444; color: white; }")
         
         # Tab 1: Productivity Pie
-        self.fig1 = Figure(figsize=(5, 4), facecolor='#0d0d0d')
-        self.canvas1 = FigureCanvas(self.fig1)
-        self.tabs.addTab(self.canvas1, "Focus Ratio")
+        self.pie = PieChart("WILLPOWER")
+        self.tabs.addTab(self.pie, "Focus Ratio")
 
         # Tab 2: App Usage Bar
-        self.fig2 = Figure(figsize=(5, 4), facecolor='#0d0d0d')
-        self.canvas2 = FigureCanvas(self.fig2)
-        self.tabs.addTab(self.canvas2, "App Usage")
+        self.bars = BarChart("TOP APPS", color='#00aaff')
+        self.tabs.addTab(self.bars, "App Usage")
 
         right.addWidget(self.tabs)
         layout.addLayout(right, 4)
@@ -269,31 +319,14 @@ class Dashboard(QMainWindow):
         self.time_lbl.setText(f"START: {self.start_time} | NOW: {now_time}")
         self.lbl_status.setText(f"CURRENT: {app} | STATE: {status}")
         self.lbl_status.setStyleSheet(f"color: {'#ff3333' if status=='Drifting' else '#00ff41'}")
-        
-        if random.random() < 0.1: self.refresh_charts()
 
     def refresh_charts(self):
-        if not os.path.exists(DATA_FILE): return
-        try:
-            df = pd.read_csv(DATA_FILE)
-            
-            # Pie Chart
-            self.fig1.clear()
-            ax1 = self.fig1.add_subplot(111)
-            counts = df['status'].value_counts()
-            ax1.pie(counts, labels=counts.index, autopct='%1.1f%%', colors=['#00ff41', '#ff3333'], textprops={'color':"w"})
-            ax1.set_title("WILLPOWER", color='white')
-            self.canvas1.draw()
-
-            # Bar Chart
-            self.fig2.clear()
-            ax2 = self.fig2.add_subplot(111)
-            app_counts = df['app'].value_counts().head(5)
-            ax2.barh(app_counts.index, app_counts.values, color='#00aaff')
-            ax2.tick_params(colors='white', labelcolor='white')
-            ax2.set_title("TOP APPS", color='white')
-            self.canvas2.draw()
-        except: pass
+        changed = self.warden.stats.take()
+        if changed is None: return
+        totals, top_apps = changed
+        self.pie.set_slices([(k, totals.get(k, 0), '#00ff41' if k == "Productive" else '#ff3333')
+                             for k in ("Productive", "Drifting")])
+        self.bars.set_bars(top_apps) # biggest on top (matplotlib's barh drew it at the bottom)
 
     def tick(self):
         curr = self.main_prog.value()
@@ -308,9 +341,8 @@ class Dashboard(QMainWindow):
             speak("Session complete.")
             self.timer.stop()
 
-    def trigger_lockout(self, path):
-        self.lock = LockoutWindow(path)
-        self.lock.show()
+    def trigger_lockout(self, path, detected):
+        self.lock.present(path, detected)
 
 # --- UI: THE ARCHITECT (STARTUP) ---
 class PlannerWindow(QMainWindow):
@@ -362,8 +394,12 @@ class PlannerWindow(QMainWindow):
             speak("Error. Define goal and time.")
 
 if __name__ == "__main__":
-    os.environ["QT_QPA_PLATFORM"] = "wayland"
+    if startup.requested():
+        sys.exit(startup.profile(__file__, sys.argv[1:]))
+    os.environ["QT_QPA_PLATFORM"] = startup.platform("wayland")
     app = QApplication(sys.argv)
     plan = PlannerWindow()
     plan.show()
+    startup.first_window(plan)
+    startup.after_paint(plan, lambda: speaker.warm(*WARM_PHRASES))
     sys.exit(app.exec())
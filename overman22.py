@@ -3,14 +3,22 @@ from datetime import datetime
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QProgressBar, 
-                             QTreeWidget, QTreeWidgetItem, QFrame)
-from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal, QRectF
-from PyQt6.QtGui import QFont, QColor, QPainter, QPixmap, QBrush
+                             QTreeView, QFrame)
+from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QFont, QPixmap
+
+from engine.activity_model import ActivityModel
+from engine.actuators import Actuators
+from engine.charts import PieChart
+from engine.clock import Every, Lap
+from engine.daemonfeed import DaemonFeed
+from engine.overmand import OvermandClient
+from engine.speech import Speaker
+from engine.store import Store
 
 # --- CONSTANTS & PERSISTENCE ---
 DATA_DIR = Path.home() / ".local/share/overman"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
-HISTORY_FILE = DATA_DIR / "history.json"
 TEMP_IMG = "/tmp/overman_audit.png"
 BANNED = ["porn", "sex", "facebook", "instagram", "tiktok", "reddit", "shorts", "reels"]
 CHALLENGES = {
@@ -23,7 +31,7 @@ STYLE = """
     QWidget { background-color: #050505; color: #00ff00; font-family: 'JetBrains Mono', 'Impact'; }
     QLineEdit { border: 1px solid #00ff00; background: #111; padding: 5px; color: #00ff00; }
     QPushButton { background: #00ff00; color: #050505; border: none; font-weight: bold; padding: 10px; }
-    QTreeWidget { border: 1px solid #00ff00; background: #050505; }
+    QTreeView { border: 1px solid #00ff00; background: #050505; }
     QProgressBar { border: 1px solid #00ff00; background: #050505; text-align: center; }
     QProgressBar::chunk { background-color: #00ff00; }
 """
@@ -47,12 +55,15 @@ class Session:
 class Warden(QThread):
     audit_sig = pyqtSignal()
     tick_sig = pyqtSignal()
+    logged = pyqtSignal(str, str, float)
 
     def run(self):
-        last_audit = time.time()
-        drift_start = None
+        lap = Lap() # Seconds since the last poll, however long hyprctl took
+        audit_due = Every(600)
+        drift_start, warned = None, False
         while True:
             time.sleep(2)
+            dt = lap()
             try:
                 win = json.loads(subprocess.check_output(["hyprctl", "activewindow", "-j"]))
                 app = win.get("class", "").lower()
@@ -60,44 +71,38 @@ class Warden(QThread):
                 
                 # Kill Switch
                 if any(x in app or x in title for x in BANNED):
-                    subprocess.run(["hyprctl", "dispatch", "closewindow", f"class:{app}"])
+                    actuators.close_window(f"class:{app}")
+                    store.add_violation(app, title, next(x for x in BANNED if x in app or x in title),
+                                        "closewindow")
                     continue
 
                 # Logging
                 if app not in session.logs: session.logs[app] = {}
-                session.logs[app][title] = session.logs[app].get(title, 0) + 2
+                session.logs[app][title] = session.logs[app].get(title, 0) + dt
+                self.logged.emit(app, title, dt)
 
                 # Drift Logic
                 if app not in session.whitelist and "python" not in app:
-                    session.drift_seconds += 2
-                    if drift_start is None: drift_start = time.time()
-                    elapsed_drift = time.time() - drift_start
+                    session.drift_seconds += dt
+                    if drift_start is None: drift_start, warned = lap.last, False
+                    elapsed_drift = lap.last - drift_start
                     
-                    if 60 <= elapsed_drift < 62:
-                        subprocess.Popen(["espeak-ng", "Samidu, return to your goal."])
+                    if elapsed_drift >= 60 and not warned:
+                        warned = True
+                        speaker.say("Samidu, return to your goal.")
                     if elapsed_drift > 300:
-                        subprocess.run(["brightnessctl", "s", "10%"])
+                        actuators.brightness(10)
                 else:
-                    if drift_start: subprocess.run(["brightnessctl", "s", "100%"])
+                    if drift_start: actuators.brightness(100)
                     drift_start = None
 
-                if time.time() - last_audit > 600:
+                if audit_due():
                     self.audit_sig.emit()
-                    last_audit = time.time()
                 
                 self.tick_sig.emit()
             except: pass
 
 # --- UI COMPONENTS ---
-class WillpowerPie(QWidget):
-    def paintEvent(self, event):
-        p = QPainter(self)
-        ratio = session.get_focus_ratio()
-        p.setBrush(QBrush(QColor("#ff0000")))
-        p.drawPie(QRectF(10, 10, 80, 80), 0, 16 * 360)
-        p.setBrush(QBrush(QColor("#00ff00")))
-        p.drawPie(QRectF(10, 10, 80, 80), 90 * 16, int(ratio * 3.6 * 16))
-
 class Dashboard(QWidget):
     def __init__(self):
         super().__init__()
@@ -105,6 +110,7 @@ class Dashboard(QWidget):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setProperty("class", "overman-dashboard")
         self.setStyleSheet(STYLE)
+        self.hist_avg = None
         self.init_ui()
 
     def init_ui(self):
@@ -113,8 +119,8 @@ class Dashboard(QWidget):
         # Sidebar
         side = QVBoxLayout()
         self.shame = QLabel()
-        self.pie = WillpowerPie()
-        self.pie.setFixedSize(100, 100)
+        self.pie = PieChart("WILLPOWER", background="#050505")
+        self.pie.setFixedSize(240, 200)
         
         # Comparative Analytics
         self.compare = QLabel("Loading historical data...")
@@ -131,8 +137,12 @@ class Dashboard(QWidget):
         side.addWidget(btn_end)
 
         # Tree
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Target", "Time"])
+        self.tree_model = ActivityModel(["Target", "Time"], title_chars=40)
+        self.tree_model.rowsInserted.connect(
+            lambda parent, first, last: parent.isValid() and self.tree.expand(parent))
+        self.tree = QTreeView()
+        self.tree.setUniformRowHeights(True)  # relayouts need not measure each row
+        self.tree.setModel(self.tree_model)
         
         layout.addLayout(side, 1)
         layout.addWidget(self.tree, 2)
@@ -143,32 +153,24 @@ class Dashboard(QWidget):
         loss = (session.drift_seconds / 3600) * 2.5
         self.shame.setText(f"INTELLECT: 97%\nCONSCIENTIOUSNESS: 43%\nWILLPOWER: {ratio}%\nPOTENTIAL LOSS: -{loss:.2f}")
         
-        # Load Comparison
-        if HISTORY_FILE.exists():
-            with open(HISTORY_FILE, 'r') as f:
-                hist = json.load(f)
-                avg = sum(x['ratio'] for x in hist[-10:]) / len(hist[-10:]) if hist else 0
-                diff = ratio - avg
-                color = "#00ff00" if diff >= 0 else "#ff0000"
-                self.compare.setText(f"10-DAY AVG: {avg:.1f}%\nTREND: {diff:+.1f}%")
-                self.compare.setStyleSheet(f"color: {color};")
+        # Comparison against past sessions (loaded once from the store)
+        if self.hist_avg is None:
+            hist = store.sessions(10)
+            self.hist_avg = sum(x['ratio'] for x in hist) / len(hist) if hist else 0
+        diff = ratio - self.hist_avg
+        color = "#00ff00" if diff >= 0 else "#ff0000"
+        self.compare.setText(f"10-DAY AVG: {self.hist_avg:.1f}%\nTREND: {diff:+.1f}%")
+        self.compare.setStyleSheet(f"color: {color};")
 
-        self.tree.clear()
-        for app, titles in session.logs.items():
-            node = QTreeWidgetItem([app, ""])
-            for t, s in titles.items(): QTreeWidgetItem(node, [t[:40], f"{s}s"])
-            self.tree.addTopLevelItem(node)
-        self.tree.expandAll()
-        self.pie.update()
+        self.pie.set_slices([("FOCUS", ratio, "#00ff00"), ("DRIFT", 100 - ratio, "#ff0000")])
 
     def generate_report(self):
-        # Save History
-        entry = {"date": str(datetime.now()), "ratio": session.get_focus_ratio(), "goal": session.goal}
-        hist = []
-        if HISTORY_FILE.exists():
-            with open(HISTORY_FILE, 'r') as f: hist = json.load(f)
-        hist.append(entry)
-        with open(HISTORY_FILE, 'w') as f: json.dump(hist, f)
+        # Save History (the daemon computes its own ratio)
+        if daemon:
+            daemon.request("end")
+        else:
+            store.end_session(session.get_focus_ratio())
+        store.close()
 
         # Generate HTML
         img_b64 = ""
@@ -219,7 +221,7 @@ class Lockout(QWidget):
         if CHALLENGES[self.q] in self.ans.text().lower():
             self.callback(); self.close()
         else:
-            subprocess.Popen(["espeak-ng", "Incorrect. Kill the worm."])
+            speaker.say("Incorrect. Kill the worm.")
 
 class Overlay(QWidget):
     def __init__(self):
@@ -254,20 +256,54 @@ class Architect(QWidget):
         session.goal = self.g.text()
         session.duration = int(self.t.text() or 60)
         session.whitelist = [x.strip() for x in self.w.text().split(",")]
+        if daemon:
+            daemon.request("start", goal=session.goal, duration=session.duration,
+                           allowed=session.whitelist)
+        else:
+            store.start_session(session.goal, session.duration)
         self.close()
 
+def follow(feed, dash, ov):
+    """Thin-client mode: overmand tracks, enforces and stores; mirror its spans and ticks."""
+    def span(app, title, status, dt):
+        titles = session.logs.setdefault(app, {})
+        titles[title] = titles.get(title, 0) + dt
+        if status == "Drifting":
+            session.drift_seconds += dt
+        dash.tree_model.add(app, title, dt)
+    def lockout(path, detected):
+        dash.lockout = Lockout(lambda: None) # kept alive until the next one
+    feed.data_signal.connect(span)
+    feed.snapshot_signal.connect(lambda snap: (dash.refresh(), ov.update_bar()))
+    feed.lockout_signal.connect(lockout)
+
 # --- MAIN ---
 session = Session()
+store = Store()
+actuators = Actuators()
+speaker = Speaker(voice="en", speed=175)
+speaker.warm("Samidu, return to your goal.")
+daemon = None # OvermandClient while a running overmand serves this frontend
 if __name__ == "__main__":
     os.environ["QT_QPA_PLATFORM"] = "wayland"
     app = QApplication(sys.argv)
+    daemon = OvermandClient()
+    if not daemon.available():
+        daemon = None
     
     arch = Architect(); arch.show(); app.exec()
     
     dash = Dashboard(); dash.show()
     ov = Overlay()
     
+    if daemon:
+        feed = DaemonFeed(daemon)
+        follow(feed, dash, ov)
+        feed.start()
+        sys.exit(app.exec())
+    
     warden = Warden()
+    warden.logged.connect(dash.tree_model.add)
     warden.tick_sig.connect(dash.refresh)
     warden.tick_sig.connect(ov.update_bar)
     warden.audit_sig.connect(lambda: Lockout(lambda: None))
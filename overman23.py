@@ -6,14 +6,21 @@ from email.mime.image import MIMEImage
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QProgressBar, 
                              QTreeWidget, QTreeWidgetItem, QFrame)
-from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal, QPoint
-from PyQt6.QtGui import QFont, QColor, QPainter, QPixmap, QPen
+from PyQt6.QtCore import QLineF, QPointF, QTimer, Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QPainter, QPixmap, QPen, QTransform
+
+from engine.actuators import Actuators
+from engine.clock import Every, Lap, crossed
+from engine.history import FocusHistory, lttb
+from engine.speech import Speaker
 
 # --- STYLING CONSTANTS (VOID MINIMALISM) ---
 BG_COLOR = "#000000"
 ACCENT_COLOR = "#00FF00" # Cyber Lime
 ERR_COLOR = "#FF0000"
 FONT_PRIMARY = "JetBrains Mono"
+HISTORY_HOURS = 24 # Focus history kept (one sample per 2s tick)
+GRAPH_SAMPLES = 100 # Willpower graph horizon at start: the newest samples drawn (100 = 200s)
 
 QSS = f"""
     QWidget {{ background-color: {BG_COLOR}; color: {ACCENT_COLOR}; font-family: '{FONT_PRIMARY}'; border: 1px solid {ACCENT_COLOR}; }}
@@ -35,46 +42,134 @@ class SessionData:
         self.email_pass = ""
         self.start_time = datetime.now()
         self.logs = {} # {app: {title: sec}}
-        self.history = [] # List of (timestamp, is_focused) for the graph
+        self.history = FocusHistory(HISTORY_HOURS * 3600 // 2) # (timestamp, is_focused) ring buffer
         self.total_drift = 0
         self.is_locked = False
         self.last_screenshot = "/tmp/audit.png"
 
 session = SessionData()
+actuators = Actuators() # Only issues brightnessctl when the level changes
+speaker = Speaker(voice="en", speed=175)
 
 # --- LIGHTWEIGHT CUSTOM GRAPH WIDGET ---
 class WillpowerGraph(QWidget):
-    def __init__(self):
+    """
+    The flux line is cached as line segments in sample coordinates (x =
+    sample index, y = 0/1) and mapped onto the widget at paint time. They are
+    drawn as separate lines in widget coordinates: an antialiased, joined
+    path (or any painter transform) on a 0/1 zigzag costs tens of ms a frame.
+    Only the newest `visible` samples are shown; the mouse wheel zooms that
+    horizon out to the whole history (a day) and back, double-click resets
+    it. New samples are appended to the cached segments; they are only
+    rebuilt on resize, once a bucket's worth of old samples has scrolled out
+    of view, or (past one sample per pixel column) when LTTB has a full new
+    bucket to place.
+    """
+    def __init__(self, history, visible=GRAPH_SAMPLES):
         super().__init__()
         self.setMinimumHeight(150)
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+        self.history = history
+        self.visible = visible
+        self.grid = None
+        self.segments = []    # QLineF in sample coordinates
+        self.tail = None      # end point of the last segment
+        self.path_start = 0   # index of the first sample in the segments
+        self.path_end = 0     # one past the last sample in the segments
+        self.sampled_end = 0  # path_end when LTTB last ran (0: raw samples)
+        self.pen = QPen(QColor(ACCENT_COLOR), 2)
+        self.initial = visible
+
+    def set_visible(self, n):
+        """Show the newest `n` samples (clamped to 10 .. the history's capacity)."""
+        n = int(min(max(n, 10), self.history.capacity))
+        if n != self.visible:
+            self.visible = n
+            self.path_end = 0 # rebuild at the new scale
+            self.update()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps: self.set_visible(self.visible * 2 ** -steps) # up: zoom in, down: out
+
+    def mouseDoubleClickEvent(self, event):
+        self.set_visible(self.initial)
+
+    def resizeEvent(self, event):
+        self.grid = None
+        self.path_end = 0
+        super().resizeEvent(event)
+
+    def draw_grid(self):
+        self.grid = QPixmap(self.size())
+        self.grid.fill(Qt.GlobalColor.transparent)
         w, h = self.width(), self.height()
+        painter = QPainter(self.grid)
         painter.setPen(QPen(QColor(ACCENT_COLOR), 1))
-        
-        # Draw Grid lines
         painter.setOpacity(0.1)
         for i in range(0, w, 40): painter.drawLine(i, 0, i, h)
         for i in range(0, h, 20): painter.drawLine(0, i, w, i)
-        painter.setOpacity(1.0)
+        painter.end()
 
-        if not session.history: return
-        
-        # Draw Willpower Flux (Line Graph)
-        path_pen = QPen(QColor(ACCENT_COLOR), 2)
-        painter.setPen(path_pen)
-        
-        step = w / max(len(session.history), 1)
-        points = []
-        for i, (ts, status) in enumerate(session.history):
-            y = 20 if status else h - 20
-            points.append(QPoint(int(i * step), int(y)))
-            
-        for i in range(len(points) - 1):
-            painter.drawLine(points[i], points[i+1])
+    def view_first(self):
+        """Index of the oldest sample in view."""
+        return max(self.history.first, self.history.total - self.visible)
+
+    def sync(self):
+        history, columns = self.history, max(self.width(), 3)
+        view = self.view_first()
+        n = history.total - view
+        bucket = max(n / columns, 1)
+        if self.path_end and view - self.path_start < bucket:
+            # Samples that left the view are scrolled off the left edge
+            if n <= columns or history.total - self.sampled_end < bucket:
+                _, _, values = history.since(self.path_end)
+                for i, v in enumerate(values, self.path_end):
+                    self._extend(QPointF(i, v))
+                self.path_end = history.total
+                return
+        first, _, values = history.since(view)
+        xs = range(first, first + len(values))
+        if len(values) > columns:
+            xs, values = lttb(xs, values, columns)
+            self.sampled_end = history.total
+        else:
+            self.sampled_end = 0
+        self.segments, self.tail = [], None
+        for x, v in zip(xs, values):
+            self._extend(QPointF(x, v))
+        self.path_start, self.path_end = first, history.total
+
+    def _extend(self, point):
+        if self.tail is not None:
+            self.segments.append(QLineF(self.tail, point))
+        self.tail = point
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Grid lines (cached per size)
+        if self.grid is None: self.draw_grid()
+        painter.drawPixmap(0, 0, self.grid)
+
+        if not self.history: return
+
+        # Willpower Flux: focused samples at y=20, drift at h-20
+        self.sync()
+        w, h = self.width(), self.height()
+        view = self.view_first()
+        step = w / max(self.history.total - view, 1)
+        to_widget = QTransform(step, 0, 0, -(h - 40), -view * step, h - 20)
+        painter.setPen(self.pen)
+        if self.segments: painter.drawLines([to_widget.map(s) for s in self.segments])
+        elif self.tail is not None: painter.drawPoint(to_widget.map(self.tail))
+
+        # Horizon actually in view, from the sample timestamps
+        span = self.history.at(self.history.total - 1)[0] - self.history.at(view)[0]
+        label = f"{span / 3600:.1f}h" if span >= 3600 else f"{span / 60:.0f}m" if span >= 60 else f"{span:.0f}s"
+        painter.setOpacity(0.6)
+        painter.drawText(self.rect().adjusted(0, 4, -8, 0),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, label)
 
 # --- BACKGROUND WARDEN ---
 class Warden(QThread):
@@ -82,9 +177,11 @@ class Warden(QThread):
     audit_required = pyqtSignal()
 
     def run(self):
-        last_audit = time.time()
+        lap = Lap() # Seconds since the last poll, however long hyprctl took
+        audit_due = Every(600) # 10 min audit
         while True:
             time.sleep(2)
+            dt = lap()
             win = self.get_win()
             if not win: continue
             
@@ -93,24 +190,22 @@ class Warden(QThread):
             
             # Monitoring logic
             is_focused = app in session.whitelist or "python3" in app
-            session.history.append((time.time(), is_focused))
-            if len(session.history) > 100: session.history.pop(0)
+            session.history.append(time.time(), is_focused)
 
             if app not in session.logs: session.logs[app] = {}
-            session.logs[app][title] = session.logs[app].get(title, 0) + 2
+            session.logs[app][title] = session.logs[app].get(title, 0) + dt
 
             if not is_focused:
-                session.total_drift += 2
-                if session.total_drift % 60 == 0:
-                    subprocess.Popen(["espeak-ng", f"Focus Samidu. {app} is not allowed."])
+                session.total_drift += dt
+                if crossed(session.total_drift - dt, session.total_drift, 60): # every drifted minute
+                    speaker.say(f"Focus Samidu. {app} is not allowed.")
                 if session.total_drift > 300: # 5 mins total drift
-                    subprocess.run(["brightnessctl", "s", "5%"])
+                    actuators.brightness(5)
             else:
-                subprocess.run(["brightnessctl", "s", "100%"])
+                actuators.brightness(100)
 
-            if time.time() - last_audit > 600: # 10 min audit
+            if audit_due():
                 self.audit_required.emit()
-                last_audit = time.time()
             
             self.update_tick.emit()
 
@@ -144,7 +239,7 @@ class Dashboard(QWidget):
         self.quote.setWordWrap(True)
         self.quote.setStyleSheet("font-style: italic; opacity: 0.7;")
 
-        self.graph = WillpowerGraph()
+        self.graph = WillpowerGraph(session.history)
         
         sidebar.addWidget(self.title)
         sidebar.addWidget(self.stats)
@@ -173,13 +268,13 @@ class Dashboard(QWidget):
     def update_ui(self):
         self.graph.update()
         loss = (session.total_drift / 3600) * 1.5
-        self.stats.setText(f"INTELLECT: 97%\nCONSCIENTIOUSNESS: 43%\nDRIFT: {session.total_drift}s\nPOTENTIAL LOSS: -{loss:.2f} IELTS pts")
+        self.stats.setText(f"INTELLECT: 97%\nCONSCIENTIOUSNESS: 43%\nDRIFT: {session.total_drift:.0f}s\nPOTENTIAL LOSS: -{loss:.2f} IELTS pts")
         
         self.tree.clear()
         for app, titles in session.logs.items():
             parent = QTreeWidgetItem([app, ""])
             for t, s in titles.items():
-                QTreeWidgetItem(parent, [t[:40], f"{s}s"])
+                QTreeWidgetItem(parent, [t[:40], f"{s:.0f}s"])
             self.tree.addTopLevelItem(parent)
         self.tree.expandAll()
 
@@ -214,7 +309,7 @@ class Lockout(QWidget):
             self.callback()
             self.close()
         else:
-            subprocess.Popen(["espeak-ng", "Failure. Try again."])
+            speaker.say("Failure. Try again.")
 
 class Overlay(QWidget):
     def __init__(self):
@@ -10,10 +10,17 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QProgressBar, 
-                             QTreeWidget, QTreeWidgetItem, QFrame)
+                             QTreeView, QFrame)
 from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QColor, QPainter, QPixmap
 
+from engine.activity_model import ActivityModel
+from engine.actuators import Actuators
+from engine.clock import Every, Lap
+from engine.evidence import EvidenceStore
+from engine.imageloader import ImageLoader
+from engine.speech import Speaker
+
 # --- CONFIGURATION & DATA ASSETS ---
 NIETZSCHE_QUOTES = [
     "He who cannot obey himself will be commanded.",
@@ -44,6 +51,8 @@ class SessionData:
         self.is_locked = False
 
 session = SessionData()
+actuators = Actuators()
+evidence = EvidenceStore()
 
 # --- UTILITIES ---
 def get_active_window():
@@ -53,21 +62,26 @@ def get_active_window():
     except:
         return None
 
+speaker = Speaker(voice="en", speed=175)
+
 def speak(text):
-    subprocess.Popen(["espeak-ng", f"'{text}'"])
+    speaker.say(text)
 
 # --- WARDEN THREAD (BACKGROUND ENFORCEMENT) ---
 class WardenThread(QThread):
-    audit_trigger = pyqtSignal()
+    audit_trigger = pyqtSignal(str, float) # screenshot path, monotonic detection time
     update_signal = pyqtSignal()
+    logged = pyqtSignal(str, str, float)
 
     def run(self):
-        last_audit = time.time()
-        drift_start = None
+        lap = Lap() # Seconds since the last poll, however long hyprctl took
+        audit_due = Every(600)
+        drift_start, warned = None, False
         
         while True:
             time.sleep(2)
-            now = time.time()
+            dt = lap()
+            now = lap.last
             win = get_active_window()
             
             if not win or "class" not in win: continue
@@ -77,41 +91,50 @@ class WardenThread(QThread):
 
             # 1. Kill Switch
             if any(k in title or k in app_class for k in BANNED_KEYWORDS):
-                subprocess.run(["hyprctl", "dispatch", "closewindow", f"class:{app_class}"])
+                actuators.close_window(f"class:{app_class}")
                 continue
 
             # 2. Log Tracking
             if app_class not in session.logs: session.logs[app_class] = {}
-            session.logs[app_class][title] = session.logs[app_class].get(title, 0) + 2
+            session.logs[app_class][title] = session.logs[app_class].get(title, 0) + dt
+            self.logged.emit(app_class, title, dt)
 
             # 3. Drift Sentinel
             if app_class not in session.whitelist and app_class != "python3":
-                if drift_start is None: drift_start = now
+                if drift_start is None: drift_start, warned = now, False
                 drift_duration = now - drift_start
-                session.total_drift_seconds += 2
+                session.total_drift_seconds += dt
                 
-                if 60 <= drift_duration < 62:
+                if drift_duration >= 60 and not warned:
+                    warned = True
                     speak(f"Samidu, focus check. You are in {app_class}")
                 elif drift_duration >= 300:
-                    subprocess.run(["brightnessctl", "s", "10%"])
+                    actuators.brightness(10)
             else:
                 if drift_start is not None:
-                    subprocess.run(["brightnessctl", "s", "100%"])
+                    actuators.brightness(100)
                     drift_start = None
 
             # 4. Audit Trigger (10 Mins)
-            if now - last_audit >= 600:
-                self.audit_trigger.emit()
-                last_audit = now
+            if audit_due():
+                evidence.capture(then=lambda ev, t=time.monotonic(): self.captured(ev, t))
             
             self.update_signal.emit()
 
+    def captured(self, ev, detected):
+        if ev:
+            session.last_screenshot_path = ev["path"]
+        self.audit_trigger.emit(ev["path"] if ev else "", detected)
+
 # --- GUI COMPONENTS ---
 
 class LockoutWindow(QWidget):
+    """Built hidden at startup; present() re-arms it for every audit."""
     def __init__(self, callback):
         super().__init__()
         self.callback = callback
+        self.shown_ms = [] # violation -> lockout painted
+        self._since = None
         self.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.FramelessWindowHint)
         self.setProperty("class", "overman-lockout")
         self.init_ui()
@@ -120,30 +143,52 @@ class LockoutWindow(QWidget):
         self.setStyleSheet("background-color: #050505; color: #00ff00; font-family: 'JetBrains Mono';")
         layout = QVBoxLayout()
         
-        # Evidence
-        subprocess.run(["grim", session.last_screenshot_path])
-        img_label = QLabel()
-        pixmap = QPixmap(session.last_screenshot_path)
-        img_label.setPixmap(pixmap.scaled(600, 400, Qt.AspectRatioMode.KeepAspectRatio))
+        # Evidence (decoded off the GUI thread)
+        self.img_label = QLabel()
+        self.img_label.setMinimumSize(600, 400)
+        self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loader = ImageLoader(self)
+        self.loader.loaded.connect(self.show_evidence)
         
-        self.q_key = list(CHALLENGES.keys())[int(time.time()) % len(CHALLENGES)]
-        self.ans = CHALLENGES[self.q_key]
-        
-        label = QLabel(f"EVIDENCE COLLECTED. ACTIVE RECALL REQUIRED:\nDefine: '{self.q_key}'")
-        label.setFont(QFont("JetBrains Mono", 18, QFont.Weight.Bold))
+        self.label = QLabel()
+        self.label.setFont(QFont("JetBrains Mono", 18, QFont.Weight.Bold))
         
         self.input = QLineEdit()
         self.input.returnPressed.connect(self.check_ans)
         
-        layout.addWidget(img_label, alignment=Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(label, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.img_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.label, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.input)
         self.setLayout(layout)
+
+    def present(self, img_path, since=None):
+        self._since = since if since is not None else time.monotonic()
+        self.q_key = list(CHALLENGES.keys())[int(time.time()) % len(CHALLENGES)]
+        self.ans = CHALLENGES[self.q_key]
+        self.label.setText(f"EVIDENCE COLLECTED. ACTIVE RECALL REQUIRED:\nDefine: '{self.q_key}'")
+        self.input.clear()
+        self.img_label.clear()
+        self.img_label.setText("LOADING EVIDENCE...")
+        self.loader.load(img_path, 600, 400)
         self.showFullScreen()
+        self.raise_()
+        self.activateWindow()
+        self.input.setFocus()
+
+    def show_evidence(self, token, image):
+        if token != self.loader.latest: return
+        if image.isNull(): self.img_label.setText("")
+        else: self.img_label.setPixmap(QPixmap.fromImage(image))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._since is not None:
+            self.shown_ms.append((time.monotonic() - self._since) * 1000)
+            self._since = None
 
     def check_ans(self):
         if self.input.text().lower().strip() == self.ans.lower().strip():
-            self.close()
+            self.hide()
             self.callback()
         else:
             speak("Incorrect.")
@@ -221,9 +266,11 @@ class Dashboard(QWidget):
         sidebar.addWidget(report_btn)
 
         # Tree
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Activity", "Time"])
-        self.tree.setStyleSheet("QTreeWidget { background: #050505; border: 1px solid #00ff00; }")
+        self.tree_model = ActivityModel(["Activity", "Time"], title_chars=30)
+        self.tree = QTreeView()
+        self.tree.setUniformRowHeights(True)  # relayouts need not measure each row
+        self.tree.setModel(self.tree_model)
+        self.tree.setStyleSheet("QTreeView { background: #050505; border: 1px solid #00ff00; }")
 
         main_layout.addLayout(sidebar, 1)
         main_layout.addWidget(self.tree, 2)
@@ -232,16 +279,7 @@ class Dashboard(QWidget):
     def update_stats(self):
         loss = (session.total_drift_seconds / 3600) * 0.5 # Arbitrary "Potential Loss"
         self.shame.setText(f"INTELLECT: 97th %\nCONSCIENTIOUSNESS: 43% (FAILURE)\nIELTS POTENTIAL LOSS: -{loss:.2f}")
-        
-        self.tree.clear()
-        for app, titles in session.logs.items():
-            parent = QTreeWidgetItem([app, ""])
-            total_app_time = 0
-            for title, sec in titles.items():
-                QTreeWidgetItem(parent, [title[:30], f"{sec}s"])
-                total_app_time += sec
-            parent.setText(1, f"{total_app_time}s")
-            self.tree.addTopLevelItem(parent)
+
 
     def send_report(self):
         try:
@@ -282,12 +320,16 @@ if __name__ == "__main__":
     dash = Dashboard()
     overlay = Overlay()
     
-    def trigger_audit():
+    # Lockout is built once, hidden, and reused for every audit
+    dash.audit_win = LockoutWindow(lambda: setattr(session, 'is_locked', False))
+    
+    def trigger_audit(path, detected):
         session.is_locked = True
-        dash.audit_win = LockoutWindow(lambda: setattr(session, 'is_locked', False))
+        dash.audit_win.present(path, detected)
     
     warden = WardenThread()
     warden.audit_trigger.connect(trigger_audit)
+    warden.logged.connect(dash.tree_model.add)
     warden.update_signal.connect(dash.update_stats)
     warden.update_signal.connect(overlay.update_bar)
     warden.start()
@@ -2,18 +2,26 @@ import sys
 import json
 import subprocess
 import time
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QTextEdit, QPushButton, 
                              QProgressBar, QStackedWidget)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QRect
 from PyQt6.QtGui import QFont, QColor, QPalette, QPixmap
 
+from engine import startup
+from engine.actuators import Actuators
+from engine.charts import BarChart, PieChart, last_items
+from engine.clock import Every, Lap
+from engine.keywords import KeywordMatcher
+from engine.speech import Speaker
+
 # --- CONFIGURATION & CONSTANTS ---
 MANTRA = "i command myself"
 KILL_KEYWORDS = ["porn", "xxx", "facebook", "instagram", "tiktok", "reddit"]
+KILL_MATCHER = KeywordMatcher(KILL_KEYWORDS)
+actuators = startup.Deferred(Actuators) # built when the warden first needs them
+speaker = startup.Deferred(Speaker, voice="en", speed=175)
+WARM_PHRASES = ("Focus check. You are drifting.",)
 BRUTAL_DARK = "#0d0d0d"
 ACCENT_RED = "#ff4444"
 ACCENT_GREEN = "#00ff41" # Matrix green
@@ -34,13 +42,14 @@ class WardenThread(QThread):
         self.app_logs = {} # RAM-only storage
 
     def run(self):
-        audit_counter = 0
+        lap = Lap() # Seconds since the last poll, however long hyprctl took
+        audit_due = Every(600) # 10 Minutes
         drift_warning_counter = 0
         
         while self.is_running and self.elapsed_seconds < self.total_seconds:
             time.sleep(2)
-            self.elapsed_seconds += 2
-            audit_counter += 2
+            dt = lap()
+            self.elapsed_seconds += dt
             
             # Get Active Window via Hyprland
             try:
@@ -53,8 +62,8 @@ class WardenThread(QThread):
                 window_title = "unknown"
 
             # 1. Kill Protocol
-            if any(key in window_title for key in KILL_KEYWORDS):
-                subprocess.run(["hyprctl", "dispatch", "closewindow", f"class:{window_class}"])
+            if KILL_MATCHER.search(window_title):
+                actuators.close_window(f"class:{window_class}")
                 continue
 
             # 2. Drift Detection
@@ -62,29 +71,28 @@ class WardenThread(QThread):
             is_allowed = any(a in window_class for a in self.allowed_apps)
 
             if (is_browser and not is_allowed) or (not is_allowed and window_class != ""):
-                self.drift_time += 2
-                drift_warning_counter += 2
+                self.drift_time += dt
+                drift_warning_counter += dt
                 if drift_warning_counter >= 60:
-                    subprocess.Popen(["espeak-ng", "Focus check. You are drifting."])
+                    speaker.say("Focus check. You are drifting.")
                     drift_warning_counter = 0
             else:
-                self.focus_time += 2
+                self.focus_time += dt
                 drift_warning_counter = 0
 
             # Log app usage
-            self.app_logs[window_class] = self.app_logs.get(window_class, 0) + 2
+            self.app_logs[window_class] = self.app_logs.get(window_class, 0) + dt
 
             # 3. Audit Loop (10 Minutes)
-            if audit_counter >= 600:
+            if audit_due():
                 self.audit_signal.emit()
-                audit_counter = 0
 
             # Update UI
             self.update_stats.emit({
                 "focus": self.focus_time,
                 "drift": self.drift_time,
                 "logs": self.app_logs,
-                "remaining": self.total_seconds - self.elapsed_seconds
+                "remaining": max(0, int(self.total_seconds - self.elapsed_seconds))
             })
 
 class Architect(QWidget):
@@ -171,34 +179,22 @@ class ShameEngine(QWidget):
             lbl.setStyleSheet(f"color: {color};")
             self.stats_panel.addWidget(lbl)
         
-        # Right Panel: Live Charts
-        self.figure, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(5, 8))
-        self.figure.patch.set_facecolor(BRUTAL_DARK)
-        self.canvas = FigureCanvas(self.figure)
+        # Right Panel: Live Charts (repainted only when the totals change)
+        self.charts = QVBoxLayout()
+        self.pie = PieChart("SESSION WILL", background=BRUTAL_DARK)
+        self.bars = BarChart("RESOURCE ALLOCATION", color=ACCENT_GREEN, background=BRUTAL_DARK)
+        self.charts.addWidget(self.pie)
+        self.charts.addWidget(self.bars)
         
         self.layout.addLayout(self.stats_panel)
-        self.layout.addWidget(self.canvas)
+        self.layout.addLayout(self.charts)
         self.setLayout(self.layout)
 
     def refresh_charts(self, data):
-        self.ax1.clear()
-        self.ax2.clear()
-        
-        # Pie Chart
-        labels = ['Focus', 'Drift']
-        sizes = [data['focus'], data['drift']]
-        self.ax1.pie(sizes, labels=labels, colors=[ACCENT_GREEN, ACCENT_RED], autopct='%1.1f%%', textprops={'color':"w"})
-        self.ax1.set_title("SESSION WILL", color="white")
-        
-        # Bar Chart
-        apps = list(data['logs'].keys())[-5:]
-        times = list(data['logs'].values())[-5:]
-        self.ax2.barh(apps, times, color=ACCENT_GREEN)
-        self.ax2.set_title("RESOURCE ALLOCATION", color="white")
-        self.ax2.tick_params(axis='x', colors='white')
-        self.ax2.tick_params(axis='y', colors='white')
-        
-        self.canvas.draw()
+        self.pie.set_slices([("Focus", data['focus'], ACCENT_GREEN), ("Drift", data['drift'], ACCENT_RED)])
+        # Last five apps seen, without copying the whole log every tick; newest on
+        # top, as matplotlib's barh drew them (it stacks the first item at the bottom)
+        self.bars.set_bars(last_items(data['logs'], 5)[::-1])
 
 class AuditLockout(QWidget):
     def __init__(self, unlock_callback):
@@ -269,7 +265,11 @@ class OvermanProtocol:
         self.dashboard.refresh_charts(data)
 
 if __name__ == "__main__":
+    if startup.requested():
+        sys.exit(startup.profile(__file__, sys.argv[1:]))
     app = QApplication(sys.argv)
     app.setApplicationName("overman")
     protocol = OvermanProtocol()
+    startup.first_window(protocol.architect)
+    startup.after_paint(protocol.architect, lambda: speaker.warm(*WARM_PHRASES))
     sys.exit(app.exec())
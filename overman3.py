@@ -13,6 +13,8 @@ from PyQt6.QtGui import QFont, QPixmap
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from engine.speech import NORMAL, URGENT, Speaker
+
 # --- CONFIGURATION ---
 BASE_DIR = os.path.expanduser("~/.local/share/overman")
 SCREENSHOT_DIR = os.path.join(BASE_DIR, "temp_evidence")
@@ -38,8 +40,11 @@ FORBIDDEN = ["porn", "xxx", "sex", "facebook", "twitter", "instagram", "tiktok",
 # DRIFT APPS (Allowed briefly, but trigger voice alarms if focused too long)
 DRIFT_APPS = ["firefox", "brave", "chrome", "chromium", "discord", "thorium"]
 
-def speak(text):
-    subprocess.Popen(["espeak-ng", "-s", "175", "-v", "en-us", text], stderr=subprocess.DEVNULL)
+speaker = Speaker(speed=175)
+speaker.warm("Close the browser. Return to the goal.")
+
+def speak(text, priority=NORMAL):
+    speaker.say(text, priority)
 
 class WardenThread(QThread):
     lockout_trigger = pyqtSignal(str)
@@ -102,7 +107,7 @@ class WardenThread(QThread):
                 pass
 
     def trigger_audit(self, reason):
-        speak(f"{reason}. Prove your focus.")
+        speak(f"{reason}. Prove your focus.", URGENT)
         path = os.path.join(SCREENSHOT_DIR, "evidence.png")
         subprocess.run(["grim", path])
         self.lockout_trigger.emit(path)
@@ -7,10 +7,10 @@ Based on Nietzschean philosophy and deliberate practice principles
 
 import sys
 import os
-import json
+import atexit
+import time
 import random
 import subprocess
-import shutil
 from datetime import datetime
 from collections import defaultdict
 from pathlib import Path
@@ -18,26 +18,39 @@ from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QProgressBar, QFrame, QPushButton, QTextEdit,
-    QTabWidget, QTreeWidget, QTreeWidgetItem
+    QTabWidget, QTreeView
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QPixmap, QPalette, QColor
 
+from engine.activity_model import ActivityModel
+from engine.actuators import Actuators
+from engine.clock import wall
+from engine.daemonfeed import DaemonFeed
+from engine.evidence import EvidenceStore
+from engine.imageloader import ImageLoader
+from engine.hypr import EventStream, FocusTracker, HyprlandClient, active_window
+from engine.keywords import KeywordMatcher
+from engine.overmand import OvermandClient
+from engine.speech import NORMAL, URGENT, Speaker
+from engine.intervals import IntervalLog
+from engine.store import Store
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 BASE_DIR = Path.home() / ".local/share/overman"
 SCREENSHOT_DIR = BASE_DIR / "screenshots"
-DATA_FILE = BASE_DIR / "session_log.csv"
 
-# Clean slate each session
-if BASE_DIR.exists():
-    shutil.rmtree(BASE_DIR)
-SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
+store = Store()
+actuators = Actuators()
+# Audit captures: content-addressed, pruned by size/age instead of wiped per run
+evidence = EvidenceStore(str(SCREENSHOT_DIR))
 
 # Forbidden keywords (immediate kill)
 FORBIDDEN = ["porn", "xxx", "sex", "pornhub", "xvideos", "facebook", 
              "twitter", "instagram", "tiktok", "reddit", "9gag"]
+FORBIDDEN_MATCHER = KeywordMatcher(FORBIDDEN)
 
 # Drift apps (trigger warnings)
 DRIFT_APPS = ["firefox", "brave", "chrome", "chromium", "discord", "thorium"]
@@ -60,105 +73,150 @@ MANTRAS = ["overcome myself", "i am a bridge", "command the beast",
            "will to power", "kill the worm", "harness the drive"]
 
 
-def speak(text):
-    """Voice output using espeak-ng"""
-    try:
-        subprocess.Popen(
-            ["espeak-ng", "-s", "170", "-v", "en-us", text],
-            stderr=subprocess.DEVNULL
-        )
-    except:
-        pass
+speaker = Speaker(speed=170)
+speaker.warm("Protocol violation. The animal has taken over.",
+             "Close the browser. Return to the goal.")
+
+def speak(text, priority=NORMAL):
+    """Voice output through the shared espeak-ng worker"""
+    speaker.say(text, priority)
 
 
 # ==========================================
 # WARDEN THREAD (Background Monitor)
 # ==========================================
 class WardenThread(QThread):
-    lockout_signal = pyqtSignal(str)  # Screenshot path
-    data_signal = pyqtSignal(str, str, str)  # app, title, status
+    lockout_signal = pyqtSignal(str, float)  # Screenshot path, monotonic detection time
+    data_signal = pyqtSignal(str, str, str, float)  # app, title, status, seconds
     
     def __init__(self, allowed_apps):
         super().__init__()
         self.allowed = [a.strip().lower() for a in allowed_apps if a.strip()]
         self.running = True
+        self.intervals = IntervalLog(on_close=store.add_interval)
+        atexit.register(self.intervals.close)
     
     def run(self):
-        audit_timer = 0
-        drift_timer = 0
-        
         while self.running:
-            self.msleep(2000)  # Check every 2 seconds
-            audit_timer += 2
+            try:
+                self.watch(EventStream(timeout=2.0, clock=time.monotonic))
+            except OSError as e:
+                print(f"Warden error: {e}")
+                self.msleep(2000)
+    
+    def watch(self, stream):
+        """Event-driven loop over Hyprland's socket2; reports every 2 seconds"""
+        hypr = HyprlandClient()
+        tracker = FocusTracker()
+        now = time.monotonic()  # spans, drift and audits on the monotonic clock
+        tracker.start(now, active_window(hypr))
+        last_audit = mark = now
+        drift_start = None
+        killed = None
+        
+        for event in stream:
+            if not self.running:
+                break
+            now = time.monotonic()
+            
+            if event:
+                span = tracker.feed(*event)
+                if span:
+                    # Settle the time owed to the window that just lost focus
+                    win, _, end = span
+                    if win and end > mark:
+                        self.report(win, mark, end)
+                    mark = max(mark, end)
             
             try:
-                # Get Hyprland window data
-                result = subprocess.run(
-                    ["hyprctl", "activewindow", "-j"],
-                    capture_output=True, text=True
-                )
-                data = json.loads(result.stdout)
-                
-                app_class = data.get("class", "").lower()
-                title = data.get("title", "").lower()
-                address = data.get("address", "")
+                win = tracker.focused
                 
                 # IMMEDIATE KILL PROTOCOL
-                if any(k in title or k in app_class for k in FORBIDDEN):
-                    subprocess.run(
-                        ["hyprctl", "dispatch", "closewindow", f"address:{address}"]
-                    )
+                if win and win.address and win.address != killed and \
+                        FORBIDDEN_MATCHER.search(win.title, win.cls):
+                    killed = win.address
+                    actuators.close_window(f"address:{win.address}")
+                    store.add_violation(win.cls, win.title,
+                                        FORBIDDEN_MATCHER.search(win.title, win.cls), "closewindow")
                     self.trigger_audit("VIOLATION DETECTED")
-                    speak("Protocol violation. The animal has taken over.")
+                    speak("Protocol violation. The animal has taken over.", URGENT)
                     continue
                 
                 # 10-MINUTE AUDIT LOOP
-                if audit_timer >= 600:
+                if now - last_audit >= 600:
                     self.trigger_audit("10 MINUTE AUDIT")
-                    audit_timer = 0
+                    last_audit = now
                 
                 # DRIFT DETECTION
+                app_class = win.cls if win else ""
                 is_allowed = any(w in app_class for w in self.allowed)
                 is_drift_app = any(d in app_class for d in DRIFT_APPS)
                 
-                status = "Productive" if is_allowed else "Drifting"
-                
                 if not is_allowed and is_drift_app:
-                    drift_timer += 2
-                    if drift_timer == 60:
+                    if drift_start is None:
+                        drift_start, nagged = tracker.since, now
+                        warned = False
+                    drift = now - drift_start
+                    if drift >= 60 and not warned:
+                        warned = True
                         speak(f"Focus check. You are in {app_class}.")
-                    elif drift_timer > 120:
+                    elif drift > 120 and now - nagged >= 2:
+                        nagged = now
                         speak("Close the browser. Return to the goal.")
                 else:
-                    drift_timer = 0
-                
-                # Send data update
-                self.data_signal.emit(app_class or "idle", title, status)
+                    drift_start = None
                 
-                # Log to CSV
-                with open(DATA_FILE, 'a') as f:
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"{timestamp},{app_class},{title},{status}\n")
+                # Periodic report for the focused window
+                if now - mark >= 2:
+                    if win:
+                        self.report(win, mark, now)
+                    mark = now
                 
             except Exception as e:
                 print(f"Warden error: {e}")
     
+    def report(self, win, start, end):
+        app_class = win.cls
+        is_allowed = any(w in app_class for w in self.allowed)
+        status = "Productive" if is_allowed else "Drifting"
+        
+        # Send data update
+        self.data_signal.emit(app_class or "idle", win.title, status, end - start)
+        
+        # Extend the focus interval; the row is written once focus moves on
+        offset = wall(0.0)  # monotonic span -> stored timestamps
+        self.intervals.add(round(offset + start, 3), round(offset + end, 3), app_class, win.title, status)
+    
     def trigger_audit(self, reason):
+        detected = time.monotonic()
         speak(f"{reason}. Audit initiated.")
-        screenshot_path = SCREENSHOT_DIR / f"audit_{int(datetime.now().timestamp())}.png"
-        subprocess.run(["grim", str(screenshot_path)])
-        self.lockout_signal.emit(str(screenshot_path))
+        ts = time.time()
+        
+        def captured(ev):
+            path = ev["path"] if ev else ""
+            store.add_audit(reason, path or None, ts)
+            self.lockout_signal.emit(path, detected)
+        
+        evidence.capture(then=captured)
 
 
 # ==========================================
 # LOCKOUT WINDOW (The Audit)
 # ==========================================
 class LockoutWindow(QMainWindow):
-    def __init__(self, img_path):
+    """
+    Built hidden once and re-shown by present() for every audit. The
+    screenshot is decoded off the GUI thread, so the window comes up at once
+    with a placeholder and the evidence fills in when it is ready.
+    """
+    EVIDENCE_SIZE = (900, 600)
+
+    def __init__(self):
         super().__init__()
         self.setWindowTitle("EVOLUTIONARY AUDIT")
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
-        self.setWindowState(Qt.WindowState.WindowFullScreen)
+        self.shown_ms = []  # violation -> lockout painted, per audit
+        self._since = None
         
         # Styling
         self.setStyleSheet("background-color: #000000; border: 4px solid #ff0000;")
@@ -175,24 +233,22 @@ class LockoutWindow(QMainWindow):
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(header)
         
-        # Screenshot evidence
-        if os.path.exists(img_path):
-            pixmap = QPixmap(img_path).scaled(
-                900, 600, Qt.AspectRatioMode.KeepAspectRatio
-            )
-            img_label = QLabel()
-            img_label.setPixmap(pixmap)
-            img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(img_label)
-        
-        # Random mantra
-        self.mantra = random.choice(MANTRAS)
-        
-        instruction = QLabel(f"TYPE TO UNLOCK: '{self.mantra}'")
-        instruction.setFont(QFont("Monospace", 16))
-        instruction.setStyleSheet("color: #ffffff;")
-        instruction.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(instruction)
+        # Screenshot evidence (filled in by the loader)
+        self.evidence = QLabel()
+        self.evidence.setMinimumSize(*self.EVIDENCE_SIZE)
+        self.evidence.setStyleSheet("color: #666666; border: none;")
+        self.evidence.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.evidence)
+        self.loader = ImageLoader(self)
+        self.loader.loaded.connect(self.show_evidence)
+        
+        # Random mantra (picked per audit)
+        self.mantra = ""
+        self.instruction = QLabel()
+        self.instruction.setFont(QFont("Monospace", 16))
+        self.instruction.setStyleSheet("color: #ffffff;")
+        self.instruction.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.instruction)
         
         # Input field
         self.input = QLineEdit()
@@ -204,12 +260,39 @@ class LockoutWindow(QMainWindow):
         self.input.setFixedWidth(500)
         self.input.returnPressed.connect(self.check_mantra)
         layout.addWidget(self.input, alignment=Qt.AlignmentFlag.AlignCenter)
-        
+    
+    def present(self, img_path, since=None):
+        """Show the audit for `img_path`; `since` is the monotonic violation time."""
+        self._since = since if since is not None else time.monotonic()
+        self.mantra = random.choice(MANTRAS)
+        self.instruction.setText(f"TYPE TO UNLOCK: '{self.mantra}'")
+        self.input.clear()
+        self.input.setPlaceholderText("")
+        self.evidence.clear()
+        self.evidence.setText("LOADING EVIDENCE...")
+        self.loader.load(img_path, *self.EVIDENCE_SIZE)
+        self.showFullScreen()
+        self.raise_()
+        self.activateWindow()
         self.input.setFocus()
     
+    def show_evidence(self, token, image):
+        if token != self.loader.latest:
+            return
+        if image.isNull():
+            self.evidence.setText("")
+        else:
+            self.evidence.setPixmap(QPixmap.fromImage(image))
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._since is not None:
+            self.shown_ms.append((time.monotonic() - self._since) * 1000)
+            self._since = None
+    
     def check_mantra(self):
         if self.input.text().strip().lower() == self.mantra:
-            self.close()
+            self.hide()
         else:
             self.input.clear()
             self.input.setPlaceholderText("WRONG. THE BEAST WINS.")
@@ -275,19 +358,32 @@ class Dashboard(QMainWindow):
         self.duration_secs = duration * 60
         self.current_secs = self.duration_secs
         self.goal = goal
+        self.allowed = [a.strip().lower() for a in allowed_apps if a.strip()]
+        # Thin-client mode: when overmand runs, it tracks, enforces and stores
+        self.daemon = OvermandClient()
+        if not self.daemon.available():
+            self.daemon = None
+        if self.daemon:
+            self.daemon.request("start", goal=goal, duration=duration, allowed=self.allowed)
+        else:
+            store.start_session(goal, duration)
         
         # Data tracking
-        self.app_time = defaultdict(int)
-        self.url_time = defaultdict(lambda: defaultdict(int))
+        self.app_time = defaultdict(float)
         
         # Create overlay
         self.overlay = OverlayWindow(duration)
         self.overlay.show()
         
-        # Start warden
-        self.warden = WardenThread(allowed_apps)
+        # Lockout is built once, hidden, and reused for every audit
+        self.lockout = LockoutWindow()
+        
+        # Start warden (or follow the daemon's)
+        self.warden = DaemonFeed(self.daemon) if self.daemon else WardenThread(allowed_apps)
         self.warden.lockout_signal.connect(self.trigger_lockout)
         self.warden.data_signal.connect(self.update_data)
+        if self.daemon:
+            self.warden.snapshot_signal.connect(self.sync_session)
         self.warden.start()
         
         # Setup UI
@@ -353,21 +449,30 @@ class Dashboard(QMainWindow):
         tree_label.setStyleSheet("color: #00ff00;")
         right_panel.addWidget(tree_label)
         
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["App / URL", "Time", "Status"])
+        # Incremental model: rows are inserted/moved, never rebuilt
+        self.tree_model = ActivityModel(
+            ["App / URL", "Time", "Status"],
+            status_fn=lambda app: "✓" if any(a in app for a in self.allowed) else "✗"
+        )
+        self.tree_model.rowsInserted.connect(
+            lambda parent, first, last: parent.isValid() and self.tree.expand(parent)
+        )
+        self.tree = QTreeView()
+        self.tree.setUniformRowHeights(True)  # relayouts need not measure each row
+        self.tree.setModel(self.tree_model)
         self.tree.setStyleSheet(
-            "QTreeWidget { background: #0a0a0a; color: #cccccc; border: 1px solid #333; }"
-            "QTreeWidget::item { padding: 5px; }"
+            "QTreeView { background: #0a0a0a; color: #cccccc; border: 1px solid #333; }"
+            "QTreeView::item { padding: 5px; }"
         )
         right_panel.addWidget(self.tree)
         
         main_layout.addLayout(right_panel, 2)
     
-    def update_data(self, app, title, status):
+    def update_data(self, app, title, status, seconds):
         """Update tracking data"""
-        self.app_time[app] += 2
-        if app in DRIFT_APPS or "firefox" in app or "chrome" in app:
-            self.url_time[app][title] += 2
+        self.app_time[app] += seconds
+        is_browser = app in DRIFT_APPS or "firefox" in app or "chrome" in app
+        self.tree_model.add(app, title if is_browser else None, seconds)
         
         # Update status
         self.time_label.setText(
@@ -380,46 +485,6 @@ class Dashboard(QMainWindow):
             self.status_label.setStyleSheet("color: #ff0000; font-weight: bold;")
         else:
             self.status_label.setStyleSheet("color: #00ff00;")
-        
-        # Update tree periodically
-        if random.random() < 0.1:
-            self.update_tree()
-    
-    def update_tree(self):
-        """Rebuild the time tree"""
-        self.tree.clear()
-        
-        total_time = sum(self.app_time.values())
-        
-        for app, seconds in sorted(
-            self.app_time.items(), key=lambda x: x[1], reverse=True
-        ):
-            mins, secs = divmod(seconds, 60)
-            
-            app_item = QTreeWidgetItem([
-                app,
-                f"{mins}m {secs}s",
-                "✓" if any(a in app for a in self.warden.allowed) else "✗"
-            ])
-            
-            # Add URL children if available
-            if app in self.url_time:
-                for url, url_secs in sorted(
-                    self.url_time[app].items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:5]:  # Top 5 URLs
-                    url_mins, url_secs_rem = divmod(url_secs, 60)
-                    url_item = QTreeWidgetItem([
-                        url[:50],
-                        f"{url_mins}m {url_secs_rem}s",
-                        ""
-                    ])
-                    app_item.addChild(url_item)
-            
-            self.tree.addTopLevelItem(app_item)
-        
-        self.tree.expandAll()
     
     def tick(self):
         """Countdown timer"""
@@ -430,11 +495,26 @@ class Dashboard(QMainWindow):
         else:
             speak("Session complete.")
             self.timer.stop()
+            if self.daemon:
+                self.daemon.request("end")
+                return
+            productive = sum(s for a, s in self.app_time.items()
+                             if any(w in a for w in self.allowed))
+            store.end_session(100 * productive / max(sum(self.app_time.values()), 1))
+    
+    def sync_session(self, snap):
+        """Daemon mode: remaining time includes penalty minutes added by violations."""
+        session = snap.get("session")
+        if session and session.get("remaining") is not None:
+            total = self.duration_secs + snap["penalty_minutes"] * 60
+            self.current_secs = int(session["remaining"])
+            for bar in (self.progress, self.overlay.progress):
+                bar.setMaximum(total)
+                bar.setValue(self.current_secs)
     
-    def trigger_lockout(self, img_path):
+    def trigger_lockout(self, img_path, detected):
         """Show audit window"""
-        self.lockout = LockoutWindow(img_path)
-        self.lockout.show()
+        self.lockout.present(img_path, detected)
 
 
 # ==========================================
@@ -1,8 +1,6 @@
 import sys
 import os
-import json
 import random
-import subprocess
 import pandas as pd
 from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -10,6 +8,8 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QColor
 
+from engine.hypr import HyprlandClient
+
 # --- PERSONALITY DATA INJECTION ---
 # Based on your report: Type 5 (Analyst), Truth-Seeker, High Intellect, LOW Execution.
 USER_NAME = "Samidu"
@@ -38,14 +38,16 @@ class WardenThread(QThread):
     """
     drift_signal = pyqtSignal(str)
 
+    def __init__(self):
+        super().__init__()
+        self.hypr = HyprlandClient()
+
     def run(self):
         while True:
             self.msleep(5000)
             try:
-                # Get active window using Hyprland (Arch Linux specific)
-                cmd = ["hyprctl", "activewindow", "-j"]
-                output = subprocess.check_output(cmd).decode("utf-8")
-                data = json.loads(output)
+                # Get active window straight from Hyprland's request socket
+                data = self.hypr.json("activewindow")
                 app_class = data.get("class", "").lower()
                 title = data.get("title", "").lower()
 
@@ -1,30 +1,49 @@
 import sys
 import os
-import json
+import atexit
+import time
 import random
 import subprocess
-import pandas as pd
 from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QProgressBar, QFrame, QPushButton)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QPixmap, QColor
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from PyQt6.QtGui import QFont, QColor
+
+from engine import startup
+from engine.actuators import Actuators
+from engine.aggregates import RunningStats
+from engine.charts import PieChart, TimelineChart
+from engine.clock import wall
+from engine.daemonfeed import DaemonFeed
+from engine.evidence import EvidenceStore
+from engine.hypr import EventStream, FocusTracker, HyprlandClient, active_window
+from engine.keywords import KeywordMatcher
+from engine.lockout import LockoutWindow
+from engine.livestats import LiveStatsReader
+from engine.overmand import OvermandClient
+from engine.intervals import IntervalLog
+from engine.speech import NORMAL, URGENT, Speaker
+from engine.store import Store
 
 # --- CONFIGURATION (ADJUST THESE) ---
 # Apps that count as "Deep Work"
 ALLOWED_APPS = ["mpv", "kitty", "obsidian", "anki", "libreoffice", "zathura"] 
 # Apps that trigger immediate KILL + LOCKOUT
 FORBIDDEN_KEYWORDS = ["porn", "facebook", "twitter", "instagram", "tiktok"] 
+FORBIDDEN_MATCHER = KeywordMatcher(FORBIDDEN_KEYWORDS)
 # Apps that trigger "Drift Warning" (Voice Alarm) if focused too long
 DISTRACTION_APPS = ["firefox", "brave", "chrome", "discord"]
+# Charts are polled this often and repaint only when the totals changed
+CHART_REFRESH_MS = 2000
 
 # --- PATHS ---
 BASE_DIR = os.path.expanduser("~/.local/share/truthengine")
-DATA_FILE = os.path.join(BASE_DIR, "session_log.csv")
 SCREENSHOT_DIR = os.path.join(BASE_DIR, "shame_snaps")
-os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+# Built on first use (when the warden starts), not before the planner is up
+store = startup.Deferred(Store) # Shared session history (SQLite)
+actuators = startup.Deferred(Actuators) # Kills off the warden thread
+evidence = startup.Deferred(EvidenceStore, SCREENSHOT_DIR) # Focused-monitor captures, size/age bounded
 
 # --- NIETZSCHEAN DATA ---
 QUOTES = [
@@ -35,9 +54,12 @@ QUOTES = [
     "The 43% Conscientiousness score is your prison. Break it."
 ]
 
-def speak(text):
-    """Voice of the Warden."""
-    subprocess.Popen(["espeak-ng", "-s", "160", "-v", "en-us", text], stderr=subprocess.DEVNULL)
+speaker = startup.Deferred(Speaker, speed=160)
+WARM_PHRASES = ("Protocol violated. The animal has taken over.", "Return to the goal immediately.")
+
+def speak(text, priority=NORMAL):
+    """Voice of the Warden (queued; repeats are rate limited)."""
+    speaker.say(text, priority)
 
 class WardenThread(QThread):
     """
@@ -46,86 +68,92 @@ class WardenThread(QThread):
     2. Warns you if you drift into browsers for too long.
     3. Logs activity for the charts.
     """
-    lockout_signal = pyqtSignal(str) # Trigger lockout with screenshot path
+    lockout_signal = pyqtSignal(str, float) # Trigger lockout with screenshot path, detection time
     update_signal = pyqtSignal(str, str) # Send current app/time to GUI
 
+    def __init__(self):
+        super().__init__()
+        self.intervals = IntervalLog(on_close=store.add_interval)
+        self.stats = RunningStats()
+        self.stats.seed(store.status_totals(), store.app_totals())
+        atexit.register(self.intervals.close)
+
     def run(self):
-        drift_timer = 0
         while True:
-            self.msleep(2000) # Check every 2 seconds
             try:
-                # Get Window Info from Hyprland
-                cmd = ["hyprctl", "activewindow", "-j"]
-                output = subprocess.check_output(cmd).decode("utf-8")
-                data = json.loads(output)
-                app_class = data.get("class", "").lower()
-                title = data.get("title", "").lower()
-
-                # 1. KILL PROTOCOL
-                if any(k in title for k in FORBIDDEN_KEYWORDS):
-                    subprocess.run(["hyprctl", "dispatch", "closewindow", f"address:{data['address']}"])
-                    snap_path = os.path.join(SCREENSHOT_DIR, f"shame_{datetime.now().strftime('%H%M%S')}.png")
-                    subprocess.run(["grim", snap_path])
-                    self.lockout_signal.emit(snap_path)
-                    speak("Protocol violated. The animal has taken over.")
-                    continue
-
-                # 2. DRIFT PROTOCOL
-                is_working = any(a in app_class for a in ALLOWED_APPS)
-                is_distracted = any(d in app_class for d in DISTRACTION_APPS)
-
-                if is_distracted:
-                    drift_timer += 2
-                    if drift_timer == 60: # 1 minute grace period
-                        speak(f"Samidu, you are drifting. Close {app_class}.")
-                    if drift_timer > 120: # 2 minutes -> constant nagging
-                         speak("Return to the goal immediately.")
-                else:
-                    drift_timer = 0
-
-                # 3. LOGGING
-                status = "Productive" if is_working else "Drifting"
+                self.watch(EventStream(timeout=2.0, clock=time.monotonic))
+            except OSError:
+                self.msleep(2000) # Hyprland socket not up yet
+
+    def watch(self, stream):
+        """React to socket2 events; samples and drift warnings run every 2 seconds."""
+        hypr = HyprlandClient()
+        tracker = FocusTracker()
+        mark = time.monotonic()  # spans and drift on the monotonic clock
+        tracker.start(mark, active_window(hypr))
+        drift_start = None
+        last_nag = 0
+        killed = None
+
+        for event in stream:
+            now = time.monotonic()
+            if event:
+                span = tracker.feed(*event)
+                if span:
+                    # Close out the window that just lost focus
+                    if span[0] and span[2] > mark:
+                        self.record(span[0], mark, span[2])
+                    mark = max(mark, span[2])
+            win = tracker.focused
+            if win is None:
+                drift_start = None
+                continue
+            app_class, title = win.cls, win.title
+
+            # 1. KILL PROTOCOL (as soon as the window is focused)
+            if win.address and win.address != killed and FORBIDDEN_MATCHER.search(title):
+                killed, detected = win.address, time.monotonic()
+                actuators.close_window(f"address:{win.address}")
+                evidence.capture(then=lambda ev, t=detected:
+                                 self.lockout_signal.emit(ev["path"] if ev else "", t))
+                store.add_violation(app_class, title, FORBIDDEN_MATCHER.search(title), "closewindow")
+                speak("Protocol violated. The animal has taken over.", URGENT)
+                continue
+
+            # 2. DRIFT PROTOCOL (measured from the focus event, not counted ticks)
+            is_distracted = any(d in app_class for d in DISTRACTION_APPS)
+
+            if is_distracted:
+                if drift_start is None:
+                    drift_start, warned = tracker.since, False
+                drift = now - drift_start
+                if drift >= 60 and not warned: # 1 minute grace period
+                    warned = True
+                    speak(f"Samidu, you are drifting. Close {app_class}.")
+                if drift > 120 and now - last_nag >= 2: # 2 minutes -> constant nagging
+                    last_nag = now
+                    speak("Return to the goal immediately.")
+            else:
+                drift_start = None
+
+            if now - mark < 2:
+                continue
+
+            # 3. LOGGING
+            try:
+                status = self.record(win, mark, now)
                 self.update_signal.emit(app_class, status)
-                
-                # Save to CSV
-                df = pd.DataFrame([{"timestamp": datetime.now(), "app": app_class, "status": status}])
-                df.to_csv(DATA_FILE, mode='a', header=not os.path.exists(DATA_FILE), index=False)
-
             except Exception:
                 pass
+            mark = now
 
-class LockoutWindow(QMainWindow):
-    """The Punishment Cell."""
-    def __init__(self, img_path):
-        super().__init__()
-        self.setProperty("class", "truth-lockout")
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
-        self.setWindowState(Qt.WindowState.WindowFullScreen)
-        self.setStyleSheet("background: black; border: 4px solid red;")
-        
-        layout = QVBoxLayout()
-        w = QWidget(); w.setLayout(layout); self.setCentralWidget(w)
-
-        lbl = QLabel("YOU SURRENDERED TO IMPULSE")
-        lbl.setFont(QFont("Impact", 40)); lbl.setStyleSheet("color: red")
-        layout.addWidget(lbl, alignment=Qt.AlignmentFlag.AlignCenter)
-
-        # Show the screenshot of what you were doing
-        if os.path.exists(img_path):
-            pix = QPixmap(img_path).scaled(800, 500, Qt.AspectRatioMode.KeepAspectRatio)
-            img = QLabel(); img.setPixmap(pix)
-            layout.addWidget(img, alignment=Qt.AlignmentFlag.AlignCenter)
-
-        self.input = QLineEdit()
-        self.input.setPlaceholderText("Type: 'I command myself' to release")
-        self.input.setStyleSheet("font-size: 20px; padding: 10px; color: white; background: #222; border: 1px solid red;")
-        self.input.setFixedWidth(500)
-        self.input.returnPressed.connect(self.check_mantra)
-        layout.addWidget(self.input, alignment=Qt.AlignmentFlag.AlignCenter)
-
-    def check_mantra(self):
-        if self.input.text().lower() == "i command myself":
-            self.close()
+    def record(self, win, start, end):
+        """Extend the focus interval log; a row is written when focus moves on."""
+        status = "Productive" if any(a in win.cls for a in ALLOWED_APPS) else "Drifting"
+        offset = wall(0.0)  # monotonic span -> stored timestamps
+        self.intervals.add(round(offset + start, 3), round(offset + end, 3), win.cls, win.title, status)
+        self.stats.add(win.cls, status, end - start)
+        return status
 
 class PlannerWindow(QMainWindow):
     """Step 1: Deliberate Practice Setup."""
@@ -179,13 +207,35 @@ class MainDashboard(QMainWindow):
         self.setProperty("class", "truth-engine")
         self.duration_sec = duration_mins * 60
         self.goal = goal
+        # Thin-client mode: when overmand runs, it tracks, enforces and stores
+        self.daemon = OvermandClient()
+        if not self.daemon.available():
+            self.daemon = None
+        self.live = None
+        if self.daemon:
+            session = self.daemon.request("start", goal=goal, duration=duration_mins, allowed=ALLOWED_APPS)
+            self.started = session["session"]["started"]
+            self.live = LiveStatsReader.open()
+        else:
+            self.started = store.start_session(goal, duration_mins) / 1000
         self.init_ui()
         
-        # Start the Enforcer
-        self.warden = WardenThread()
+        # Lockout is built once, hidden, and reused for every violation
+        self.lock = LockoutWindow()
+
+        # Start the Enforcer (or follow the daemon's)
+        self.warden = DaemonFeed(self.daemon) if self.daemon else WardenThread()
         self.warden.lockout_signal.connect(self.trigger_lockout)
         self.warden.update_signal.connect(self.update_live_data)
+        if self.daemon and not self.live:
+            self.warden.snapshot_signal.connect(self.sync_session)
         self.warden.start()
+        self.update_chart()
+
+        # Chart refresh: fixed cadence, only when the warden changed the totals
+        self.chart_timer = QTimer()
+        self.chart_timer.timeout.connect(self.update_chart)
+        self.chart_timer.start(CHART_REFRESH_MS)
 
         # Session Timer
         self.timer = QTimer()
@@ -234,10 +284,14 @@ class MainDashboard(QMainWindow):
         
         layout.addLayout(left, 1)
 
-        # RIGHT: CHARTS
-        self.canvas = FigureCanvas(Figure(figsize=(5, 5), facecolor='#0d0d0d'))
-        layout.addWidget(self.canvas, 2)
-        self.update_chart()
+        # RIGHT: CHARTS (QPainter, repainted only when the data changes)
+        right = QVBoxLayout()
+        self.pie = PieChart("WILLPOWER DISTRIBUTION")
+        self.timeline = TimelineChart(self.started, self.duration_sec, title="SESSION TIMELINE")
+        self.timeline.setFixedHeight(90)
+        right.addWidget(self.pie)
+        right.addWidget(self.timeline)
+        layout.addLayout(right, 2)
 
     def stat_row(self, title, val, color):
         l = QLabel(f"{title}: {val}")
@@ -246,48 +300,61 @@ class MainDashboard(QMainWindow):
 
     def tick(self):
         curr = self.progress.value()
-        if curr > 0:
+        stats = self.live.read() if self.live else None
+        if stats and stats.remaining is not None:
+            # Daemon mode: remaining time (penalties included) from shared memory
+            self.progress.setMaximum(self.duration_sec + stats.penalty_minutes * 60)
+            self.timeline.set_span(self.progress.maximum())
+            curr = int(stats.at()[2])
+            self.progress.setValue(curr)
+        elif curr > 0:
             self.progress.setValue(curr - 1)
-        else:
+        if curr <= 0:
             self.lbl_status.setText("SESSION COMPLETE")
             self.timer.stop()
+            if self.daemon:
+                self.daemon.request("end")
+            else:
+                totals = store.status_totals(since=self.started)
+                store.end_session(100 * totals.get("Productive", 0) / max(sum(totals.values()), 1))
             speak("Session complete. Review your progress.")
 
+    def sync_session(self, snap):
+        """Daemon mode: remaining time includes penalty minutes added by violations."""
+        session = snap.get("session")
+        if session and session.get("remaining") is not None:
+            self.progress.setMaximum(self.duration_sec + snap["penalty_minutes"] * 60)
+            self.timeline.set_span(self.progress.maximum())
+            self.progress.setValue(int(session["remaining"]))
+
     def update_live_data(self, app, status):
         self.lbl_status.setText(f"ACTIVE: {app} | STATUS: {status}")
         if "Drifting" in status:
             self.lbl_status.setStyleSheet("color: #ff3333; font-weight: bold;")
         else:
             self.lbl_status.setStyleSheet("color: #00ff41;")
-        
-        # Trigger chart update occasionally
-        if random.random() < 0.1: 
-            self.update_chart()
+        self.timeline.add(time.time(), "Drifting" if "Drifting" in status else "Productive")
 
     def update_chart(self):
-        if not os.path.exists(DATA_FILE): return
-        try:
-            df = pd.read_csv(DATA_FILE)
-            counts = df['status'].value_counts()
-            
-            self.canvas.figure.clear()
-            ax = self.canvas.figure.add_subplot(111)
-            ax.pie(counts, labels=counts.index, autopct='%1.1f%%', colors=['#00ff41', '#ff3333'],
-                   textprops={'color':"w"})
-            ax.set_title("WILLPOWER DISTRIBUTION", color='white')
-            self.canvas.draw()
-        except: pass
-
-    def trigger_lockout(self, path):
-        self.lock = LockoutWindow(path)
-        self.lock.show()
+        changed = self.warden.stats.take()
+        if changed is None: return
+        totals, _ = changed
+        self.pie.set_slices([(k, totals.get(k, 0), '#00ff41' if k == "Productive" else '#ff3333')
+                             for k in ("Productive", "Drifting")])
+
+    def trigger_lockout(self, path, detected):
+        self.lock.present(path, detected)
 
 if __name__ == "__main__":
-    os.environ["QT_QPA_PLATFORM"] = "wayland" # Force Wayland for Hyprland
+    if startup.requested():
+        sys.exit(startup.profile(__file__, sys.argv[1:]))
+    os.environ["QT_QPA_PLATFORM"] = startup.platform("wayland") # Force Wayland for Hyprland
     app = QApplication(sys.argv)
     
     # Start with the Planner
     planner = PlannerWindow()
     planner.show()
+    startup.first_window(planner)
+    startup.after_paint(planner, lambda: speaker.warm(*WARM_PHRASES))
     
     sys.exit(app.exec())